@@ -2,16 +2,49 @@
 
 import asyncio
 import json
+import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Set
+from typing import Any, AsyncIterator, Dict, Set
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the headless trading runtime for the lifetime of the API server.
+
+    The runtime comes from the ``basic-trading-software`` package (installed alongside the
+    backend with the ``trading`` extra); without it the API serves placeholders only.
+    """
+
+    try:
+        from basic_trading_software.common.logging import configure_logging
+        from basic_trading_software.daemon import HeadlessRuntime
+    except ImportError as exc:
+        logger.warning("Trading runtime unavailable (%s); serving placeholder data", exc)
+        app.state.runtime = None
+        yield
+        return
+
+    configure_logging()
+    runtime = HeadlessRuntime()
+    await runtime.start()
+    app.state.runtime = runtime
+    try:
+        yield
+    finally:
+        await runtime.stop()
+
+
 app = FastAPI(
     title="Basic Trading Software API",
     description="Real-time trading dashboard backend",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Enable CORS for desktop app and remote access
@@ -57,6 +90,11 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+def _runtime_status(request: Request) -> Dict[str, Any] | None:
+    runtime = getattr(request.app.state, "runtime", None)
+    return runtime.status() if runtime is not None else None
+
+
 # REST API Endpoints
 @app.get("/api/health")
 async def health_check():
@@ -67,13 +105,38 @@ async def health_check():
     }
 
 
+@app.get("/api/status")
+async def get_status(request: Request):
+    """State, counters, last quotes, positions, PnL and staking of the trading runtime."""
+    status = _runtime_status(request)
+    if status is None:
+        raise HTTPException(status_code=503, detail="Trading runtime is not running")
+    return {**status, "timestamp": datetime.utcnow().isoformat()}
+
+
 @app.get("/api/portfolio")
-async def get_portfolio():
-    """Get current portfolio data (placeholder)."""
+async def get_portfolio(request: Request):
+    """Get current positions and PnL from the trading runtime."""
+    status = _runtime_status(request)
+    if status is None:
+        return {
+            "total_value": 10000.00,
+            "buying_power": 5000.00,
+            "positions": [],
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    positions = []
+    for symbol, position in status["positions"].items():
+        last_price = position["last_price"]
+        market_value = position["quantity"] * last_price if last_price is not None else None
+        positions.append({"symbol": symbol, **position, "market_value": market_value})
+    portfolio = status["portfolio"]
     return {
-        "total_value": 10000.00,
-        "buying_power": 5000.00,
-        "positions": [],
+        # No cash ledger yet: total value is the net market value of open positions.
+        "total_value": portfolio["net_exposure"],
+        "buying_power": None,
+        "positions": positions,
+        **portfolio,
         "timestamp": datetime.utcnow().isoformat(),
     }
 
@@ -125,13 +188,13 @@ async def save_all_settings(data: dict):
     # For now, just return success - settings are stored on client side
     credentials = data.get("credentials", {})
     general_settings = data.get("generalSettings", {})
-    
+
     # Log what settings were saved
     trading_mode = general_settings.get("tradingMode", "unknown")
     selected_model = general_settings.get("selectedModel", "unknown")
     assets = general_settings.get("assetsToMonitor", [])
     staking_provider = general_settings.get("stakingProvider", "none")
-    
+
     return {
         "status": "success",
         "message": "All settings saved successfully",
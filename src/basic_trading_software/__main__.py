@@ -1,8 +1,47 @@
 """CLI entry point."""
 
-from .app import main
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="basic_trading_software")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run the trading engine as a daemon without the Qt user interface",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report per-module import cost and cold start to first quote (against a "
+        "simulated venue and a temporary data directory), then exit non-zero if it is over "
+        "budget",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="cold-start budget for --profile-startup (default: startup.budget_ms)",
+    )
+    args = parser.parse_args(argv)
+    if args.profile_startup:
+        from .common.config import get_settings
+        from .common.startup import profile_startup
+
+        report = profile_startup(headless=args.headless, budget_ms=args.budget_ms)
+        print(report.format(top=get_settings().startup.report_top))
+        sys.exit(0 if report.within_budget else 1)
+    # Imported per mode so the headless daemon never loads PySide6 or pyqtgraph.
+    if args.headless:
+        from .daemon import main as run
+    else:
+        from .app import main as run
+    run()
 
 
 if __name__ == "__main__":
     main()
-
@@ -4,27 +4,35 @@ from __future__ import annotations
 
 import asyncio
 
-from loguru import logger
-from PySide6.QtWidgets import QApplication
-from qasync import QEventLoop
-from qt_material import apply_stylesheet
-
-from basic_trading_software.common.config import get_settings
-from basic_trading_software.common.credentials import CredentialStore
-from basic_trading_software.common.events import EventBus
-from basic_trading_software.common.logging import configure_logging
-from basic_trading_software.data.providers import LiveDataProvider
-from basic_trading_software.ml.strategy import MLStrategy
-from basic_trading_software.trading.adapters.crypto import BinanceAdapter
-from basic_trading_software.trading.adapters.equity import AlpacaAdapter
-from basic_trading_software.trading.engine import TradingEngine
-from basic_trading_software.trading.staking import StakingService
-from basic_trading_software.ui.main_window import MainWindow
-
 
 def main() -> None:
     """Launch the application."""
 
+    # Imported here rather than at module level so that importing this module (or running
+    # the headless daemon) stays cheap; only the GUI path pays for Qt.
+    from loguru import logger
+    from PySide6.QtWidgets import QApplication
+    from qasync import QEventLoop
+    from qt_material import apply_stylesheet
+
+    from basic_trading_software.common.config import get_settings
+    from basic_trading_software.common.credentials import CredentialStore
+    from basic_trading_software.common.events import EventBus
+    from basic_trading_software.common.http import get_transport
+    from basic_trading_software.common.logging import configure_logging
+    from basic_trading_software.common.tracing import get_tracer
+    from basic_trading_software.data.providers import LiveDataProvider
+    from basic_trading_software.ml.strategy import MLStrategy
+    from basic_trading_software.trading.adapters.crypto import BinanceAdapter
+    from basic_trading_software.trading.adapters.equity import AlpacaAdapter
+    from basic_trading_software.trading.engine import TradingEngine
+    from basic_trading_software.trading.instruments import InstrumentCache
+    from basic_trading_software.trading.orders import OrderStore
+    from basic_trading_software.trading.router import SmartOrderRouter
+    from basic_trading_software.trading.staking import StakingService
+    from basic_trading_software.trading.user_data import UserDataStreams
+    from basic_trading_software.ui.main_window import MainWindow
+
     configure_logging()
     settings = get_settings()
     logger.info(f"[app] Starting Basic Trading Software in {settings.environment} mode")
@@ -38,11 +46,15 @@ def main() -> None:
 
     credential_store = CredentialStore()
     event_bus = EventBus()
-    adapters = [
-        AlpacaAdapter(credentials=credential_store),
-        BinanceAdapter(credentials=credential_store),
-    ]
-    trading_engine = TradingEngine(event_bus, adapters=adapters)
+    alpaca = AlpacaAdapter(credentials=credential_store)
+    adapters = [alpaca, BinanceAdapter(credentials=credential_store)]
+    trading_engine = TradingEngine(
+        event_bus,
+        adapters=adapters,
+        router=SmartOrderRouter(adapters, InstrumentCache.from_settings(settings.instruments)),
+        order_store=OrderStore.from_settings(settings.orders),
+    )
+    user_data = UserDataStreams(event_bus, adapters)
     strategy = MLStrategy(event_bus)
     data_provider = LiveDataProvider()
     staking_service = StakingService(event_bus)
@@ -56,10 +68,48 @@ def main() -> None:
 
     async def start_components() -> None:
         await trading_engine.start()
+        await user_data.start()
         await strategy.start()
 
+    async def stop_components() -> None:
+        """Same order as the headless runtime: producers, then the engine (which drains
+        in-flight orders and commits the order log), then staking and I/O."""
+
+        data_provider.stop()
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await strategy.stop()
+        await trading_engine.stop()
+        await user_data.stop()
+        await staking_service.stop()
+        for adapter in adapters:
+            await adapter.close()
+        # Settings saved just before quitting may still be queued for the background writer.
+        await credential_store.flush()
+        await get_transport().close()
+
     with loop:
-        loop.create_task(window.initialize())
-        loop.create_task(start_components())
-        loop.create_task(staking_service.start())
+        background = [
+            loop.create_task(window.initialize()),
+            loop.create_task(start_components()),
+            loop.create_task(staking_service.start()),
+        ]
+        if settings.broker_equity.data_symbols:
+            background.append(
+                loop.create_task(
+                    alpaca.run_market_data(event_bus, settings.broker_equity.data_symbols)
+                )
+            )
+        if settings.tracing.enabled and settings.tracing.report_interval_seconds > 0:
+            background.append(
+                loop.create_task(get_tracer().run_reporter(settings.tracing.report_interval_seconds))
+            )
         loop.run_forever()
+        logger.info("[app] Shutting down")
+        try:
+            loop.run_until_complete(
+                asyncio.wait_for(stop_components(), settings.daemon.shutdown_timeout_seconds)
+            )
+        except asyncio.TimeoutError:
+            logger.error("[app] Shutdown timed out; exiting with work still pending")
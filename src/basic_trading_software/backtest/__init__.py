@@ -0,0 +1,4 @@
+"""Backtesting engines."""
+
+from .replay import ReplayBacktester, ReplayResult, VirtualTimeEventLoop  # noqa: F401
+from .vectorized import BacktestResult, ParameterGrid, make_parameter_grid, run_vectorized_backtest  # noqa: F401
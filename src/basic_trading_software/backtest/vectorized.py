@@ -0,0 +1,265 @@
+"""Vectorized backtest engine for model probability series."""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Literal, Sequence, Tuple
+
+import numpy as np
+
+FillMode = Literal["next_open", "next_close"]
+
+STAT_NAMES = (
+    "total_return",
+    "annual_return",
+    "annual_volatility",
+    "sharpe",
+    "max_drawdown",
+    "trades",
+    "turnover",
+    "exposure",
+    "hit_rate",
+)
+
+
+@dataclass(frozen=True)
+class ParameterGrid:
+    """Flat arrays of strategy parameters evaluated side by side (one entry per set)."""
+
+    long_threshold: np.ndarray
+    short_threshold: np.ndarray
+    fee_bps: np.ndarray
+    slippage_bps: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.long_threshold.shape[0])
+
+    def row(self, index: int) -> Dict[str, float]:
+        return {
+            "long_threshold": float(self.long_threshold[index]),
+            "short_threshold": float(self.short_threshold[index]),
+            "fee_bps": float(self.fee_bps[index]),
+            "slippage_bps": float(self.slippage_bps[index]),
+        }
+
+
+def make_parameter_grid(
+    long_threshold: Iterable[float] = (0.55,),
+    short_threshold: Iterable[float] = (0.45,),
+    fee_bps: Iterable[float] = (1.0,),
+    slippage_bps: Iterable[float] = (1.0,),
+) -> ParameterGrid:
+    """Build the cartesian product of the supplied parameter values."""
+
+    combos = list(itertools.product(long_threshold, short_threshold, fee_bps, slippage_bps))
+    if not combos:
+        raise ValueError("Parameter grid is empty")
+    columns = np.asarray(combos, dtype=np.float64).T
+    return ParameterGrid(
+        long_threshold=columns[0].copy(),
+        short_threshold=columns[1].copy(),
+        fee_bps=columns[2].copy(),
+        slippage_bps=columns[3].copy(),
+    )
+
+
+@dataclass
+class BacktestResult:
+    """Outputs indexed as (parameter set, symbol[, bar])."""
+
+    symbols: Sequence[str]
+    params: ParameterGrid
+    stats: Dict[str, np.ndarray]
+    portfolio_equity: np.ndarray
+    equity: np.ndarray | None = None
+    positions: np.ndarray | None = None
+    returns: np.ndarray | None = None
+    evaluations: int = field(default=0)
+
+    def summary(self) -> list[Dict[str, object]]:
+        """Flatten statistics into one row per (parameter set, symbol)."""
+
+        rows: list[Dict[str, object]] = []
+        for p_idx in range(len(self.params)):
+            params = self.params.row(p_idx)
+            for s_idx, symbol in enumerate(self.symbols):
+                row: Dict[str, object] = {"symbol": symbol, **params}
+                for name in STAT_NAMES:
+                    row[name] = float(self.stats[name][p_idx, s_idx])
+                rows.append(row)
+        return rows
+
+    def best(self, metric: str = "sharpe") -> Dict[str, object]:
+        """Return the parameter set with the best mean metric across symbols."""
+
+        scores = np.nanmean(self.stats[metric], axis=1)
+        index = int(np.nanargmax(scores))
+        return {"index": index, metric: float(scores[index]), **self.params.row(index)}
+
+
+def run_vectorized_backtest(
+    open_prices: np.ndarray,
+    close_prices: np.ndarray,
+    probabilities: np.ndarray,
+    params: ParameterGrid | None = None,
+    symbols: Sequence[str] | None = None,
+    fill: FillMode = "next_open",
+    allow_short: bool = True,
+    hold_in_neutral_band: bool = True,
+    periods_per_year: float = 252 * 390,
+    keep_curves: bool = True,
+    block_elements: int = 1 << 18,
+) -> BacktestResult:
+    """Simulate threshold strategies over ``(symbols, bars)`` arrays in one pass.
+
+    A probability above ``long_threshold`` targets +1, below ``short_threshold`` targets -1
+    (or flat when shorting is disabled). Signals are computed on bar close and filled on the
+    next bar's open or close. Fees and slippage are charged on traded notional in basis points.
+    Work is split into ``(parameter sets, symbols, bars)`` blocks of roughly ``block_elements``
+    cells so intermediates stay cache-resident and peak memory stays bounded.
+    """
+
+    opens = np.atleast_2d(np.asarray(open_prices, dtype=np.float64))
+    closes = np.atleast_2d(np.asarray(close_prices, dtype=np.float64))
+    probs = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+    if not opens.shape == closes.shape == probs.shape:
+        raise ValueError(
+            f"Shape mismatch: open={opens.shape} close={closes.shape} probabilities={probs.shape}"
+        )
+    if fill not in ("next_open", "next_close"):
+        raise ValueError(f"Unknown fill mode '{fill}'")
+
+    params = params or make_parameter_grid()
+    n_symbols, n_bars = closes.shape
+    symbols = list(symbols) if symbols is not None else [f"S{i}" for i in range(n_symbols)]
+    if len(symbols) != n_symbols:
+        raise ValueError(f"Expected {n_symbols} symbols, got {len(symbols)}")
+
+    prev_close = _shift(closes, 1, fill_value=np.nan)
+    prev_close[:, 0] = opens[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if fill == "next_open":
+            gap = np.nan_to_num(opens / prev_close - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+            intra = np.nan_to_num(closes / opens - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+        else:
+            gap = np.nan_to_num(closes / prev_close - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+            intra = None
+    # NaN probabilities fall inside the neutral band because every comparison is False.
+    probs_view = probs[None, :, :]
+
+    n_params = len(params)
+    stats = {name: np.empty((n_params, n_symbols)) for name in STAT_NAMES}
+    portfolio_sum = np.zeros((n_params, n_bars))
+    equity_out = np.empty((n_params, n_symbols, n_bars)) if keep_curves else None
+    positions_out = np.empty((n_params, n_symbols, n_bars), dtype=np.int8) if keep_curves else None
+    returns_out = np.empty((n_params, n_symbols, n_bars)) if keep_curves else None
+
+    symbol_step = max(1, min(n_symbols, block_elements // max(1, n_bars)))
+    param_step = max(1, block_elements // (symbol_step * n_bars))
+    bar_index = np.arange(n_bars, dtype=np.int32)
+    cost_rates = (params.fee_bps + params.slippage_bps) * 1e-4
+
+    for p_start in range(0, n_params, param_step):
+        pc = slice(p_start, min(p_start + param_step, n_params))
+        upper = params.long_threshold[pc, None, None]
+        lower = params.short_threshold[pc, None, None]
+        cost_rate = cost_rates[pc, None, None]
+        for s_start in range(0, n_symbols, symbol_step):
+            sc = slice(s_start, min(s_start + symbol_step, n_symbols))
+            p = probs_view[:, sc]
+
+            go_long = p > upper
+            go_short = p < lower
+            targets = go_long.astype(np.int8)
+            if allow_short:
+                targets -= go_short
+            if hold_in_neutral_band:
+                # Forward-fill the last decided position through the neutral band.
+                decided = go_long | go_short
+                index = np.where(decided, bar_index, 0)
+                np.maximum.accumulate(index, axis=-1, out=index)
+                targets = np.take_along_axis(targets, index, axis=-1)
+
+            # Signal at bar t fills during bar t+1; the position is fully held from bar t+2.
+            entering = _shift(targets, 1)
+            held = _shift(targets, 2)
+            turnover = np.abs(entering - held)
+
+            bar_pnl = held * gap[sc]
+            bar_pnl += 1.0
+            bar_pnl *= 1.0 - turnover * cost_rate
+            if intra is not None:
+                bar_pnl *= 1.0 + entering * intra[sc]
+                exposed = entering != 0
+            else:
+                exposed = held != 0
+            bar_pnl -= 1.0
+
+            equity = np.cumprod(bar_pnl + 1.0, axis=-1)
+            block = (pc, sc)
+            _fill_stats(stats, block, equity, bar_pnl, turnover, exposed, periods_per_year)
+            portfolio_sum[pc] += bar_pnl.sum(axis=1)
+
+            if keep_curves:
+                assert equity_out is not None and positions_out is not None
+                assert returns_out is not None
+                equity_out[pc, sc] = equity
+                positions_out[pc, sc] = entering if intra is not None else held
+                returns_out[pc, sc] = bar_pnl
+
+    portfolio_equity = np.cumprod(portfolio_sum / n_symbols + 1.0, axis=-1)
+    return BacktestResult(
+        symbols=symbols,
+        params=params,
+        stats=stats,
+        portfolio_equity=portfolio_equity,
+        equity=equity_out,
+        positions=positions_out,
+        returns=returns_out,
+        evaluations=n_params * n_symbols * n_bars,
+    )
+
+
+def _fill_stats(
+    stats: Dict[str, np.ndarray],
+    block: Tuple[slice, slice],
+    equity: np.ndarray,
+    bar_pnl: np.ndarray,
+    turnover: np.ndarray,
+    exposure_mask: np.ndarray,
+    periods_per_year: float,
+) -> None:
+    n_bars = equity.shape[-1]
+    final = equity[..., -1]
+    mean = bar_pnl.mean(axis=-1)
+    std = bar_pnl.std(axis=-1)
+    drawdown = np.maximum.accumulate(equity, axis=-1)
+    np.divide(equity, drawdown, out=drawdown)
+    exposed_bars = exposure_mask.sum(axis=-1)
+    winning_bars = (exposure_mask & (bar_pnl > 0.0)).sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        stats["total_return"][block] = final - 1.0
+        stats["annual_return"][block] = np.where(
+            final > 0.0, np.power(np.maximum(final, 0.0), periods_per_year / n_bars) - 1.0, -1.0
+        )
+        stats["annual_volatility"][block] = std * np.sqrt(periods_per_year)
+        stats["sharpe"][block] = np.where(std > 0.0, mean / std * np.sqrt(periods_per_year), 0.0)
+        stats["max_drawdown"][block] = drawdown.min(axis=-1) - 1.0
+        stats["hit_rate"][block] = np.where(exposed_bars > 0, winning_bars / exposed_bars, 0.0)
+    stats["trades"][block] = np.count_nonzero(turnover, axis=-1)
+    stats["turnover"][block] = turnover.sum(axis=-1)
+    stats["exposure"][block] = exposed_bars / n_bars
+
+
+def _shift(values: np.ndarray, periods: int, fill_value: float = 0.0) -> np.ndarray:
+    """Shift along the bar axis, padding the head with ``fill_value``."""
+
+    shifted = np.empty_like(values)
+    if periods >= values.shape[-1]:
+        shifted[...] = fill_value
+        return shifted
+    shifted[..., :periods] = fill_value
+    shifted[..., periods:] = values[..., :-periods]
+    return shifted
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseSettings, Field
 
@@ -24,6 +24,13 @@ class EquityBrokerSettings(BaseSettings):
     api_key: Optional[str] = Field(default=None)
     api_secret: Optional[str] = Field(default=None)
     base_url: str = Field(default="https://paper-api.example-broker.com/v2")
+    trade_stream_url: str = Field(default="wss://paper-api.alpaca.markets/stream")
+    requests_per_minute: int = Field(default=200)
+    data_stream_url: str = Field(default="wss://stream.data.alpaca.markets/v2/iex")
+    data_stream_msgpack: bool = Field(default=False)
+    data_subscribe_chunk: int = Field(default=500)
+    # Symbols streamed from the data API (quotes and bars) onto the event bus; empty disables it.
+    data_symbols: List[str] = Field(default_factory=list)
 
 
 class CryptoExchangeSettings(BaseSettings):
@@ -34,6 +41,9 @@ class CryptoExchangeSettings(BaseSettings):
     api_secret: Optional[str] = Field(default=None)
     rest_base_url: str = Field(default="https://testnet.binance.vision")
     websocket_url: str = Field(default="wss://testnet.binance.vision/ws")
+    listen_key_keepalive_seconds: float = Field(default=1800.0)
+    request_weight_per_minute: int = Field(default=6000)
+    orders_per_10_seconds: int = Field(default=100)
     staking_enabled: bool = Field(default=True)
 
 
@@ -44,6 +54,12 @@ class StakingSettings(BaseSettings):
     api_base_url: str = Field(default="https://stake.example-provider.com")
     cooldown_days: int = Field(default=7)
     auto_compound: bool = Field(default=False)
+    tracked_assets: List[str] = Field(default_factory=list)
+    apr_ttl_seconds: float = Field(default=300.0)
+    apr_refresh_interval_seconds: float = Field(default=240.0)
+    apr_timeout_seconds: float = Field(default=5.0)
+    book_path: Path = Field(default=Path("./data/staking_book.json"))
+    accrual_interval_seconds: float = Field(default=60.0)
 
 
 class ModelSettings(BaseSettings):
@@ -54,6 +70,128 @@ class ModelSettings(BaseSettings):
     device: str = Field(default="cuda")
 
 
+class RiskSettings(BaseSettings):
+    """Pre-trade risk limits (per-venue/symbol overrides keyed as ``venue:symbol``)."""
+
+    default_order_quantity: float = Field(default=1.0)
+    max_order_notional: float = Field(default=50_000.0)
+    max_position: float = Field(default=1_000.0)
+    orders_per_second: float = Field(default=10.0)
+    order_burst: int = Field(default=20)
+    price_band_pct: float = Field(default=0.05)
+    max_daily_loss: float = Field(default=5_000.0)
+    # UTC hour at which the trading day (and the daily-loss baseline) rolls over.
+    day_reset_utc_hour: float = Field(default=0.0)
+    require_reference_price: bool = Field(default=False)
+    overrides: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+
+
+class NettingSettings(BaseSettings):
+    """Per-symbol signal netting; a zero window sends every signal straight through."""
+
+    window_ms: float = Field(default=0.0)
+    flush_threshold: float = Field(default=0.0)
+
+
+class OrderStoreSettings(BaseSettings):
+    """Order write-ahead log location and group-commit tuning."""
+
+    wal_path: Path = Field(default=Path("./data/orders.wal"))
+    commit_interval_ms: float = Field(default=2.0)
+    fsync: bool = Field(default=True)
+    max_closed_orders: int = Field(default=10_000)
+
+
+class TracingSettings(BaseSettings):
+    """Order latency tracing; percentiles cover the most recent ``sample_capacity`` orders."""
+
+    enabled: bool = Field(default=True)
+    sample_capacity: int = Field(default=4096)
+    report_interval_seconds: float = Field(default=60.0)
+
+
+class LoggingSettings(BaseSettings):
+    """Log sinks; records are written by background threads in batches."""
+
+    console: bool = Field(default=True)
+    json_path: Optional[Path] = Field(default=Path("./logs/app.jsonl"))
+    max_bytes: int = Field(default=20 * 1024 * 1024)
+    backups: int = Field(default=5)
+    batch_size: int = Field(default=512)
+    flush_interval_seconds: float = Field(default=0.25)
+    # Per-module minimum levels, e.g. {"basic_trading_software.trading.adapters": "DEBUG"}.
+    levels: Dict[str, str] = Field(default_factory=dict)
+
+
+class HttpSettings(BaseSettings):
+    """Connection pool tuning for the shared adapter HTTP transport."""
+
+    connection_limit: int = Field(default=100)
+    connection_limit_per_host: int = Field(default=20)
+    keepalive_timeout_seconds: float = Field(default=60.0)
+    dns_cache_ttl_seconds: int = Field(default=300)
+    connect_timeout_seconds: float = Field(default=5.0)
+    request_timeout_seconds: float = Field(default=10.0)
+    warm_connections: int = Field(default=2)
+
+
+class InstrumentSettings(BaseSettings):
+    """Instrument metadata cache (lot/tick sizes, minimums) and its on-disk snapshot."""
+
+    snapshot_path: Path = Field(default=Path("./data/instruments.json"))
+    ttl_seconds: float = Field(default=6 * 3600.0)
+
+
+class VenueRequestSettings(BaseSettings):
+    """Latency budgets, retries, hedging and circuit breaking for venue REST calls."""
+
+    # Per-attempt budget by adapter endpoint (place_order, cancel_order, fetch_positions, ...).
+    budgets_ms: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "place_order": 1_000.0,
+            "find_order": 1_000.0,
+            "cancel_order": 1_000.0,
+            "cancel_all_orders": 2_000.0,
+            "fetch_positions": 1_500.0,
+            "fetch_instruments": 10_000.0,
+        }
+    )
+    default_budget_ms: float = Field(default=5_000.0)
+    order_retries: int = Field(default=2)
+    read_retries: int = Field(default=1)
+    hedge_reads: bool = Field(default=True)
+    hedge_quantile: float = Field(default=95.0)
+    min_hedge_delay_ms: float = Field(default=10.0)
+    breaker_failure_threshold: int = Field(default=5)
+    breaker_reset_seconds: float = Field(default=5.0)
+
+
+class DaemonSettings(BaseSettings):
+    """Headless runtime (``--headless``) options."""
+
+    symbols: List[str] = Field(default_factory=lambda: ["DEMO"])
+    use_uvloop: bool = Field(default=True)
+    shutdown_timeout_seconds: float = Field(default=10.0)
+
+
+class StartupSettings(BaseSettings):
+    """Cold-start budget checked by ``--profile-startup``."""
+
+    budget_ms: float = Field(default=1000.0)
+    report_top: int = Field(default=15)
+
+
+class UiSettings(BaseSettings):
+    """Desktop UI buffers and redraw rate."""
+
+    chart_capacity: int = Field(default=200_000)
+    chart_marker_capacity: int = Field(default=10_000)
+    chart_fps: int = Field(default=30)
+    activity_log_capacity: int = Field(default=200_000)
+    staking_log_capacity: int = Field(default=20_000)
+    log_flush_interval_ms: int = Field(default=50)
+
+
 class AppSettings(BaseSettings):
     """Top-level application settings."""
 
@@ -65,6 +203,17 @@ class AppSettings(BaseSettings):
     broker_crypto: CryptoExchangeSettings = CryptoExchangeSettings()
     staking: StakingSettings = StakingSettings()
     model: ModelSettings = ModelSettings()
+    risk: RiskSettings = RiskSettings()
+    orders: OrderStoreSettings = OrderStoreSettings()
+    netting: NettingSettings = NettingSettings()
+    tracing: TracingSettings = TracingSettings()
+    logging: LoggingSettings = LoggingSettings()
+    http: HttpSettings = HttpSettings()
+    venue_requests: VenueRequestSettings = VenueRequestSettings()
+    instruments: InstrumentSettings = InstrumentSettings()
+    daemon: DaemonSettings = DaemonSettings()
+    startup: StartupSettings = StartupSettings()
+    ui: UiSettings = UiSettings()
 
     class Config:
         env_nested_delimiter = "__"
@@ -2,20 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import tempfile
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
 
 class CredentialStore:
-    """Simple JSON-backed credential manager."""
+    """JSON-backed credential manager.
+
+    Reads are served from memory. Changes made inside ``transaction()`` (or one ``update``
+    call) are persisted with a single write: atomically via a temp file, fsync and rename,
+    and off the event loop when one is running, so saving settings never blocks the UI or
+    the order path. Without a running loop the write happens inline.
+    """
 
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or Path("./config/credentials.json")
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._cache: Dict[str, Dict[str, str]] = {}
+        self._version = 0
+        self._saved_version = 0
+        self._depth = 0
+        self._write_lock = asyncio.Lock()
+        self._writer: asyncio.Task[None] | None = None
         self._load()
 
     def _load(self) -> None:
@@ -28,21 +44,97 @@ class CredentialStore:
                 logger.warning("[credentials] Failed to parse credentials file; starting fresh")
                 self._cache = {}
 
+    @property
+    def dirty(self) -> bool:
+        return self._version != self._saved_version
+
     def save(self) -> None:
-        self._path.write_text(json.dumps(self._cache, indent=2))
+        """Write the current credentials now (blocking)."""
+
+        version = self._version
+        self._write(self._serialize())
+        self._saved_version = version
+
+    async def flush(self) -> None:
+        """Persist pending changes off the event loop; returns once the file is current."""
+
+        async with self._write_lock:
+            while self.dirty:
+                version = self._version
+                try:
+                    await asyncio.to_thread(self._write, self._serialize())
+                except OSError as exc:
+                    logger.error(f"[credentials] Could not write {self._path}: {exc}")
+                    return
+                self._saved_version = version
 
     def get(self, venue: str) -> Tuple[Optional[str], Optional[str]]:
         creds = self._cache.get(venue.lower(), {})
         return creds.get("api_key"), creds.get("api_secret")
 
     def set(self, venue: str, api_key: str | None, api_secret: str | None) -> None:
-        venue = venue.lower()
+        self.update({venue: (api_key, api_secret)})
+
+    def update(self, entries: Mapping[str, Tuple[str | None, str | None]]) -> List[str]:
+        """Apply several venues' credentials with one write; returns the venues that changed.
+
+        A venue with neither key nor secret is removed.
+        """
+
+        with self.transaction():
+            changed = [
+                venue.lower()
+                for venue, (api_key, api_secret) in entries.items()
+                if self._apply(venue.lower(), api_key, api_secret)
+            ]
+        if changed:
+            logger.info(f"[credentials] Updated credentials for {', '.join(changed)}")
+        return changed
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group changes so they are written once, when the outermost transaction ends."""
+
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and self.dirty:
+                self._schedule_save()
+
+    def _apply(self, venue: str, api_key: str | None, api_secret: str | None) -> bool:
         if api_key or api_secret:
-            self._cache[venue] = {
-                "api_key": api_key or "",
-                "api_secret": api_secret or "",
-            }
-        elif venue in self._cache:
-            del self._cache[venue]
-        self.save()
-        logger.info(f"[credentials] Updated credentials for venue '{venue}'")
+            entry = {"api_key": api_key or "", "api_secret": api_secret or ""}
+            if self._cache.get(venue) == entry:
+                return False
+            self._cache[venue] = entry
+        elif self._cache.pop(venue, None) is None:
+            return False
+        self._version += 1
+        return True
+
+    def _schedule_save(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        # One writer at a time; it keeps writing until it has caught up with every change.
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self.flush(), name="credentials-flush")
+
+    def _serialize(self) -> str:
+        return json.dumps(self._cache, indent=2)
+
+    def _write(self, text: str) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self._path.parent, prefix=f".{self._path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(text)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp, self._path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
@@ -3,9 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
 from collections.abc import Awaitable, Callable
-from typing import Any, DefaultDict, Dict, List
+from typing import Any, Dict, Tuple
 
 EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
 
@@ -14,30 +13,35 @@ class EventBus:
     """Publish/subscribe event dispatcher."""
 
     def __init__(self) -> None:
-        self._subscribers: DefaultDict[str, List[EventHandler]] = defaultdict(list)
+        # Handler tuples are replaced (never mutated) on subscribe/unsubscribe, so publish can
+        # read a consistent snapshot without taking the lock.
+        self._subscribers: Dict[str, Tuple[EventHandler, ...]] = {}
         self._lock = asyncio.Lock()
 
     async def subscribe(self, event_type: str, handler: EventHandler) -> None:
         """Register handler for event type."""
 
         async with self._lock:
-            self._subscribers[event_type].append(handler)
+            self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (handler,)
 
     async def unsubscribe(self, event_type: str, handler: EventHandler) -> None:
         """Remove handler."""
 
         async with self._lock:
-            handlers = self._subscribers[event_type]
+            handlers = list(self._subscribers.get(event_type, ()))
             if handler in handlers:
                 handlers.remove(handler)
+                self._subscribers[event_type] = tuple(handlers)
 
     async def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
         """Send event to subscribers."""
 
-        async with self._lock:
-            handlers = list(self._subscribers[event_type])
-
-        coros = [handler(payload) for handler in handlers]
-        if coros:
-            await asyncio.gather(*coros, return_exceptions=False)
+        handlers = self._subscribers.get(event_type)
+        if not handlers:
+            return
+        if len(handlers) == 1:
+            # Skip task creation in gather for the common single-subscriber case.
+            await handlers[0](payload)
+            return
+        await asyncio.gather(*(handler(payload) for handler in handlers), return_exceptions=False)
 
@@ -0,0 +1,79 @@
+"""Shared HTTP transport with a tuned, pre-warmable connection pool."""
+
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import aiohttp
+from loguru import logger
+
+from .config import HttpSettings, get_settings
+
+
+class HttpTransport:
+    """One ``aiohttp.ClientSession`` shared by every adapter.
+
+    The connector keeps connections alive between orders, caches DNS and caps concurrency
+    per host, so the order path never pays TCP/TLS setup once the pool is warm. Credentials
+    are not baked into the session: adapters pass their auth headers per request, which lets
+    a credential change take effect without dropping pooled connections.
+    """
+
+    def __init__(self, settings: HttpSettings | None = None) -> None:
+        self._settings = settings or get_settings().http
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session, created on first use inside the running loop."""
+
+        if self._session is None or self._session.closed:
+            settings = self._settings
+            connector = aiohttp.TCPConnector(
+                limit=settings.connection_limit,
+                limit_per_host=settings.connection_limit_per_host,
+                ttl_dns_cache=settings.dns_cache_ttl_seconds,
+                keepalive_timeout=settings.keepalive_timeout_seconds,
+                enable_cleanup_closed=True,
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=settings.request_timeout_seconds,
+                sock_connect=settings.connect_timeout_seconds,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def warm(self, urls: Iterable[str], connections: int | None = None) -> None:
+        """Open ``connections`` keep-alive connections to each URL's host ahead of trading.
+
+        Each URL should be a cheap, unauthenticated endpoint (ping/clock); response bodies are
+        drained so the connections go back to the pool.
+        """
+
+        count = max(1, connections or self._settings.warm_connections)
+
+        async def hit(url: str) -> None:
+            try:
+                async with self.session.get(url) as resp:
+                    await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                logger.warning(f"[http] Pre-warm of {url} failed: {exc}")
+
+        targets = [url for url in urls for _ in range(count)]
+        if targets:
+            await asyncio.gather(*(hit(url) for url in targets))
+            logger.info(f"[http] Pre-warmed {len(targets)} connections")
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+@lru_cache(maxsize=1)
+def get_transport() -> HttpTransport:
+    """Return the process-wide transport."""
+
+    return HttpTransport()
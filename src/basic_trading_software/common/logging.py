@@ -1,21 +1,287 @@
-"""Centralized logging configuration."""
+"""Centralized logging configuration.
+
+Records are handed to background writer threads, which format and write them in batches,
+so a log call on the order path costs one record and a queue put. Message arguments are
+only formatted when some sink accepts the level (use ``logger.info("... {}", value)``
+rather than f-strings on hot paths), and ``LogSampler`` thins out high-frequency sites.
+"""
 
 from __future__ import annotations
 
+import json
+import queue
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, TextIO
+
 from loguru import logger
 
-from .config import get_settings
+from .config import LoggingSettings, get_settings
+
+_STOP = object()
+
+
+class _BackgroundSink(ABC):
+    """loguru sink that queues records for a writer thread, which drains them in batches."""
+
+    def __init__(self, name: str, batch_size: int = 512, flush_interval: float = 0.25) -> None:
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        # The record dict is not touched again by loguru, so formatting can wait.
+        self._queue.put(message.record)
+
+    def stop(self) -> None:
+        """Write everything queued so far and stop the thread (called by ``logger.remove``)."""
+
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            batch: List[Dict[str, Any]] = []
+            stopping = item is _STOP
+            if not stopping:
+                batch.append(item)
+            while len(batch) < self._batch_size and not stopping:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            if batch:
+                try:
+                    self._emit(batch)
+                except Exception as exc:  # noqa: BLE001 - a log sink must never raise
+                    print(f"[logging] {self._thread.name} write failed: {exc}", file=sys.stderr)
+            if stopping:
+                return
+
+    @abstractmethod
+    def _emit(self, batch: List[Dict[str, Any]]) -> None:
+        """Write one batch of records (on the writer thread)."""
+
+
+def _exception_text(record: Mapping[str, Any]) -> str | None:
+    exception = record["exception"]
+    if exception is None:
+        return None
+    return "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+
+
+class ConsoleSink(_BackgroundSink):
+    """Human-readable lines on a stream (stderr by default)."""
+
+    def __init__(self, stream: TextIO | None = None, **kwargs: Any) -> None:
+        self._stream = stream or sys.stderr
+        super().__init__("log-console", **kwargs)
+
+    def _emit(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        for record in batch:
+            lines.append(
+                f"{record['time']:%Y-%m-%d %H:%M:%S.%f} | {record['level'].name:<8} | "
+                f"{record['name']}:{record['function']}:{record['line']} - {record['message']}\n"
+            )
+            text = _exception_text(record)
+            if text:
+                lines.append(text)
+        self._stream.write("".join(lines))
+        self._stream.flush()
+
+
+class JsonFileSink(_BackgroundSink):
+    """One JSON object per line, rotated to ``path.1`` … ``path.<backups>`` by size."""
+
+    def __init__(
+        self, path: Path, max_bytes: int = 20 * 1024 * 1024, backups: int = 5, **kwargs: Any
+    ) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._size = self._path.stat().st_size if self._path.exists() else 0
+        super().__init__("log-json", **kwargs)
+
+    def _emit(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        for record in batch:
+            entry: Dict[str, Any] = {
+                "ts": record["time"].timestamp(),
+                "level": record["level"].name,
+                "module": record["name"],
+                "function": record["function"],
+                "line": record["line"],
+                "message": record["message"],
+                "thread": record["thread"].name,
+            }
+            if record["extra"]:
+                entry["extra"] = record["extra"]
+            text = _exception_text(record)
+            if text:
+                entry["exception"] = text
+            lines.append(json.dumps(entry, default=str, separators=(",", ":")))
+        data = "\n".join(lines) + "\n"
+        if self._max_bytes and self._size and self._size + len(data) > self._max_bytes:
+            self._rotate()
+        # One open per batch (not per record) keeps rotation and shutdown trivial.
+        with open(self._path, "a", encoding="utf-8") as handle:
+            handle.write(data)
+        self._size += len(data)
+
+    def _rotate(self) -> None:
+        name = self._path.name
+        for index in range(self._backups, 0, -1):
+            source = self._path.with_name(f"{name}.{index - 1}") if index > 1 else self._path
+            if source.exists():
+                source.replace(self._path.with_name(f"{name}.{index}"))
+        if not self._backups:
+            self._path.unlink(missing_ok=True)
+        self._size = 0
+
+
+class _LevelFilter:
+    """Minimum level per module, resolved by longest dotted prefix and cached per module."""
 
+    def __init__(self, default: int) -> None:
+        self.default = default
+        self.overrides: Dict[str, int] = {}
+        self._resolved: Dict[str, int] = {}
 
-def configure_logging() -> None:
+    @property
+    def floor(self) -> int:
+        return min([self.default, *self.overrides.values()])
+
+    def reset(self, default: int) -> None:
+        self.default = default
+        self.overrides = {}
+        self._resolved = {}
+
+    def set(self, module: str, level: int | None) -> None:
+        if level is None:
+            self.overrides.pop(module, None)
+        else:
+            self.overrides[module] = level
+        self._resolved = {}
+
+    def __call__(self, record: Mapping[str, Any]) -> bool:
+        name = record["name"] or ""
+        threshold = self._resolved.get(name)
+        if threshold is None:
+            threshold = self._resolve(name)
+            self._resolved[name] = threshold
+        return record["level"].no >= threshold
+
+    def _resolve(self, name: str) -> int:
+        while name:
+            level = self.overrides.get(name)
+            if level is not None:
+                return level
+            name = name.rpartition(".")[0]
+        return self.default
+
+
+class LogSampler:
+    """Lets one record per ``interval`` seconds through a high-frequency log site.
+
+    ``take()`` returns ``None`` while the site is throttled, otherwise how many records were
+    skipped since the last one, so the message can say so::
+
+        skipped = _SAMPLER.take()
+        if skipped is not None:
+            logger.info("[engine] Received signal {} ({} more since last)", symbol, skipped)
+    """
+
+    __slots__ = ("interval", "_next", "_skipped")
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+        self._next = 0.0
+        self._skipped = 0
+
+    def take(self) -> int | None:
+        now = time.monotonic()
+        if now < self._next:
+            self._skipped += 1
+            return None
+        self._next = now + self.interval
+        skipped, self._skipped = self._skipped, 0
+        return skipped
+
+
+_filter = _LevelFilter(logger.level("INFO").no)
+_handlers: List[int] = []
+_level_names: Dict[str, str] = {}
+_settings: LoggingSettings | None = None
+
+
+def configure_logging(settings: LoggingSettings | None = None) -> None:
     """Configure global logger sinks."""
 
-    settings = get_settings()
-    logger.remove()
-    logger.add(
-        sink=lambda msg: print(msg, end=""),
-        level=settings.log_level.upper(),
-        colorize=True,
-        enqueue=True,
-    )
+    global _settings
+    app_settings = get_settings()
+    _settings = settings or app_settings.logging
+    _filter.reset(logger.level(app_settings.log_level.upper()).no)
+    _level_names.clear()
+    for module, level in _settings.levels.items():
+        _filter.set(module, logger.level(level.upper()).no)
+        _level_names[module] = level.upper()
+    _install()
+
+
+def set_module_level(module: str, level: str | None) -> None:
+    """Change the minimum level for ``module`` and its submodules at runtime; ``None``
+    restores the global level."""
 
+    previous = _filter.floor
+    _filter.set(module, logger.level(level.upper()).no if level is not None else None)
+    if level is None:
+        _level_names.pop(module, None)
+    else:
+        _level_names[module] = level.upper()
+    logger.info("[logging] {} level set to {}", module, level or "default")
+    # Sinks are registered at the lowest level in use so loguru can drop everything below
+    # it before building a record; re-register when that floor moves.
+    if _filter.floor != previous and _handlers:
+        _install()
+
+
+def module_levels() -> Dict[str, str]:
+    return dict(_level_names)
+
+
+def _install() -> None:
+    settings = _settings or get_settings().logging
+    logger.remove()
+    _handlers.clear()
+    options: Dict[str, Any] = {
+        "level": _filter.floor,
+        "filter": _filter,
+        "format": "{message}",
+        "catch": True,
+    }
+    batching = {
+        "batch_size": settings.batch_size,
+        "flush_interval": settings.flush_interval_seconds,
+    }
+    if settings.console:
+        _handlers.append(logger.add(ConsoleSink(**batching), **options))
+    if settings.json_path is not None:
+        sink = JsonFileSink(settings.json_path, settings.max_bytes, settings.backups, **batching)
+        _handlers.append(logger.add(sink, **options))
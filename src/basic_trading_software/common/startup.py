@@ -0,0 +1,174 @@
+"""Startup profiling: per-module import cost and cold start to first quote."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+HEADLESS_MODULES = ("basic_trading_software.daemon",)
+# Imported by the GUI on top of everything the daemon needs.
+UI_MODULES = (
+    "PySide6.QtWidgets",
+    "qasync",
+    "qt_material",
+    "basic_trading_software.ui.main_window",
+)
+
+
+@dataclass(frozen=True)
+class ImportCost:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+
+
+@dataclass
+class StartupReport:
+    """Import breakdown plus the measured cold start, checked against ``budget_ms``."""
+
+    imports: List[ImportCost]
+    import_ms: Dict[str, float]
+    first_quote_ms: float | None
+    ui_import_ms: float
+    budget_ms: float
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def cold_start_ms(self) -> float | None:
+        if self.first_quote_ms is None:
+            return None
+        return self.first_quote_ms + self.ui_import_ms
+
+    @property
+    def within_budget(self) -> bool:
+        cold = self.cold_start_ms
+        return cold is not None and cold <= self.budget_ms and not self.errors
+
+    def format(self, top: int = 15) -> str:
+        lines = [f"{'self ms':>10} {'cumul ms':>10}  module"]
+        for cost in sorted(self.imports, key=lambda item: item.self_ms, reverse=True)[:top]:
+            lines.append(f"{cost.self_ms:>10.1f} {cost.cumulative_ms:>10.1f}  {cost.module}")
+        lines.append("")
+        for module, ms in self.import_ms.items():
+            lines.append(f"import {module}: {ms:.0f} ms")
+        if self.first_quote_ms is not None:
+            lines.append(f"first quote (headless, in-process): {self.first_quote_ms:.0f} ms")
+        if self.ui_import_ms:
+            lines.append(f"UI imports: {self.ui_import_ms:.0f} ms")
+        lines.extend(f"error: {error}" for error in self.errors)
+        cold = self.cold_start_ms
+        verdict = "OK" if self.within_budget else "OVER BUDGET"
+        shown = f"{cold:.0f}" if cold is not None else "n/a"
+        lines.append(f"cold start: {shown} ms / budget {self.budget_ms:.0f} ms -> {verdict}")
+        return "\n".join(lines)
+
+
+def measure_imports(modules: Sequence[str]) -> List[ImportCost]:
+    """Import ``modules`` (in order) in a fresh interpreter under ``-X importtime``.
+
+    A subprocess keeps the numbers cold regardless of what this process already imported.
+    """
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        detail = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+        raise ImportError(f"importing {', '.join(modules)}: {detail}")
+    costs: List[ImportCost] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        costs.append(ImportCost(name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return costs
+
+
+async def time_to_first_quote(timeout: float = 10.0) -> float:
+    """Seconds from importing the headless runtime to its first ``market.quote``.
+
+    The runtime runs against a simulated venue with its order log, instrument snapshot,
+    staking book and credentials in a temporary directory, so profiling neither connects to
+    a live venue nor writes under the working directory. The equity data stream and APR
+    refreshes stay off for the same reason.
+    """
+
+    started = time.perf_counter()
+    from basic_trading_software.common.config import get_settings
+    from basic_trading_software.common.credentials import CredentialStore
+    from basic_trading_software.daemon import HeadlessRuntime
+    from basic_trading_software.trading.adapters.simulated import SimulatedExchangeAdapter
+
+    with tempfile.TemporaryDirectory(prefix="startup-profile-") as tmp:
+        data_dir = Path(tmp)
+        settings = get_settings().copy(deep=True)
+        settings.orders.wal_path = data_dir / "orders.wal"
+        settings.instruments.snapshot_path = data_dir / "instruments.json"
+        settings.staking.book_path = data_dir / "staking_book.json"
+        settings.staking.tracked_assets = []
+        settings.broker_equity.data_symbols = []
+        runtime = HeadlessRuntime(
+            settings,
+            adapters=[SimulatedExchangeAdapter(symbols=settings.daemon.symbols)],
+            credentials=CredentialStore(data_dir / "credentials.json"),
+        )
+        first = asyncio.Event()
+
+        async def on_quote(payload: Dict[str, object]) -> None:
+            first.set()
+
+        await runtime.event_bus.subscribe("market.quote", on_quote)
+        try:
+            await runtime.start()
+            await asyncio.wait_for(first.wait(), timeout)
+            return time.perf_counter() - started
+        finally:
+            await runtime.stop()
+
+
+def profile_startup(headless: bool = True, budget_ms: float | None = None) -> StartupReport:
+    """Profile a cold start of the headless runtime (plus the UI imports unless
+    ``headless``) against ``budget_ms`` (``startup.budget_ms`` by default).
+
+    The first quote is always measured headless: the GUI needs a display, and everything it
+    adds before the first quote is the cost of importing Qt and the window modules.
+    """
+
+    modules = HEADLESS_MODULES if headless else HEADLESS_MODULES + UI_MODULES
+    errors: List[str] = []
+    try:
+        imports = measure_imports(modules)
+    except ImportError as exc:
+        imports = []
+        errors.append(str(exc))
+    top_level = {cost.module: cost.cumulative_ms for cost in imports if cost.module in modules}
+    ui_import_ms = sum(ms for module, ms in top_level.items() if module in UI_MODULES)
+
+    first_quote_ms: float | None = None
+    try:
+        first_quote_ms = asyncio.run(time_to_first_quote()) * 1000
+    except Exception as exc:  # noqa: BLE001 - reported as a profiling error, not raised
+        errors.append(f"no quote: {type(exc).__name__}: {exc}")
+
+    from basic_trading_software.common.config import get_settings
+
+    settings = get_settings().startup
+    return StartupReport(
+        imports=imports,
+        import_ms=top_level,
+        first_quote_ms=first_quote_ms,
+        ui_import_ms=ui_import_ms,
+        budget_ms=budget_ms if budget_ms is not None else settings.budget_ms,
+        errors=errors,
+    )
@@ -0,0 +1,172 @@
+"""Low-overhead latency tracing from bar close to venue acknowledgement."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config import get_settings
+
+BAR_CLOSE = "bar_close"
+FEATURES_READY = "features_ready"
+INFERENCE_DONE = "inference_done"
+SIGNAL_PUBLISHED = "signal_published"
+ENGINE_RECEIVED = "engine_received"
+RISK_PASSED = "risk_passed"
+ADAPTER_SEND = "adapter_send"
+VENUE_RESPONSE = "venue_response"
+FILLED = "filled"
+TOTAL = "total"
+
+STAGES = (
+    BAR_CLOSE,
+    FEATURES_READY,
+    INFERENCE_DONE,
+    SIGNAL_PUBLISHED,
+    ENGINE_RECEIVED,
+    RISK_PASSED,
+    ADAPTER_SEND,
+    VENUE_RESPONSE,
+    FILLED,
+)
+
+_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+class _Samples:
+    """Fixed-size ring of recent latencies in microseconds."""
+
+    __slots__ = ("values", "count")
+
+    def __init__(self, capacity: int) -> None:
+        self.values = np.empty(capacity)
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.values[self.count % self.values.shape[0]] = value
+        self.count += 1
+
+    def window(self) -> np.ndarray:
+        return self.values[: min(self.count, self.values.shape[0])]
+
+
+class LatencyTracer:
+    """Collects per-order stage timestamps and aggregates stage-to-stage latencies.
+
+    A trace is a short list of ``(stage, perf_counter_ns)`` pairs keyed by a trace id that
+    travels in event payloads (``trace_id``). Stages may be skipped (e.g. signals that do not
+    come from bars); each recorded stage is measured from the previous recorded one. When the
+    trace is finished the deltas go into per-(venue, stage) rings, so reports reflect the most
+    recent ``capacity`` orders.
+    """
+
+    def __init__(self, enabled: bool = True, capacity: int = 4096, max_open: int = 10_000) -> None:
+        self.enabled = enabled
+        self._capacity = max(1, capacity)
+        self._max_open = max_open
+        self._ids = itertools.count(1)
+        self._open: Dict[str, List[Tuple[str, int]]] = {}
+        self._samples: Dict[Tuple[str, str], _Samples] = {}
+
+    def begin(self, stage: str = BAR_CLOSE, timestamp_ns: int | None = None) -> str | None:
+        """Start a trace at ``stage`` and return its id (``None`` while disabled)."""
+
+        if not self.enabled:
+            return None
+        if len(self._open) >= self._max_open:
+            # Traces that never finish (dropped signals, netted-out orders) age out oldest first.
+            del self._open[next(iter(self._open))]
+        trace_id = f"t{next(self._ids)}"
+        self._open[trace_id] = [(stage, timestamp_ns or time.perf_counter_ns())]
+        return trace_id
+
+    def mark(self, trace_id: object, stage: str) -> None:
+        if trace_id is None:
+            return
+        trace = self._open.get(trace_id)  # type: ignore[call-overload]
+        if trace is not None:
+            trace.append((stage, time.perf_counter_ns()))
+
+    def finish(self, trace_id: object, venue: str | None = None) -> None:
+        """Close the trace and fold its stage deltas into the venue's statistics."""
+
+        if trace_id is None:
+            return
+        trace = self._open.pop(trace_id, None)  # type: ignore[call-overload]
+        if not trace:
+            return
+        venue = (venue or "-").lower()
+        previous = trace[0][1]
+        for stage, stamp in trace[1:]:
+            self._record(venue, stage, (stamp - previous) / 1_000)
+            previous = stamp
+        self._record(venue, TOTAL, (previous - trace[0][1]) / 1_000)
+
+    def discard(self, trace_id: object) -> None:
+        if trace_id is not None:
+            self._open.pop(trace_id, None)  # type: ignore[call-overload]
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """``{venue: {stage: {"count", "p50", "p90", "p99", "max"}}}`` in microseconds."""
+
+        order = {stage: i for i, stage in enumerate(STAGES + (TOTAL,))}
+        report: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (venue, stage), samples in sorted(
+            self._samples.items(), key=lambda item: (item[0][0], order.get(item[0][1], len(order)))
+        ):
+            values = samples.window()
+            if values.size == 0:
+                continue
+            p50, p90, p99 = np.percentile(values, _PERCENTILES)
+            report.setdefault(venue, {})[stage] = {
+                "count": float(samples.count),
+                "p50": float(p50),
+                "p90": float(p90),
+                "p99": float(p99),
+                "max": float(values.max()),
+            }
+        return report
+
+    def format_report(self) -> str:
+        lines = []
+        for venue, stages in self.report().items():
+            lines.append(f"{venue}:")
+            for stage, stats in stages.items():
+                lines.append(
+                    f"  {stage:<17} n={int(stats['count']):>7}  p50={stats['p50']:>10.1f}us"
+                    f"  p90={stats['p90']:>10.1f}us  p99={stats['p99']:>10.1f}us  max={stats['max']:>10.1f}us"
+                )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self._open.clear()
+        self._samples.clear()
+
+    async def run_reporter(self, interval: float) -> None:
+        """Log the percentile report every ``interval`` seconds."""
+
+        while True:
+            await asyncio.sleep(interval)
+            if self._samples:
+                logger.info(f"[tracing] Order latency by stage\n{self.format_report()}")
+
+    def _record(self, venue: str, stage: str, micros: float) -> None:
+        samples = self._samples.get((venue, stage))
+        if samples is None:
+            samples = _Samples(self._capacity)
+            self._samples[(venue, stage)] = samples
+        samples.add(micros)
+
+
+@lru_cache(maxsize=1)
+def get_tracer() -> LatencyTracer:
+    """Return the process-wide tracer configured from settings."""
+
+    settings = get_settings().tracing
+    return LatencyTracer(enabled=settings.enabled, capacity=settings.sample_capacity)
@@ -0,0 +1,243 @@
+"""Headless runtime: the trading stack on a plain asyncio loop, without Qt."""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+import time
+from typing import Any, Dict, List, Sequence
+
+from loguru import logger
+
+from basic_trading_software.common.config import AppSettings, get_settings
+from basic_trading_software.common.credentials import CredentialStore
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.http import get_transport
+from basic_trading_software.common.logging import configure_logging
+from basic_trading_software.common.tracing import get_tracer
+from basic_trading_software.data.providers import LiveDataProvider
+from basic_trading_software.ml.strategy import MLStrategy
+from basic_trading_software.trading.adapters.base import BrokerAdapter
+from basic_trading_software.trading.adapters.crypto import BinanceAdapter
+from basic_trading_software.trading.adapters.equity import AlpacaAdapter
+from basic_trading_software.trading.engine import TradingEngine
+from basic_trading_software.trading.instruments import InstrumentCache
+from basic_trading_software.trading.orders import OrderStore
+from basic_trading_software.trading.router import SmartOrderRouter
+from basic_trading_software.trading.staking import StakingService
+from basic_trading_software.trading.user_data import UserDataStreams
+
+STARTING = "starting"
+RUNNING = "running"
+STOPPING = "stopping"
+STOPPED = "stopped"
+
+
+class HeadlessRuntime:
+    """Wires the data provider, strategy, engine and staking service without a UI.
+
+    ``start``/``stop`` can be driven by a host process (e.g. an API server's lifespan hooks),
+    which reads ``status()`` for health and dashboards; ``run`` is the standalone daemon
+    that waits for SIGINT/SIGTERM and then shuts everything down in reverse order.
+    ``adapters`` and ``credentials`` default to the live Alpaca and Binance adapters and the
+    credential file in ``./config``.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings | None = None,
+        adapters: Sequence[BrokerAdapter] | None = None,
+        credentials: CredentialStore | None = None,
+    ) -> None:
+        self._settings = settings or get_settings()
+        self.event_bus = EventBus()
+        self.credentials = credentials or CredentialStore()
+        self.alpaca: AlpacaAdapter | None = None
+        if adapters is None:
+            self.alpaca = AlpacaAdapter(credentials=self.credentials)
+            adapters = [self.alpaca, BinanceAdapter(credentials=self.credentials)]
+        self.adapters = list(adapters)
+        self.engine = TradingEngine(
+            self.event_bus,
+            adapters=self.adapters,
+            router=SmartOrderRouter(
+                self.adapters, InstrumentCache.from_settings(self._settings.instruments)
+            ),
+            order_store=OrderStore.from_settings(self._settings.orders),
+        )
+        self.user_data = UserDataStreams(self.event_bus, self.adapters)
+        self.strategy = MLStrategy(self.event_bus)
+        self.data_provider = LiveDataProvider()
+        self.staking = StakingService(self.event_bus, settings=self._settings.staking)
+        self._symbols = [symbol.upper() for symbol in self._settings.daemon.symbols]
+        self._equity_symbols = [
+            symbol.upper() for symbol in self._settings.broker_equity.data_symbols
+        ]
+        self._tasks: List[asyncio.Task[None]] = []
+        self._state = STOPPED
+        self._started_at: float | None = None
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._quote_count = 0
+        self._signal_count = 0
+        self._order_count = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    async def start(self) -> None:
+        if self._state != STOPPED:
+            return
+        self._state = STARTING
+        logger.info(f"[daemon] Starting headless runtime in {self._settings.environment} mode")
+        await self.event_bus.subscribe("signal.generated", self._on_signal)
+        await self.event_bus.subscribe("order.submitted", self._on_order)
+        await self.engine.start()
+        await self.user_data.start()
+        await self.strategy.start()
+        await self.staking.start()
+        for symbol in self._symbols:
+            task = asyncio.create_task(self._pump_quotes(symbol), name=f"quotes-{symbol}")
+            self._tasks.append(task)
+        if self._equity_symbols and self.alpaca is not None:
+            self._tasks.append(
+                asyncio.create_task(
+                    self.alpaca.run_market_data(self.event_bus, self._equity_symbols),
+                    name="alpaca-data",
+                )
+            )
+        tracing = self._settings.tracing
+        if tracing.enabled and tracing.report_interval_seconds > 0:
+            self._tasks.append(
+                asyncio.create_task(
+                    get_tracer().run_reporter(tracing.report_interval_seconds), name="trace-report"
+                )
+            )
+        self._started_at = time.time()
+        self._state = RUNNING
+        streaming = self._symbols + self._equity_symbols
+        logger.info(f"[daemon] Running; streaming {', '.join(streaming) or 'no symbols'}")
+
+    async def stop(self) -> None:
+        """Stop producers first, then the engine (which drains in-flight orders), then I/O."""
+
+        if self._state in (STOPPED, STOPPING):
+            return
+        self._state = STOPPING
+        logger.info("[daemon] Shutting down")
+        self.data_provider.stop()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self.strategy.stop()
+        await self.engine.stop()
+        await self.user_data.stop()
+        await self.staking.stop()
+        await self.event_bus.unsubscribe("signal.generated", self._on_signal)
+        await self.event_bus.unsubscribe("order.submitted", self._on_order)
+        for adapter in self.adapters:
+            await adapter.close()
+        await self.credentials.flush()
+        await get_transport().close()
+        self._state = STOPPED
+        logger.info("[daemon] Stopped")
+
+    async def run(self) -> None:
+        """Run until SIGINT/SIGTERM, then shut down within the configured timeout."""
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: KeyboardInterrupt cancels the runner instead.
+        try:
+            await self.start()
+            await stop.wait()
+        finally:
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(self.stop()), self._settings.daemon.shutdown_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.error("[daemon] Shutdown timed out; exiting with work still pending")
+
+    def status(self) -> Dict[str, Any]:
+        """JSON-serialisable snapshot of the runtime for health checks and dashboards."""
+
+        totals = self.engine.portfolio_totals()
+        return {
+            "state": self._state,
+            "environment": self._settings.environment,
+            "trading_mode": self._settings.trading_mode,
+            "started_at": self._started_at,
+            "uptime_seconds": time.time() - self._started_at if self._started_at else 0.0,
+            "venues": [adapter.venue for adapter in self.adapters],
+            "symbols": self._symbols + self._equity_symbols,
+            "counters": {
+                "quotes": self._quote_count,
+                "signals": self._signal_count,
+                "orders": self._order_count,
+                "open_orders": len(self.engine.orders.open_orders()),
+            },
+            "last_quotes": dict(self._quotes),
+            "positions": {
+                symbol: {
+                    "quantity": position.quantity,
+                    "average_price": position.average_price,
+                    "last_price": position.last_price,
+                    "unrealized_pnl": position.unrealized_pnl,
+                }
+                for symbol, position in self.engine.snapshot_positions().items()
+            },
+            "portfolio": {
+                "gross_exposure": totals.gross_exposure,
+                "net_exposure": totals.net_exposure,
+                "realized_pnl": totals.realized_pnl,
+                "unrealized_pnl": totals.unrealized_pnl,
+                "fees": totals.fees,
+            },
+            "staking": {
+                asset: self.staking.book.position(asset) for asset in self.staking.book.assets
+            },
+        }
+
+    async def _pump_quotes(self, symbol: str) -> None:
+        """Forward the provider's quotes onto the bus, where the UI would otherwise render
+        them."""
+
+        async for quote in self.data_provider.stream_quotes(symbol):
+            self._quote_count += 1
+            self._quotes[symbol] = quote
+            await self.event_bus.publish("market.quote", quote)
+
+    async def _on_signal(self, payload: Dict[str, object]) -> None:
+        self._signal_count += 1
+
+    async def _on_order(self, payload: Dict[str, object]) -> None:
+        self._order_count += 1
+
+
+def _runner(use_uvloop: bool) -> asyncio.Runner:
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            logger.info("[daemon] uvloop is not installed; using the default event loop")
+        else:
+            return asyncio.Runner(loop_factory=uvloop.new_event_loop)
+    return asyncio.Runner()
+
+
+def main() -> None:
+    """Launch the headless daemon."""
+
+    configure_logging()
+    settings = get_settings()
+    with _runner(settings.daemon.use_uvloop) as runner:
+        try:
+            runner.run(HeadlessRuntime(settings).run())
+        except KeyboardInterrupt:
+            pass
@@ -32,7 +32,6 @@ class LiveDataProvider:
         self._running = True
         price = 100.0
         while self._running:
-            await asyncio.sleep(1)
             price += 0.5
             yield {
                 "symbol": symbol,
@@ -41,6 +40,8 @@ class LiveDataProvider:
                 "ask": price + 0.1,
                 "timestamp": datetime.utcnow().isoformat(),
             }
+            # Pace after yielding so the first quote is available as soon as the stream opens.
+            await asyncio.sleep(1)
 
     def stop(self) -> None:
         """Stop streaming."""
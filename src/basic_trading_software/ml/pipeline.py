@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, Sequence, Tuple
 
+import numpy as np
 import torch
 from torch import nn
 
@@ -93,3 +94,28 @@ def create_default_model(input_size: int) -> nn.Module:
 
     settings = get_settings().model
     return create_model(settings.default_model_name, input_size=input_size)
+
+
+def predict_probability_series(
+    model: nn.Module,
+    bars: Sequence[Dict[str, float]],
+    window: int,
+    batch_size: int = 4096,
+    feature_keys: Sequence[str] | None = None,
+) -> np.ndarray:
+    """Run ``predict_direction`` over every sliding window and align results to bar indices.
+
+    The first ``window - 1`` bars have no prediction and are returned as NaN so the series can
+    be fed straight into the vectorized backtester.
+    """
+
+    series = np.full(len(bars), np.nan, dtype=np.float64)
+    sequences = build_sequence_dataset(bars, window=window, feature_keys=feature_keys)
+    if sequences.nelement() == 0:
+        return series
+    outputs = []
+    for start in range(0, sequences.shape[0], batch_size):
+        probs, _preds = predict_direction(model, sequences[start : start + batch_size])
+        outputs.append(probs.reshape(-1).cpu().numpy())
+    series[window - 1 :] = np.concatenate(outputs)
+    return series
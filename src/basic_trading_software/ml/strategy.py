@@ -3,47 +3,154 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict
+import time
+from collections import deque
+from typing import Any, Deque, Dict
 
-import torch
 from loguru import logger
 
-from basic_trading_software.common.events import EventBus
 from basic_trading_software.common.config import get_settings
-from basic_trading_software.ml.pipeline import build_sequence_dataset, create_default_model, predict_direction
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.tracing import (
+    BAR_CLOSE,
+    FEATURES_READY,
+    INFERENCE_DONE,
+    SIGNAL_PUBLISHED,
+    get_tracer,
+)
 
 
 class MLStrategy:
-    """Continuously produces trade signals from streaming features."""
+    """Continuously produces trade signals from streaming features.
+
+    torch and the model are loaded on a worker thread once ``start`` is called, so
+    constructing the strategy is cheap and the UI (or first quote) is not held up by them.
+    Bars arriving before the model is ready are buffered without inference.
+    """
 
-    def __init__(self, event_bus: EventBus) -> None:
+    def __init__(self, event_bus: EventBus, demo_mode: bool = True) -> None:
         self._event_bus = event_bus
         settings = get_settings().model
-        self._model = create_default_model(input_size=5)
-        self._model.eval()
+        self._model: Any = None
+        self._pipeline: Any = None
+        self._loader: asyncio.Task[None] | None = None
         self._sequence_window = 32
         self._model_name = settings.default_model_name
+        self._demo_mode = demo_mode
+        self._bars: Dict[str, Deque[Dict[str, float]]] = {}
         self._task: asyncio.Task[None] | None = None
+        self._started = False
+        self._tracer = get_tracer()
 
     async def start(self) -> None:
         """Spin up processing loop."""
 
-        if self._task is not None:
+        if self._started:
+            return
+        self._started = True
+        if self._loader is None:
+            self._loader = asyncio.create_task(self._load_model(), name="ml-model-load")
+        await self._event_bus.subscribe("market.bar", self._on_bar)
+        if self._demo_mode:
+            self._task = asyncio.create_task(self._run(), name="ml-strategy")
+
+    async def stop(self) -> None:
+        """Stop the demo loop, abandon an unfinished model load and detach from the bar feed.
+
+        A load still running on its worker thread cannot be interrupted, but its result is
+        discarded, so it can never overwrite the model loaded by a later ``start``.
+        """
+
+        await self._event_bus.unsubscribe("market.bar", self._on_bar)
+        tasks = [task for task in (self._task, self._loader) if task is not None]
+        if self._loader is not None and not self._loader.done():
+            self._loader = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._started = False
+
+    async def ready(self) -> None:
+        """Wait until the model has been loaded."""
+
+        if self._loader is not None:
+            await asyncio.shield(self._loader)
+
+    async def _load_model(self) -> None:
+        started = time.perf_counter()
+        try:
+            self._pipeline, self._model = await asyncio.to_thread(self._build_model)
+        except Exception as exc:  # noqa: BLE001 - run without a model
+            logger.error(f"[strategy] Could not load model {self._model_name}: {exc}")
             return
-        self._task = asyncio.create_task(self._run(), name="ml-strategy")
+        elapsed = time.perf_counter() - started
+        logger.info(f"[strategy] Model {self._model_name} ready in {elapsed:.2f}s")
+
+    def _build_model(self) -> tuple[Any, Any]:
+        """Import torch and build (or restore) the model; runs on a worker thread."""
+
+        import torch
+
+        from basic_trading_software.ml import pipeline
+
+        model = pipeline.create_default_model(input_size=5)
+        artifact = pipeline.ModelRegistry().latest(self._model_name)
+        if artifact is not None:
+            try:
+                model.load_state_dict(torch.load(artifact.path, map_location="cpu"))
+            except Exception as exc:  # noqa: BLE001 - fall back to fresh weights
+                logger.warning(f"[strategy] Ignoring artifact {artifact.path}: {exc}")
+        model.eval()
+        return pipeline, model
+
+    async def _on_bar(self, payload: Dict[str, Any]) -> None:
+        """Run inference on the rolling window of closed bars for the payload's symbol."""
+
+        tracer = self._tracer
+        trace_id = tracer.begin(BAR_CLOSE)
+        symbol = str(payload.get("symbol"))
+        window = self._bars.get(symbol)
+        if window is None:
+            window = deque(maxlen=self._sequence_window)
+            self._bars[symbol] = window
+        window.append({key: float(payload[key]) for key in ("open", "high", "low", "close", "volume")})
+        pipeline = self._pipeline
+        if len(window) < self._sequence_window or pipeline is None:
+            tracer.discard(trace_id)
+            return
+
+        sequences = pipeline.build_sequence_dataset(list(window), window=self._sequence_window)
+        tracer.mark(trace_id, FEATURES_READY)
+        probs, _preds = pipeline.predict_direction(self._model, sequences)
+        confidence = float(probs[-1].item())
+        tracer.mark(trace_id, INFERENCE_DONE)
+        signal: Dict[str, object] = {
+            "symbol": symbol,
+            "side": "BUY" if confidence > 0.5 else "SELL",
+            "confidence": confidence,
+            "model": self._model_name,
+            "trace_id": trace_id,
+        }
+        tracer.mark(trace_id, SIGNAL_PUBLISHED)
+        await self._event_bus.publish("signal.generated", signal)
 
     async def _run(self) -> None:
         """Mock inference loop emitting demo signals."""
 
+        await self.ready()
+        pipeline = self._pipeline
+        if pipeline is None:
+            return
         logger.info("[strategy] Starting ML strategy loop")
         while True:
             await asyncio.sleep(5)
             mock_bars = [{"open": 100, "high": 101, "low": 99, "close": 100.5, "volume": 1_000_000}]
-            sequences = build_sequence_dataset(mock_bars, window=min(self._sequence_window, len(mock_bars)))
+            sequences = pipeline.build_sequence_dataset(mock_bars, window=min(self._sequence_window, len(mock_bars)))
             if sequences.nelement() == 0:
                 continue
-            probs, _preds = predict_direction(self._model, sequences)
-            confidence = float(torch.mean(probs).item())
+            probs, _preds = pipeline.predict_direction(self._model, sequences)
+            confidence = float(probs.mean().item())
             signal: Dict[str, object] = {
                 "symbol": "DEMO",
                 "side": "BUY" if confidence > 0.5 else "SELL",
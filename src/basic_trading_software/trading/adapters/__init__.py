@@ -3,3 +3,4 @@
 from .base import BrokerAdapter, OrderRequest, OrderResponse, PositionSnapshot  # noqa: F401
 from .crypto import BinanceAdapter  # noqa: F401
 from .equity import AlpacaAdapter  # noqa: F401
+from .simulated import MatchingEngine, SimulatedExchangeAdapter  # noqa: F401
@@ -0,0 +1,291 @@
+"""Alpaca market-data WebSocket: many symbols over one connection, decoded into typed records."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Set, Tuple, Union
+
+import aiohttp
+from loguru import logger
+
+from basic_trading_software.common.events import EventBus
+
+try:  # Optional: Alpaca's msgpack frames are smaller and cheaper to decode than JSON.
+    import msgpack
+except ImportError:
+    msgpack = None
+
+QUOTES = "quotes"
+TRADES = "trades"
+BARS = "bars"
+CHANNELS = (QUOTES, TRADES, BARS)
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteRecord:
+    symbol: str
+    bid: float
+    ask: float
+    bid_size: float
+    ask_size: float
+    timestamp: float
+
+    def to_payload(self, venue: str) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "venue": venue,
+            "bid": self.bid,
+            "ask": self.ask,
+            "bid_size": self.bid_size,
+            "ask_size": self.ask_size,
+            "timestamp": self.timestamp,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TradeRecord:
+    symbol: str
+    price: float
+    size: float
+    timestamp: float
+
+    def to_payload(self, venue: str) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "venue": venue,
+            "last": self.price,
+            "size": self.size,
+            "timestamp": self.timestamp,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class BarRecord:
+    symbol: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    timestamp: float
+
+    def to_payload(self, venue: str) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "venue": venue,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "timestamp": self.timestamp,
+        }
+
+
+MarketRecord = Union[QuoteRecord, TradeRecord, BarRecord]
+
+_EVENTS = {QuoteRecord: "market.quote", TradeRecord: "market.trade", BarRecord: "market.bar"}
+
+
+def _epoch(value: Any) -> float:
+    """RFC 3339 strings (JSON frames) or already-decoded epoch seconds (msgpack frames)."""
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    # fromisoformat accepts the trailing "Z" and truncates nanosecond fractions.
+    return datetime.fromisoformat(value).timestamp()
+
+
+def decode_messages(
+    messages: Iterable[Dict[str, Any]],
+) -> Tuple[List[MarketRecord], List[Dict[str, Any]]]:
+    """Split one frame's message array into market records and control messages."""
+
+    records: List[MarketRecord] = []
+    control: List[Dict[str, Any]] = []
+    append = records.append
+    for msg in messages:
+        kind = msg.get("T")
+        if kind == "q":
+            append(
+                QuoteRecord(
+                    msg["S"], float(msg["bp"]), float(msg["ap"]),
+                    float(msg["bs"]), float(msg["as"]), _epoch(msg["t"]),
+                )
+            )
+        elif kind == "t":
+            append(TradeRecord(msg["S"], float(msg["p"]), float(msg["s"]), _epoch(msg["t"])))
+        elif kind in ("b", "u", "d"):  # minute, updated and daily bars share a layout
+            append(
+                BarRecord(
+                    msg["S"], float(msg["o"]), float(msg["h"]), float(msg["l"]),
+                    float(msg["c"]), float(msg["v"]), _epoch(msg["t"]),
+                )
+            )
+        else:
+            control.append(msg)
+    return records, control
+
+
+class AlpacaMarketDataStream:
+    """One Alpaca data-API connection carrying quotes, trades and bars for many symbols.
+
+    Subscriptions are tracked as the desired state: ``subscribe``/``unsubscribe`` may be
+    called at any time, are sent at once while connected (in chunks of ``chunk_size``
+    symbols per message) and are replayed after every reconnect. Each frame's message array
+    is decoded in one pass and yielded as a list of records, so consumers handle thousands of
+    symbols a batch at a time instead of one awaited message each.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        credentials: Callable[[], Tuple[str, str]],
+        session: Callable[[], aiohttp.ClientSession],
+        use_msgpack: bool = False,
+        chunk_size: int = 500,
+        venue: str = "alpaca",
+    ) -> None:
+        if use_msgpack and msgpack is None:
+            logger.warning("[alpaca-data] msgpack is not installed; using JSON frames")
+            use_msgpack = False
+        self.venue = venue
+        self._url = url
+        self._credentials = credentials
+        self._session = session
+        self._msgpack = use_msgpack
+        self._chunk_size = max(1, chunk_size)
+        self._wanted: Dict[str, Set[str]] = {channel: set() for channel in CHANNELS}
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+
+    @property
+    def subscriptions(self) -> Dict[str, Set[str]]:
+        return {channel: set(symbols) for channel, symbols in self._wanted.items()}
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def subscribe(
+        self, quotes: Iterable[str] = (), trades: Iterable[str] = (), bars: Iterable[str] = ()
+    ) -> None:
+        added = self._update({QUOTES: quotes, TRADES: trades, BARS: bars}, add=True)
+        await self._send_subscription("subscribe", added)
+
+    async def unsubscribe(
+        self, quotes: Iterable[str] = (), trades: Iterable[str] = (), bars: Iterable[str] = ()
+    ) -> None:
+        removed = self._update({QUOTES: quotes, TRADES: trades, BARS: bars}, add=False)
+        await self._send_subscription("unsubscribe", removed)
+
+    async def stream(self) -> AsyncIterator[List[MarketRecord]]:
+        """Connect, authenticate, (re)subscribe and yield decoded batches until the socket
+        closes. Raises ``PermissionError`` on rejected credentials."""
+
+        headers = {"Content-Type": "application/msgpack"} if self._msgpack else None
+        async with self._session().ws_connect(self._url, heartbeat=30, headers=headers) as ws:
+            await self._handshake(ws)
+            self._ws = ws
+            try:
+                await self._send_subscription("subscribe", self.subscriptions)
+                async for msg in ws:
+                    if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                        records, control = decode_messages(self._decode(msg.data))
+                        for entry in control:
+                            self._on_control(entry)
+                        if records:
+                            yield records
+                    elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                        break
+            finally:
+                self._ws = None
+
+    async def run(
+        self,
+        event_bus: EventBus,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        """Publish records as ``market.quote`` / ``market.trade`` / ``market.bar`` events,
+        reconnecting with backoff until cancelled."""
+
+        delay = reconnect_delay
+        while True:
+            try:
+                async for records in self.stream():
+                    delay = reconnect_delay
+                    for record in records:
+                        payload = record.to_payload(self.venue)
+                        await event_bus.publish(_EVENTS[type(record)], payload)
+                logger.warning("[alpaca-data] Stream closed")
+            except (asyncio.CancelledError, PermissionError):
+                raise
+            except Exception as exc:  # noqa: BLE001 - reconnect on any failure
+                logger.error(f"[alpaca-data] Stream failed: {exc}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_reconnect_delay)
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def _handshake(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        key, secret = self._credentials()
+        await self._send(ws, {"action": "auth", "key": key, "secret": secret})
+        while True:
+            msg = await ws.receive()
+            if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                raise ConnectionError(f"Alpaca data stream closed during auth ({msg.type})")
+            for entry in self._decode(msg.data):
+                if entry.get("T") == "error":
+                    raise PermissionError(f"Alpaca data stream auth failed: {entry.get('msg')}")
+                if entry.get("T") == "success" and entry.get("msg") == "authenticated":
+                    logger.info(f"[alpaca-data] Connected to {self._url}")
+                    return
+
+    def _update(self, changes: Dict[str, Iterable[str]], add: bool) -> Dict[str, Set[str]]:
+        delta: Dict[str, Set[str]] = {}
+        for channel, symbols in changes.items():
+            wanted = self._wanted[channel]
+            requested = {symbol.upper() for symbol in symbols}
+            delta[channel] = requested - wanted if add else requested & wanted
+            if add:
+                wanted |= delta[channel]
+            else:
+                wanted -= delta[channel]
+        return delta
+
+    async def _send_subscription(self, action: str, symbols: Dict[str, Set[str]]) -> None:
+        ws = self._ws
+        if ws is None or ws.closed:
+            return  # Sent with the rest of the desired state on the next connect.
+        for channel, names in symbols.items():
+            ordered = sorted(names)
+            for start in range(0, len(ordered), self._chunk_size):
+                await self._send(
+                    ws, {"action": action, channel: ordered[start : start + self._chunk_size]}
+                )
+
+    async def _send(self, ws: aiohttp.ClientWebSocketResponse, message: Dict[str, Any]) -> None:
+        if self._msgpack:
+            await ws.send_bytes(msgpack.packb(message))
+        else:
+            await ws.send_str(json.dumps(message))
+
+    def _decode(self, data: Any) -> List[Dict[str, Any]]:
+        if isinstance(data, bytes) and self._msgpack:
+            # timestamp=1 decodes msgpack Timestamp extensions straight to epoch seconds.
+            return msgpack.unpackb(data, timestamp=1)
+        return json.loads(data)
+
+    def _on_control(self, entry: Dict[str, Any]) -> None:
+        kind = entry.get("T")
+        if kind == "error":
+            logger.error(f"[alpaca-data] {entry.get('code')}: {entry.get('msg')}")
+        elif kind == "subscription":
+            counts = ", ".join(f"{channel}={len(entry.get(channel) or [])}" for channel in CHANNELS)
+            logger.debug(f"[alpaca-data] Subscribed {counts}")
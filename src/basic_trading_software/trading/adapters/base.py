@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import abc
+import asyncio
+import math
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 
 @dataclass
@@ -12,9 +14,11 @@ class OrderRequest:
     symbol: str
     side: str  # BUY / SELL
     quantity: float
-    order_type: str = "MARKET"
+    order_type: str = "MARKET"  # MARKET / LIMIT / STOP / STOP_LIMIT
     time_in_force: str = "GTC"
     client_order_id: Optional[str] = None
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
     extra: Dict[str, Any] | None = None
 
 
@@ -35,10 +39,61 @@ class PositionSnapshot:
     venue: str
 
 
+@dataclass(frozen=True, slots=True)
+class Instrument:
+    """Venue trading rules for one symbol; zero means the venue sets no such limit."""
+
+    symbol: str
+    venue: str
+    tradable: bool = True
+    lot_size: float = 0.0
+    min_qty: float = 0.0
+    max_qty: float = 0.0
+    tick_size: float = 0.0
+    min_notional: float = 0.0
+
+    def round_quantity(self, quantity: float) -> float:
+        """Round down to the lot size (never trade more than asked)."""
+
+        if self.lot_size <= 0:
+            return quantity
+        # The epsilon keeps 0.3 / 0.1 from flooring to 2 lots.
+        return round(math.floor(quantity / self.lot_size + 1e-9) * self.lot_size, 12)
+
+    def round_price(self, price: float, side: str) -> float:
+        """Round to the tick, towards the passive side (buys down, sells up)."""
+
+        if self.tick_size <= 0:
+            return price
+        ticks = price / self.tick_size
+        ticks = math.floor(ticks + 1e-9) if side.upper() == "BUY" else math.ceil(ticks - 1e-9)
+        return round(ticks * self.tick_size, 12)
+
+    def validate(self, quantity: float, price: float | None = None) -> str | None:
+        """Reason the venue would reject the order, or ``None``."""
+
+        if not self.tradable:
+            return f"{self.symbol} is not tradable on {self.venue}"
+        if quantity <= 0 or quantity < self.min_qty:
+            return f"quantity {quantity} below minimum {self.min_qty or self.lot_size}"
+        if self.max_qty and quantity > self.max_qty:
+            return f"quantity {quantity} above maximum {self.max_qty}"
+        if price is not None and self.min_notional and quantity * price < self.min_notional:
+            return f"notional {quantity * price:.2f} below minimum {self.min_notional}"
+        return None
+
+
 class BrokerAdapter(abc.ABC):
     """Abstract interface for all trading adapters."""
 
     venue: str
+    # True when the adapter publishes its own ``order.filled`` events (simulated venue,
+    # streaming user-data feeds); otherwise the engine derives fills from order responses.
+    publishes_fills: bool = False
+    # True when ``stream_user_data`` is implemented (account/fill push feed).
+    supports_user_data: bool = False
+    # Cap on concurrent requests issued by the default batch implementations.
+    max_concurrent_requests: int = 8
 
     @abc.abstractmethod
     async def authenticate(self) -> None:
@@ -59,3 +114,89 @@ class BrokerAdapter(abc.ABC):
     @abc.abstractmethod
     async def stream_market_data(self, symbol: str) -> Any:
         """Return async iterator for real-time data (implementation-specific)."""
+
+    async def warm(self) -> None:
+        """Open pooled connections ahead of the first order (no-op by default)."""
+
+        return None
+
+    async def close(self) -> None:
+        """Release per-adapter connection state on shutdown (no-op by default)."""
+
+        return None
+
+    def stream_user_data(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Push feed of ``(event_name, payload)`` account events (fills, balances).
+
+        Implementations yield ``("user_data.connected", ...)`` once subscribed, then
+        normalized ``order.filled`` / ``account.balance`` events.
+        """
+
+        raise NotImplementedError(f"{self.venue} has no user-data stream")
+
+    async def find_order(
+        self, client_order_id: str, symbol: str | None = None
+    ) -> OrderResponse | None:
+        """Look an order up by its client id; ``None`` when the venue has no such order.
+
+        Used to settle the outcome of a placement that timed out before resending it.
+        Venues that cannot look orders up raise ``NotImplementedError``.
+        """
+
+        raise NotImplementedError(f"{self.venue} does not support order lookup")
+
+    async def fetch_symbols(self) -> List[str]:
+        """Tradable instruments listed by the venue; empty when the venue cannot say."""
+
+        return []
+
+    async def fetch_instruments(self) -> List[Instrument]:
+        """Trading rules per listed symbol; by default ``fetch_symbols`` without constraints."""
+
+        return [Instrument(symbol.upper(), self.venue) for symbol in await self.fetch_symbols()]
+
+    async def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResponse]:
+        """Submit several orders; results line up with ``orders``.
+
+        The default issues ``place_order`` calls concurrently (at most
+        ``max_concurrent_requests`` in flight). A failed order comes back as a ``rejected``
+        response carrying the error instead of aborting the batch.
+        """
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_requests))
+
+        async def place(order: OrderRequest) -> OrderResponse:
+            async with semaphore:
+                try:
+                    return await self.place_order(order)
+                except Exception as exc:  # noqa: BLE001 - one failure must not sink the batch
+                    return OrderResponse(
+                        order_id="", status="rejected", filled_qty=0.0, raw={"error": str(exc)}
+                    )
+
+        return list(await asyncio.gather(*(place(order) for order in orders)))
+
+    async def cancel_orders(self, order_ids: Sequence[str]) -> Dict[str, Exception | None]:
+        """Cancel several orders concurrently; maps each id to its error (``None`` on success)."""
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_requests))
+
+        async def cancel(order_id: str) -> Exception | None:
+            async with semaphore:
+                try:
+                    await self.cancel_order(order_id)
+                except Exception as exc:  # noqa: BLE001 - returned per order to the caller
+                    return exc
+                return None
+
+        results = await asyncio.gather(*(cancel(order_id) for order_id in order_ids))
+        return dict(zip(order_ids, results))
+
+    async def cancel_all_orders(self, symbol: str | None = None) -> List[str]:
+        """Cancel every open order (optionally for one symbol) in a single venue request.
+
+        Returns the cancelled order ids. Venues without a bulk endpoint raise
+        ``NotImplementedError``.
+        """
+
+        raise NotImplementedError(f"{self.venue} does not support bulk cancel")
@@ -5,23 +5,37 @@ from __future__ import annotations
 import asyncio
 import hmac
 import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from functools import partial
 from hashlib import sha256
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 import aiohttp
-from aiohttp import ClientSession, ClientWebSocketResponse
+from aiohttp import ClientSession
 from loguru import logger
 
 from basic_trading_software.common.config import get_settings
 from basic_trading_software.common.credentials import CredentialStore
+from basic_trading_software.common.http import HttpTransport, get_transport
 
-from .base import BrokerAdapter, OrderRequest, OrderResponse, PositionSnapshot
+from .base import BrokerAdapter, Instrument, OrderRequest, OrderResponse, PositionSnapshot
+from .ratelimit import BACKFILL, CANCEL, ORDER, QUERY, RateLimitExceeded, binance_rate_limiter
+from .resilience import RequestGuard, VenueRejected, raise_for_venue_status
+
+_BINANCE_ORDER_TYPES = {"STOP": "STOP_LOSS", "STOP_LIMIT": "STOP_LOSS_LIMIT"}
+_BINANCE_ORDER_STATUS = {"PARTIALLY_FILLED": "partially_filled", "FILLED": "filled"}
+_BINANCE_UNKNOWN_ORDER = -2013
 
 
 class BinanceAdapter(BrokerAdapter):
     """Partial Binance Spot API integration."""
 
-    def __init__(self, credentials: CredentialStore) -> None:
+    supports_user_data = True
+
+    def __init__(
+        self, credentials: CredentialStore, transport: HttpTransport | None = None
+    ) -> None:
         settings = get_settings().broker_crypto
         self.venue = settings.name
         self._rest_url = settings.rest_base_url.rstrip("/")
@@ -29,58 +43,182 @@ class BinanceAdapter(BrokerAdapter):
         self._credentials = credentials
         self._api_key = settings.api_key or ""
         self._api_secret = settings.api_secret or ""
-        self._session: Optional[ClientSession] = None
+        self._transport = transport or get_transport()
+        self._headers: Dict[str, str] = {}
+        self._authenticated = False
+        self._limiter = binance_rate_limiter(
+            settings.request_weight_per_minute, settings.orders_per_10_seconds
+        )
+        self._guard = RequestGuard.from_settings(self.venue, get_settings().venue_requests)
+        # Trading rules from the last exchangeInfo fetch; they set the decimals orders carry.
+        self._instruments: Dict[str, Instrument] = {}
 
     async def authenticate(self) -> None:
         stored_key, stored_secret = self._credentials.get(self.venue)
         self._api_key = stored_key or self._api_key
         self._api_secret = stored_secret or self._api_secret
-        if not self._session:
-            headers = {"X-MBX-APIKEY": self._api_key}
-            self._session = aiohttp.ClientSession(headers=headers)
-        logger.info("[binance] Session initialised")
+        self._headers = {"X-MBX-APIKEY": self._api_key}
+        self._authenticated = True
+        logger.debug("[binance] Session initialised")
+
+    async def _ready(self) -> ClientSession:
+        """Pooled session; credentials are loaded once and reused until they change."""
+
+        if not self._authenticated:
+            await self.authenticate()
+        return self._transport.session
+
+    @asynccontextmanager
+    async def _call(
+        self,
+        method: str,
+        path: str,
+        priority: int,
+        weight: float = 1,
+        orders: float = 0,
+        params: Dict[str, Any] | None = None,
+        signed: bool = False,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """One REST request, admitted by the rate limiter and signed once admitted.
+
+        Signing after the wait keeps ``timestamp`` inside Binance's ``recvWindow`` even when
+        the request had to queue. Error statuses raise before the body is handed out (see
+        ``raise_for_venue_status``).
+        """
+
+        session = await self._ready()
+        await self._limiter.acquire(priority, weight=weight, orders=orders)
+        if signed:
+            params = dict(params or {})
+            params["timestamp"] = int(time.time() * 1000)
+            params["signature"] = self._sign(params)
+        async with session.request(
+            method, f"{self._rest_url}{path}", params=params, headers=self._headers
+        ) as resp:
+            self._limiter.observe(resp.status, resp.headers)
+            await raise_for_venue_status(self.venue, resp)
+            yield resp
+
+    async def warm(self) -> None:
+        await self._transport.warm([f"{self._rest_url}/api/v3/ping"])
 
     async def place_order(self, order: OrderRequest) -> OrderResponse:
-        await self.authenticate()
-        assert self._session is not None
+        symbol = order.symbol.upper()
+        instrument = self._instruments.get(symbol) or Instrument(symbol, self.venue)
         params: Dict[str, Any] = {
-            "symbol": order.symbol.upper(),
+            "symbol": symbol,
             "side": order.side.upper(),
-            "type": order.order_type.upper(),
-            "quantity": order.quantity,
-            "timestamp": int(time.time() * 1000),
+            "type": _BINANCE_ORDER_TYPES.get(order.order_type.upper(), order.order_type.upper()),
+            "quantity": _decimal(order.quantity, instrument.lot_size),
         }
+        if order.limit_price is not None:
+            params["price"] = _decimal(order.limit_price, instrument.tick_size)
+            params["timeInForce"] = order.time_in_force.upper()
+        if order.stop_price is not None:
+            params["stopPrice"] = _decimal(order.stop_price, instrument.tick_size)
+        if order.client_order_id:
+            params["newClientOrderId"] = order.client_order_id
         if order.extra:
             params.update(order.extra)
 
-        params["signature"] = self._sign(params)
-        async with self._session.post(f"{self._rest_url}/api/v3/order", params=params) as resp:
-            data = await resp.json()
-            return OrderResponse(
-                order_id=str(data.get("orderId", "")),
-                status=str(data.get("status", "")),
-                filled_qty=float(data.get("executedQty", 0)),
-                avg_price=float(data.get("price", 0)),
-                raw=data,
-            )
+        # A timed-out attempt is looked up by client id before anything is resent.
+        recover = None
+        if order.client_order_id:
+            recover = partial(self.find_order, order.client_order_id, order.symbol)
+        return await self._guard.call(
+            "place_order", partial(self._send_order, params), recover=recover
+        )
+
+    async def _send_order(self, params: Dict[str, Any]) -> OrderResponse:
+        async with self._call(
+            "POST", "/api/v3/order", ORDER, weight=1, orders=1, params=params, signed=True
+        ) as resp:
+            return self._order_response(await resp.json())
+
+    async def find_order(
+        self, client_order_id: str, symbol: str | None = None
+    ) -> OrderResponse | None:
+        if symbol is None:
+            raise ValueError("Binance order lookup requires the symbol")
+        return await self._guard.call(
+            "find_order", partial(self._query_order, client_order_id, symbol.upper())
+        )
+
+    async def _query_order(self, client_order_id: str, symbol: str) -> OrderResponse | None:
+        params = {"symbol": symbol, "origClientOrderId": client_order_id}
+        try:
+            async with self._call(
+                "GET", "/api/v3/order", ORDER, weight=4, params=params, signed=True
+            ) as resp:
+                data = await resp.json()
+        except VenueRejected as exc:
+            if exc.error_code == _BINANCE_UNKNOWN_ORDER:
+                return None
+            raise
+        return self._order_response(data)
+
+    @staticmethod
+    def _order_response(data: Dict[str, Any]) -> OrderResponse:
+        filled_qty = float(data.get("executedQty", 0))
+        quote_qty = float(data.get("cummulativeQuoteQty", 0))
+        return OrderResponse(
+            order_id=str(data.get("orderId", "")),
+            status=str(data.get("status", "")),
+            filled_qty=filled_qty,
+            # ``price`` is 0 for market orders; derive the average from the quote amount.
+            avg_price=(
+                quote_qty / filled_qty if filled_qty and quote_qty else float(data.get("price", 0))
+            ),
+            raw=data,
+        )
 
     async def cancel_order(self, order_id: str) -> None:
-        await self.authenticate()
-        assert self._session is not None
-        params = {
-            "orderId": order_id,
-            "timestamp": int(time.time() * 1000),
-        }
-        params["signature"] = self._sign(params)
-        async with self._session.delete(f"{self._rest_url}/api/v3/order", params=params):
-            logger.info(f"[binance] Cancelled order {order_id}")
+        await self._guard.call("cancel_order", partial(self._cancel_order, order_id))
+
+    async def _cancel_order(self, order_id: str) -> None:
+        params = {"orderId": order_id}
+        async with self._call("DELETE", "/api/v3/order", CANCEL, params=params, signed=True):
+            logger.info("[binance] Cancelled order {}", order_id)
+
+    async def cancel_all_orders(self, symbol: str | None = None) -> List[str]:
+        """``DELETE /api/v3/openOrders`` cancels a symbol's open orders in one request.
+
+        Spot has no account-wide variant, so without ``symbol`` every symbol with open
+        orders gets one request, issued concurrently.
+        """
+
+        if symbol is None:
+            symbols = await self._guard.call("cancel_all_orders", self._open_order_symbols)
+            batches = await asyncio.gather(*(self.cancel_all_orders(s) for s in symbols))
+            return [order_id for batch in batches for order_id in batch]
+        return await self._guard.call(
+            "cancel_all_orders", partial(self._cancel_symbol_orders, symbol.upper())
+        )
+
+    async def _open_order_symbols(self) -> List[str]:
+        async with self._call(
+            "GET", "/api/v3/openOrders", CANCEL, weight=80, params={}, signed=True
+        ) as resp:
+            data = await resp.json()
+        return sorted({str(entry["symbol"]) for entry in data})
+
+    async def _cancel_symbol_orders(self, symbol: str) -> List[str]:
+        params = {"symbol": symbol}
+        async with self._call(
+            "DELETE", "/api/v3/openOrders", CANCEL, params=params, signed=True
+        ) as resp:
+            data = await resp.json()
+        cancelled = [str(entry["orderId"]) for entry in data if "orderId" in entry]
+        logger.info("[binance] Cancelled {} open orders on {}", len(cancelled), symbol)
+        return cancelled
 
     async def fetch_positions(self) -> List[PositionSnapshot]:
-        await self.authenticate()
-        assert self._session is not None
-        params = {"timestamp": int(time.time() * 1000)}
-        params["signature"] = self._sign(params)
-        async with self._session.get(f"{self._rest_url}/api/v3/account", params=params) as resp:
+        return await self._guard.call("fetch_positions", self._fetch_positions)
+
+    async def _fetch_positions(self) -> List[PositionSnapshot]:
+        async with self._call(
+            "GET", "/api/v3/account", QUERY, weight=20, params={}, signed=True
+        ) as resp:
             data = await resp.json()
             balances = data.get("balances", [])
             positions: List[PositionSnapshot] = []
@@ -101,11 +239,39 @@ class BinanceAdapter(BrokerAdapter):
                 )
             return positions
 
+    async def fetch_symbols(self) -> List[str]:
+        return [item.symbol for item in await self.fetch_instruments() if item.tradable]
+
+    async def fetch_instruments(self) -> List[Instrument]:
+        return await self._guard.call("fetch_instruments", self._fetch_instruments)
+
+    async def _fetch_instruments(self) -> List[Instrument]:
+        async with self._call("GET", "/api/v3/exchangeInfo", BACKFILL, weight=20) as resp:
+            data = await resp.json()
+        instruments = [self._instrument(entry) for entry in data.get("symbols", [])]
+        self._instruments = {item.symbol: item for item in instruments}
+        return instruments
+
+    def _instrument(self, entry: Dict[str, Any]) -> Instrument:
+        filters = {item.get("filterType"): item for item in entry.get("filters", [])}
+        lot = filters.get("LOT_SIZE", {})
+        price = filters.get("PRICE_FILTER", {})
+        notional = filters.get("NOTIONAL") or filters.get("MIN_NOTIONAL") or {}
+        return Instrument(
+            symbol=str(entry["symbol"]).upper(),
+            venue=self.venue,
+            tradable=entry.get("status") == "TRADING",
+            lot_size=float(lot.get("stepSize", 0)),
+            min_qty=float(lot.get("minQty", 0)),
+            max_qty=float(lot.get("maxQty", 0)),
+            tick_size=float(price.get("tickSize", 0)),
+            min_notional=float(notional.get("minNotional", 0)),
+        )
+
     async def stream_market_data(self, symbol: str) -> AsyncIterator[Dict[str, Any]]:
-        await self.authenticate()
-        assert self._session is not None
+        session = await self._ready()
         stream_name = symbol.lower() + "@ticker"
-        async with self._session.ws_connect(f"{self._ws_url}/{stream_name}") as ws:
+        async with session.ws_connect(f"{self._ws_url}/{stream_name}", headers=self._headers) as ws:
             async for msg in ws:
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     yield msg.json()
@@ -113,10 +279,94 @@ class BinanceAdapter(BrokerAdapter):
                     break
                 await asyncio.sleep(0)  # Allow event loop to breathe
 
+    async def stream_user_data(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """User-data stream: ``executionReport`` trades become ``order.filled`` and
+        ``outboundAccountPosition`` balances become ``account.balance``.
+
+        The listen key is created over REST and kept alive on a timer for as long as the
+        socket stays open.
+        """
+
+        session = await self._ready()
+        async with self._call("POST", "/api/v3/userDataStream", QUERY, weight=2) as resp:
+            listen_key = str((await resp.json())["listenKey"])
+        keepalive = asyncio.create_task(self._keep_listen_key_alive(listen_key))
+        try:
+            async with session.ws_connect(f"{self._ws_url}/{listen_key}", heartbeat=30) as ws:
+                yield "user_data.connected", {"venue": self.venue}
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        for event in self._normalize_user_event(msg.json()):
+                            yield event
+                    elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                        break
+        finally:
+            keepalive.cancel()
+
+    async def _keep_listen_key_alive(self, listen_key: str) -> None:
+        interval = get_settings().broker_crypto.listen_key_keepalive_seconds
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                params = {"listenKey": listen_key}
+                async with self._call(
+                    "PUT", "/api/v3/userDataStream", QUERY, weight=2, params=params
+                ):
+                    pass
+            except (aiohttp.ClientError, RateLimitExceeded) as exc:
+                logger.warning(f"[binance] Listen key keepalive failed: {exc}")
+
+    def _normalize_user_event(self, data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        kind = data.get("e")
+        if kind == "executionReport" and data.get("x") == "TRADE":
+            quantity = float(data.get("l", 0))
+            status = _BINANCE_ORDER_STATUS.get(str(data.get("X")), str(data.get("X", "")).lower())
+            symbol = str(data.get("s", "")).upper()
+            commission = float(data.get("n", 0) or 0)
+            # The ledger books fees in quote currency; BNB/base-asset commissions are only
+            # reported, not deducted.
+            quote_fee = str(data.get("N") or "").upper()
+            fee = commission if quote_fee and symbol.endswith(quote_fee) else 0.0
+            return [
+                (
+                    "order.filled",
+                    {
+                        "order_id": str(data.get("i", "")),
+                        "client_order_id": data.get("c"),
+                        "symbol": symbol,
+                        "side": str(data.get("S", "")).upper(),
+                        "quantity": quantity,
+                        "price": float(data.get("L", 0)),
+                        "fee": fee,
+                        "commission": commission,
+                        "commission_asset": data.get("N"),
+                        "remaining": float(data.get("q", 0)) - float(data.get("z", 0)),
+                        "status": status,
+                        "venue": self.venue,
+                        "timestamp": float(data.get("T", 0)) / 1000,
+                    },
+                )
+            ]
+        if kind == "outboundAccountPosition":
+            timestamp = float(data.get("u", data.get("E", 0))) / 1000
+            return [
+                (
+                    "account.balance",
+                    {
+                        "venue": self.venue,
+                        "asset": str(entry["a"]),
+                        "free": float(entry["f"]),
+                        "locked": float(entry["l"]),
+                        "timestamp": timestamp,
+                    },
+                )
+                for entry in data.get("B", [])
+            ]
+        return []
+
     async def close(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
+        # The pooled session belongs to the shared transport; only forget our auth state.
+        self._authenticated = False
 
     def _sign(self, params: Dict[str, Any]) -> str:
         query = "&".join(f"{key}={params[key]}" for key in sorted(params))
@@ -126,6 +376,19 @@ class BinanceAdapter(BrokerAdapter):
     async def update_credentials(self, api_key: str | None, api_secret: str | None) -> None:
         self._api_key = api_key or ""
         self._api_secret = api_secret or ""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        # Re-read on next use; pooled connections stay open since auth travels per request.
+        self._authenticated = False
+
+
+def _decimal(value: float, step: float) -> str:
+    """``value`` as plain decimal text at ``step``'s precision (``0.00005``, never ``5e-05``).
+
+    Binance rejects exponent notation and more decimals than the filter's step allows; the
+    engine has already rounded to the step, so quantizing only trims float noise.
+    """
+
+    number = Decimal(repr(value))
+    if step > 0:
+        exponent = min(int(Decimal(repr(step)).normalize().as_tuple().exponent), 0)
+        number = number.quantize(Decimal(1).scaleb(exponent))
+    return format(number, "f")
@@ -2,46 +2,91 @@
 
 from __future__ import annotations
 
-from typing import Any, AsyncIterator, Dict, List, Optional
+import json
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
 
 import aiohttp
 from loguru import logger
 
 from basic_trading_software.common.config import get_settings
 from basic_trading_software.common.credentials import CredentialStore
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.http import HttpTransport, get_transport
 
-from .base import BrokerAdapter, OrderRequest, OrderResponse, PositionSnapshot
+from .alpaca_data import AlpacaMarketDataStream
+from .base import BrokerAdapter, Instrument, OrderRequest, OrderResponse, PositionSnapshot
+from .ratelimit import BACKFILL, CANCEL, ORDER, QUERY, alpaca_rate_limiter
+from .resilience import RequestGuard, VenueRejected, raise_for_venue_status
+
+_EQUITY_TICK = 0.01
+_FRACTIONAL_LOT = 1e-9
 
 
 class AlpacaAdapter(BrokerAdapter):
     """Minimal Alpaca REST/WebSocket client."""
 
-    def __init__(self, credentials: CredentialStore) -> None:
+    supports_user_data = True
+
+    def __init__(
+        self, credentials: CredentialStore, transport: HttpTransport | None = None
+    ) -> None:
         settings = get_settings().broker_equity
         self.venue = "alpaca"
         self._base_url = settings.base_url.rstrip("/")
+        self._trade_stream_url = settings.trade_stream_url
         self._credentials = credentials
         self._api_key = settings.api_key or ""
         self._api_secret = settings.api_secret or ""
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._transport = transport or get_transport()
+        self._headers: Dict[str, str] = {}
+        self._authenticated = False
+        self._limiter = alpaca_rate_limiter(settings.requests_per_minute)
+        self._guard = RequestGuard.from_settings(self.venue, get_settings().venue_requests)
 
     async def authenticate(self) -> None:
         stored_key, stored_secret = self._credentials.get(self.venue)
         api_key = stored_key or self._api_key
         api_secret = stored_secret or self._api_secret
-        if not self._session:
-            headers = {
-                "APCA-API-KEY-ID": api_key or "",
-                "APCA-API-SECRET-KEY": api_secret or "",
-            }
-            self._session = aiohttp.ClientSession(headers=headers)
-        logger.info("[alpaca] Session initialised")
+        self._headers = {
+            "APCA-API-KEY-ID": api_key or "",
+            "APCA-API-SECRET-KEY": api_secret or "",
+        }
+        self._authenticated = True
+        logger.debug("[alpaca] Session initialised")
         self._api_key = api_key or ""
         self._api_secret = api_secret or ""
 
+    async def _ready(self) -> aiohttp.ClientSession:
+        """Pooled session; credentials are loaded once and reused until they change."""
+
+        if not self._authenticated:
+            await self.authenticate()
+        return self._transport.session
+
+    @asynccontextmanager
+    async def _call(
+        self, method: str, path: str, priority: int, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """One REST request, admitted by the rate limiter; every call costs one request.
+
+        Error statuses raise before the body is handed out (see ``raise_for_venue_status``).
+        """
+
+        session = await self._ready()
+        await self._limiter.acquire(priority, requests=1)
+        async with session.request(
+            method, f"{self._base_url}{path}", headers=self._headers, **kwargs
+        ) as resp:
+            self._limiter.observe(resp.status, resp.headers)
+            await raise_for_venue_status(self.venue, resp)
+            yield resp
+
+    async def warm(self) -> None:
+        await self._transport.warm([f"{self._base_url}/clock"])
+
     async def place_order(self, order: OrderRequest) -> OrderResponse:
-        await self.authenticate()
-        assert self._session is not None
         payload = {
             "symbol": order.symbol,
             "qty": order.quantity,
@@ -51,29 +96,89 @@ class AlpacaAdapter(BrokerAdapter):
         }
         if order.client_order_id:
             payload["client_order_id"] = order.client_order_id
+        if order.limit_price is not None:
+            payload["limit_price"] = order.limit_price
+        if order.stop_price is not None:
+            payload["stop_price"] = order.stop_price
         if order.extra:
             payload.update(order.extra)
 
-        async with self._session.post(f"{self._base_url}/orders", json=payload) as resp:
-            data = await resp.json()
-            return OrderResponse(
-                order_id=str(data.get("id", "")),
-                status=str(data.get("status", "")),
-                filled_qty=float(data.get("filled_qty", 0)),
-                avg_price=float(data["filled_avg_price"]) if data.get("filled_avg_price") else None,
-                raw=data,
-            )
+        # A timed-out attempt is looked up by client id before anything is resent.
+        recover = None
+        if order.client_order_id:
+            recover = partial(self.find_order, order.client_order_id)
+        return await self._guard.call(
+            "place_order", partial(self._send_order, payload), recover=recover
+        )
+
+    async def _send_order(self, payload: Dict[str, Any]) -> OrderResponse:
+        async with self._call("POST", "/orders", ORDER, json=payload) as resp:
+            return self._order_response(await resp.json())
+
+    async def find_order(
+        self, client_order_id: str, symbol: str | None = None
+    ) -> OrderResponse | None:
+        return await self._guard.call("find_order", partial(self._query_order, client_order_id))
+
+    async def _query_order(self, client_order_id: str) -> OrderResponse | None:
+        params = {"client_order_id": client_order_id}
+        try:
+            async with self._call(
+                "GET", "/orders:by_client_order_id", ORDER, params=params
+            ) as resp:
+                return self._order_response(await resp.json())
+        except VenueRejected as exc:
+            if exc.status == 404:
+                return None
+            raise
+
+    @staticmethod
+    def _order_response(data: Dict[str, Any]) -> OrderResponse:
+        return OrderResponse(
+            order_id=str(data.get("id", "")),
+            status=str(data.get("status", "")),
+            filled_qty=float(data.get("filled_qty") or 0),
+            avg_price=float(data["filled_avg_price"]) if data.get("filled_avg_price") else None,
+            raw=data,
+        )
 
     async def cancel_order(self, order_id: str) -> None:
-        await self.authenticate()
-        assert self._session is not None
-        async with self._session.delete(f"{self._base_url}/orders/{order_id}"):
-            logger.info(f"[alpaca] Cancelled order {order_id}")
+        await self._guard.call("cancel_order", partial(self._cancel_order, order_id))
+
+    async def _cancel_order(self, order_id: str) -> None:
+        async with self._call("DELETE", f"/orders/{order_id}", CANCEL):
+            logger.info("[alpaca] Cancelled order {}", order_id)
+
+    async def cancel_all_orders(self, symbol: str | None = None) -> List[str]:
+        """``DELETE /orders`` cancels every open order in one call (207 multi-status body)."""
+
+        if symbol is not None:
+            # Alpaca's bulk cancel is account-wide; per-symbol goes through the batch path.
+            order_ids = await self._guard.call(
+                "cancel_all_orders", partial(self._open_order_ids, symbol.upper())
+            )
+            results = await self.cancel_orders(order_ids)
+            return [order_id for order_id, error in results.items() if error is None]
+        return await self._guard.call("cancel_all_orders", self._cancel_all)
+
+    async def _open_order_ids(self, symbol: str) -> List[str]:
+        params = {"status": "open", "symbols": symbol}
+        async with self._call("GET", "/orders", CANCEL, params=params) as resp:
+            data = await resp.json()
+        return [str(entry["id"]) for entry in data]
+
+    async def _cancel_all(self) -> List[str]:
+        async with self._call("DELETE", "/orders", CANCEL) as resp:
+            data = await resp.json()
+        cancelled = [str(entry["id"]) for entry in data if int(entry.get("status", 0)) < 300]
+        logger.info("[alpaca] Bulk cancelled {} orders", len(cancelled))
+        return cancelled
 
     async def fetch_positions(self) -> List[PositionSnapshot]:
-        await self.authenticate()
-        assert self._session is not None
-        async with self._session.get(f"{self._base_url}/positions") as resp:
+        return await self._guard.call("fetch_positions", self._fetch_positions)
+
+    async def _fetch_positions(self) -> List[PositionSnapshot]:
+        async with self._call("GET", "/positions", QUERY) as resp:
             data = await resp.json()
             positions: List[PositionSnapshot] = []
             for entry in data:
@@ -87,19 +192,132 @@ class AlpacaAdapter(BrokerAdapter):
                 )
             return positions
 
+    async def fetch_symbols(self) -> List[str]:
+        return [item.symbol for item in await self.fetch_instruments() if item.tradable]
+
+    async def fetch_instruments(self) -> List[Instrument]:
+        return await self._guard.call("fetch_instruments", self._fetch_instruments)
+
+    async def _fetch_instruments(self) -> List[Instrument]:
+        params = {"status": "active", "asset_class": "us_equity"}
+        async with self._call("GET", "/assets", BACKFILL, params=params) as resp:
+            data = await resp.json()
+        return [self._instrument(entry) for entry in data]
+
+    def _instrument(self, entry: Dict[str, Any]) -> Instrument:
+        # Equities trade whole shares unless fractionable; crypto assets carry explicit
+        # increments.
+        lot = entry.get("min_trade_increment")
+        if lot is None:
+            lot = _FRACTIONAL_LOT if entry.get("fractionable") else 1.0
+        return Instrument(
+            symbol=str(entry["symbol"]).upper(),
+            venue=self.venue,
+            tradable=bool(entry.get("tradable")),
+            lot_size=float(lot),
+            min_qty=float(entry.get("min_order_size") or 0),
+            tick_size=float(entry.get("price_increment") or _EQUITY_TICK),
+        )
+
+    def market_data_stream(self) -> AlpacaMarketDataStream:
+        """A data-API connection for many symbols; subscribe, then iterate ``stream()`` or
+        hand it to ``run(event_bus)``."""
+
+        settings = get_settings().broker_equity
+        return AlpacaMarketDataStream(
+            settings.data_stream_url,
+            credentials=lambda: (self._api_key, self._api_secret),
+            session=lambda: self._transport.session,
+            use_msgpack=settings.data_stream_msgpack,
+            chunk_size=settings.data_subscribe_chunk,
+            venue=self.venue,
+        )
+
+    async def run_market_data(self, event_bus: EventBus, symbols: Iterable[str]) -> None:
+        """Publish quotes and bars for ``symbols`` on the bus over one data-API connection
+        until cancelled (the runtimes start this for ``broker_equity.data_symbols``)."""
+
+        if not self._authenticated:
+            await self.authenticate()
+        symbols = [symbol.upper() for symbol in symbols]
+        stream = self.market_data_stream()
+        await stream.subscribe(quotes=symbols, bars=symbols)
+        try:
+            await stream.run(event_bus)
+        except PermissionError as exc:
+            logger.error(f"[alpaca] Market data stream disabled: {exc}")
+        finally:
+            await stream.close()
+
     async def stream_market_data(self, symbol: str) -> AsyncIterator[Dict[str, Any]]:
-        """Placeholder generator until full data API is wired."""
+        """Quote, trade and bar payloads for one symbol on a dedicated connection.
+
+        Payloads are the same dicts ``market_data_stream().run`` publishes; many symbols
+        should share one ``market_data_stream()`` instead.
+        """
+
+        if not self._authenticated:
+            await self.authenticate()
+        stream = self.market_data_stream()
+        await stream.subscribe(quotes=[symbol], trades=[symbol], bars=[symbol])
+        async for records in stream.stream():
+            for record in records:
+                yield record.to_payload(self.venue)
+
+    async def stream_user_data(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """``trade_updates`` stream: fill and partial-fill events become ``order.filled``."""
+
+        session = await self._ready()
+        async with session.ws_connect(self._trade_stream_url, heartbeat=30) as ws:
+            await ws.send_json({"action": "auth", "key": self._api_key, "secret": self._api_secret})
+            await ws.send_json({"action": "listen", "data": {"streams": ["trade_updates"]}})
+            async for msg in ws:
+                if msg.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    # Alpaca sends these frames as binary JSON on paper and live endpoints.
+                    message = json.loads(msg.data)
+                    stream = message.get("stream")
+                    data = message.get("data") or {}
+                    if stream == "authorization" and data.get("status") != "authorized":
+                        raise PermissionError(f"Alpaca trade stream auth failed: {data}")
+                    if stream == "listening":
+                        yield "user_data.connected", {"venue": self.venue}
+                    elif stream == "trade_updates":
+                        event = self._normalize_trade_update(data)
+                        if event is not None:
+                            yield event
+                elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                    break
 
-        raise NotImplementedError("Use data providers module for Alpaca market data streaming.")
+    def _normalize_trade_update(self, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]] | None:
+        if data.get("event") not in ("fill", "partial_fill"):
+            return None
+        order = data.get("order") or {}
+        quantity = float(order.get("qty") or 0)
+        filled = float(order.get("filled_qty") or 0)
+        return (
+            "order.filled",
+            {
+                "order_id": str(order.get("id", "")),
+                "client_order_id": order.get("client_order_id"),
+                "symbol": str(order.get("symbol", "")).upper(),
+                "side": str(order.get("side", "")).upper(),
+                "quantity": float(data.get("qty") or 0),
+                "price": float(data.get("price") or 0),
+                "fee": 0.0,
+                "remaining": max(quantity - filled, 0.0),
+                "status": "filled" if data.get("event") == "fill" else "partially_filled",
+                "position_qty": float(data["position_qty"]) if data.get("position_qty") else None,
+                "venue": self.venue,
+                "timestamp": data.get("timestamp"),
+            },
+        )
 
     async def close(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
+        # The pooled session belongs to the shared transport; only forget our auth state.
+        self._authenticated = False
 
     async def update_credentials(self, api_key: str | None, api_secret: str | None) -> None:
         self._api_key = api_key or ""
         self._api_secret = api_secret or ""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        # Re-read on next use; pooled connections stay open since auth travels per request.
+        self._authenticated = False
@@ -0,0 +1,223 @@
+"""Per-venue request scheduling under published rate limits."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+CANCEL = 0
+ORDER = 1
+QUERY = 2
+BACKFILL = 3
+
+
+class RateLimitExceeded(RuntimeError):
+    """The venue answered 429/418; requests are paused until ``retry_after`` elapses."""
+
+    def __init__(self, venue: str, status: int, retry_after: float) -> None:
+        super().__init__(f"{venue} rate limited (HTTP {status}); retry in {retry_after:.1f}s")
+        self.venue = venue
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass
+class LimitWindow:
+    """A venue limit such as "6000 weight per 60s", refilled continuously."""
+
+    capacity: float
+    window_seconds: float
+    tokens: float = -1.0
+    updated: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.tokens < 0:
+            self.tokens = self.capacity
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.window_seconds
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 when they already are)."""
+
+        missing = amount - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+
+# Response header -> (limit name, header reports "used" (True) or "remaining" (False)).
+HeaderMap = Mapping[str, Tuple[str, bool]]
+
+
+class VenueRateLimiter:
+    """Token buckets for one venue's limits with a strict-priority wait queue.
+
+    Each request declares its cost against the named limits (``weight=5, orders=1``). If
+    nothing is queued and every bucket has room the request proceeds at once; otherwise it
+    waits in a heap ordered by (priority, arrival), so a queued cancel is released before
+    queued orders, orders before queries and queries before backfill. Buckets are corrected
+    from the venue's usage headers after every response, and a 429/418 pauses the whole
+    venue for ``Retry-After``.
+
+    ``safety`` keeps a slice of each limit unused to absorb requests the venue counts but
+    we cannot see (other sessions sharing the key, clock skew between windows).
+    """
+
+    def __init__(
+        self,
+        venue: str,
+        limits: Dict[str, LimitWindow],
+        headers: HeaderMap | None = None,
+        safety: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.venue = venue
+        self._clock = clock
+        now = clock()
+        self._limits: Dict[str, LimitWindow] = {}
+        self._margins: Dict[str, float] = {}
+        for name, limit in limits.items():
+            capacity = limit.capacity * safety
+            self._limits[name] = LimitWindow(capacity, limit.window_seconds, capacity, now)
+            self._margins[name] = limit.capacity - capacity
+        self._headers = {key.lower(): value for key, value in (headers or {}).items()}
+        self._waiters: List[Tuple[int, int, Dict[str, float], asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._paused_until = 0.0
+
+    @asynccontextmanager
+    async def slot(self, priority: int = QUERY, **costs: float) -> AsyncIterator[None]:
+        await self.acquire(priority, **costs)
+        yield
+
+    async def acquire(self, priority: int = QUERY, **costs: float) -> None:
+        if not self._waiters and self._try_take(costs):
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), costs, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Dropping out of the queue must not stall whoever is behind us.
+            self._dispatch()
+            raise
+
+    def observe(self, status: int, headers: Mapping[str, str]) -> None:
+        """Fold a response's usage headers into the buckets; raise on 429/418."""
+
+        now = self._clock()
+        for header, value in headers.items():
+            mapping = self._headers.get(header.lower())
+            if mapping is None:
+                continue
+            name, reports_used = mapping
+            limit = self._limits.get(name)
+            if limit is None:
+                continue
+            try:
+                reported = float(value)
+            except ValueError:
+                continue
+            limit.refill(now)
+            if reports_used:
+                remaining = limit.capacity - reported
+            else:
+                remaining = reported - self._margins[name]
+            # Only ever tighten: in-flight requests are not in the venue's count yet.
+            limit.tokens = min(limit.tokens, remaining)
+
+        if status in (418, 429):
+            retry_after = _retry_after(headers)
+            self._paused_until = max(self._paused_until, now + retry_after)
+            logger.error(f"[ratelimit] {self.venue} returned {status}; pausing {retry_after:.1f}s")
+            raise RateLimitExceeded(self.venue, status, retry_after)
+
+    def backlog(self) -> int:
+        return sum(1 for *_rest, future in self._waiters if not future.done())
+
+    def _try_take(self, costs: Mapping[str, float]) -> bool:
+        now = self._clock()
+        if now < self._paused_until:
+            return False
+        for name, amount in costs.items():
+            limit = self._limits.get(name)
+            if limit is not None:
+                limit.refill(now)
+                if limit.tokens < amount:
+                    return False
+        for name, amount in costs.items():
+            limit = self._limits.get(name)
+            if limit is not None:
+                limit.tokens -= amount
+        return True
+
+    def _delay(self, costs: Mapping[str, float]) -> float:
+        now = self._clock()
+        delay = max(0.0, self._paused_until - now)
+        for name, amount in costs.items():
+            limit = self._limits.get(name)
+            if limit is not None:
+                delay = max(delay, limit.wait_for(amount))
+        return delay
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters:
+            _priority, _seq, costs, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take(costs):
+                delay = max(self._delay(costs), 0.001)
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    for key, value in headers.items():
+        if key.lower() == "retry-after":
+            try:
+                return max(float(value), 1.0)
+            except ValueError:
+                break
+    return 60.0
+
+
+def binance_rate_limiter(request_weight_per_minute: int, orders_per_10s: int) -> VenueRateLimiter:
+    return VenueRateLimiter(
+        "binance",
+        {
+            "weight": LimitWindow(request_weight_per_minute, 60.0),
+            "orders": LimitWindow(orders_per_10s, 10.0),
+        },
+        headers={
+            "X-MBX-USED-WEIGHT-1M": ("weight", True),
+            "X-MBX-ORDER-COUNT-10S": ("orders", True),
+        },
+    )
+
+
+def alpaca_rate_limiter(requests_per_minute: int) -> VenueRateLimiter:
+    return VenueRateLimiter(
+        "alpaca",
+        {"requests": LimitWindow(requests_per_minute, 60.0)},
+        headers={"X-RateLimit-Remaining": ("requests", False)},
+    )
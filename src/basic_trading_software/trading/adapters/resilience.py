@@ -0,0 +1,380 @@
+"""Latency budgets, idempotent retries, hedged reads and circuit breaking for venue calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Dict, Optional, TypeVar
+
+import aiohttp
+import numpy as np
+from loguru import logger
+
+from basic_trading_software.common.config import VenueRequestSettings
+
+from .ratelimit import RateLimitExceeded
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The venue's breaker is open; the call was refused without touching the network."""
+
+    def __init__(self, venue: str, endpoint: str, retry_in: float) -> None:
+        super().__init__(f"{venue} circuit open; {endpoint} refused for {retry_in:.1f}s")
+        self.venue = venue
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class VenueRejected(aiohttp.ClientResponseError):
+    """The venue refused the request with a 4xx; sending it again cannot succeed.
+
+    ``message`` is the venue's own explanation and ``error_code`` its error code when the body
+    carries one (Binance ``-2010``, Alpaca ``40310000``).
+    """
+
+    def __init__(
+        self, venue: str, resp: aiohttp.ClientResponse, message: str, error_code: object = None
+    ) -> None:
+        super().__init__(
+            resp.request_info,
+            resp.history,
+            status=resp.status,
+            message=message,
+            headers=resp.headers,
+        )
+        self.venue = venue
+        self.error_code = error_code
+
+
+async def raise_for_venue_status(venue: str, resp: aiohttp.ClientResponse) -> None:
+    """Turn an error status into the exception ``RequestGuard`` classifies.
+
+    5xx raises a plain ``ClientResponseError`` (retried, counts against the breaker); any
+    other 4xx raises ``VenueRejected`` with the venue's message. 429/418 never get here: the
+    rate limiter has already raised ``RateLimitExceeded`` for them.
+    """
+
+    if resp.status < 400:
+        return
+    if resp.status >= 500:
+        resp.raise_for_status()
+    try:
+        body = await resp.json(content_type=None)
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        body = {}
+    message = body.get("msg") or body.get("message") or resp.reason or f"HTTP {resp.status}"
+    raise VenueRejected(venue, resp, str(message), body.get("code"))
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    """How one adapter endpoint is called.
+
+    ``budget`` bounds each attempt. A non-idempotent endpoint (order placement) is only
+    retried when the caller can ``recover`` the outcome of the timed-out attempt first, so a
+    retry never sends a second order. ``hedge`` is for reads only.
+    """
+
+    budget: float
+    retries: int = 0
+    idempotent: bool = True
+    hedge: bool = False
+    backoff: float = 0.05
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: opens after ``failure_threshold`` failures, then lets a
+    single probe through once ``reset_timeout`` has passed."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        if self._state == CLOSED:
+            return True
+        if self._state == OPEN and self.retry_in() <= 0:
+            self._state = HALF_OPEN
+            return True
+        # Half-open: the probe is already in flight.
+        return False
+
+    def record_success(self) -> None:
+        self._state = CLOSED
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Abandon a half-open probe that ended without an answer (e.g. it was cancelled).
+
+        The breaker goes back to open without restarting ``reset_timeout``, so the next call
+        may probe straight away.
+        """
+
+        if self._state == HALF_OPEN:
+            self._state = OPEN
+
+
+class _LatencyWindow:
+    """Recent successful latencies (seconds) with a lazily refreshed quantile."""
+
+    __slots__ = ("values", "count", "quantile", "_cached", "_cached_at")
+
+    def __init__(self, capacity: int, quantile: float) -> None:
+        self.values = np.empty(capacity)
+        self.count = 0
+        self.quantile = quantile
+        self._cached: Optional[float] = None
+        self._cached_at = 0
+
+    def add(self, seconds: float) -> None:
+        self.values[self.count % self.values.shape[0]] = seconds
+        self.count += 1
+
+    def estimate(self, min_samples: int = 20) -> Optional[float]:
+        if self.count < min_samples:
+            return None
+        # Refreshing every 16 samples keeps np.percentile off the per-request path.
+        if self._cached is None or self.count - self._cached_at >= 16:
+            window = self.values[: min(self.count, self.values.shape[0])]
+            self._cached = float(np.percentile(window, self.quantile))
+            self._cached_at = self.count
+        return self._cached
+
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientError, RateLimitExceeded))
+
+
+def _venue_answered(exc: BaseException) -> bool:
+    """A 4xx or rate-limit response: the request failed, but the venue is reachable."""
+
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status < 500
+    return isinstance(exc, RateLimitExceeded)
+
+
+class RequestGuard:
+    """Runs an adapter's REST calls under per-endpoint policies and a venue circuit breaker.
+
+    Every attempt gets the endpoint's latency budget. Timeouts, connection errors and 5xx
+    responses are retried with a short backoff and count against the breaker. A 429/418 is
+    retried once its ``Retry-After`` has passed if that fits in the budget, and otherwise
+    propagates; like a 4xx rejection (``VenueRejected``, never retried) it counts as the
+    venue being reachable. Hedged reads send a duplicate request once the first has been
+    outstanding longer than the endpoint's recent p95 and take whichever answers first.
+    While the breaker is open calls raise ``CircuitOpenError`` immediately, so the engine
+    can move on to the next venue instead of waiting out timeouts.
+    """
+
+    def __init__(
+        self,
+        venue: str,
+        policies: Mapping[str, EndpointPolicy],
+        default: EndpointPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        hedge_quantile: float = 95.0,
+        min_hedge_delay: float = 0.01,
+        sample_capacity: int = 512,
+    ) -> None:
+        self.venue = venue
+        self._policies = dict(policies)
+        self._default = default or EndpointPolicy(budget=5.0)
+        self.breaker = breaker or CircuitBreaker()
+        self._hedge_quantile = hedge_quantile
+        self._min_hedge_delay = min_hedge_delay
+        self._sample_capacity = sample_capacity
+        self._latency: Dict[str, _LatencyWindow] = {}
+
+    @classmethod
+    def from_settings(cls, venue: str, settings: VenueRequestSettings) -> "RequestGuard":
+        budgets = {name: ms / 1000 for name, ms in settings.budgets_ms.items()}
+
+        def budget(endpoint: str) -> float:
+            return budgets.get(endpoint, settings.default_budget_ms / 1000)
+
+        read = {"retries": settings.read_retries, "hedge": settings.hedge_reads}
+        policies = {
+            "place_order": EndpointPolicy(
+                budget("place_order"), retries=settings.order_retries, idempotent=False
+            ),
+            "find_order": EndpointPolicy(budget("find_order"), **read),
+            "cancel_order": EndpointPolicy(budget("cancel_order"), retries=settings.order_retries),
+            "cancel_all_orders": EndpointPolicy(
+                budget("cancel_all_orders"), retries=settings.order_retries
+            ),
+            "fetch_positions": EndpointPolicy(budget("fetch_positions"), **read),
+            "fetch_instruments": EndpointPolicy(budget("fetch_instruments"), **read),
+        }
+        return cls(
+            venue,
+            policies,
+            default=EndpointPolicy(budget("default")),
+            breaker=CircuitBreaker(
+                settings.breaker_failure_threshold, settings.breaker_reset_seconds
+            ),
+            hedge_quantile=settings.hedge_quantile,
+            min_hedge_delay=settings.min_hedge_delay_ms / 1000,
+        )
+
+    def policy(self, endpoint: str) -> EndpointPolicy:
+        return self._policies.get(endpoint, self._default)
+
+    def latency(self, endpoint: str) -> Optional[float]:
+        """Recent ``hedge_quantile`` latency of ``endpoint`` in seconds, once enough samples
+        exist."""
+
+        window = self._latency.get(endpoint)
+        return window.estimate() if window is not None else None
+
+    async def call(
+        self,
+        endpoint: str,
+        send: Callable[[], Awaitable[T]],
+        recover: Callable[[], Awaitable[Optional[T]]] | None = None,
+    ) -> T:
+        """Run ``send`` under ``endpoint``'s policy.
+
+        ``recover`` looks up the outcome of an attempt that timed out (e.g. the order by its
+        client id); when it finds one that result is returned instead of sending again.
+        """
+
+        policy = self.policy(endpoint)
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.venue, endpoint, self.breaker.retry_in())
+        try:
+            return await self._attempts(endpoint, policy, send, recover)
+        except BaseException:
+            # Every outcome is recorded below; anything else (cancellation, a local error)
+            # must not leave a half-open probe in flight forever.
+            self.breaker.release()
+            raise
+
+    async def _attempts(
+        self,
+        endpoint: str,
+        policy: EndpointPolicy,
+        send: Callable[[], Awaitable[T]],
+        recover: Callable[[], Awaitable[Optional[T]]] | None,
+    ) -> T:
+        retries = policy.retries if policy.idempotent or recover is not None else 0
+        for attempt in range(retries + 1):
+            try:
+                if attempt and recover is not None:
+                    found = await asyncio.wait_for(recover(), policy.budget)
+                    if found is not None:
+                        logger.info(f"[resilience] {self.venue} {endpoint} recovered after retry")
+                        self.breaker.record_success()
+                        return found
+                if policy.hedge:
+                    result = await self._hedged(endpoint, send, policy.budget)
+                else:
+                    result = await self._timed(endpoint, send, policy.budget)
+            except Exception as exc:
+                if not _retryable(exc):
+                    if _venue_answered(exc):
+                        self.breaker.record_success()
+                    raise
+                if isinstance(exc, RateLimitExceeded):
+                    # The venue is up but paused us; only wait if the pause fits the budget.
+                    self.breaker.record_success()
+                    if attempt == retries or exc.retry_after > policy.budget:
+                        raise
+                    delay = exc.retry_after
+                else:
+                    self.breaker.record_failure()
+                    if attempt == retries or self.breaker.state == OPEN:
+                        raise
+                    delay = policy.backoff * 2**attempt
+                logger.warning(
+                    f"[resilience] {self.venue} {endpoint} attempt {attempt + 1} failed "
+                    f"({type(exc).__name__}: {exc}); retrying"
+                )
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+        raise AssertionError("unreachable")
+
+    async def _timed(self, endpoint: str, send: Callable[[], Awaitable[T]], budget: float) -> T:
+        started = time.perf_counter()
+        result = await asyncio.wait_for(send(), budget)
+        self._record(endpoint, time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, endpoint: str, send: Callable[[], Awaitable[T]], budget: float) -> T:
+        estimate = self.latency(endpoint)
+        if estimate is None:
+            return await self._timed(endpoint, send, budget)
+        delay = min(max(estimate, self._min_hedge_delay), budget)
+        started = time.perf_counter()
+        first = asyncio.ensure_future(send())
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                logger.debug(
+                    "[resilience] Hedging {} {} after {:.3f}s", self.venue, endpoint, delay
+                )
+                pending.add(asyncio.ensure_future(send()))
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self._record(endpoint, time.perf_counter() - started)
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    assert error is not None
+                    raise error
+                remaining = budget - (time.perf_counter() - started)
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record(self, endpoint: str, seconds: float) -> None:
+        window = self._latency.get(endpoint)
+        if window is None:
+            window = _LatencyWindow(self._sample_capacity, self._hedge_quantile)
+            self._latency[endpoint] = window
+        window.add(seconds)
@@ -0,0 +1,635 @@
+"""In-process simulated exchange with a price-time priority matching engine."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from basic_trading_software.common.events import EventBus
+
+from .base import BrokerAdapter, OrderRequest, OrderResponse, PositionSnapshot
+
+BUY = "BUY"
+SELL = "SELL"
+_EPSILON = 1e-12
+_NEEDS_LIMIT = frozenset({"LIMIT", "STOP_LIMIT"})
+_NEEDS_STOP = frozenset({"STOP", "STOP_LIMIT"})
+
+
+@dataclass
+class FixedLatency:
+    """Constant one-way latency in seconds."""
+
+    seconds: float = 0.0
+
+    def sample(self) -> float:
+        return self.seconds
+
+
+@dataclass
+class JitterLatency:
+    """Base latency plus uniformly distributed jitter."""
+
+    base_seconds: float = 0.001
+    jitter_seconds: float = 0.0005
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def sample(self) -> float:
+        return self.base_seconds + self._rng.random() * self.jitter_seconds
+
+
+@dataclass
+class BpsSlippage:
+    """Adverse price move applied to taker fills against reference quote liquidity."""
+
+    bps: float = 0.0
+
+    def apply(self, side: str, price: float) -> float:
+        shift = price * self.bps * 1e-4
+        return price + shift if side == BUY else price - shift
+
+
+@dataclass
+class MakerTakerFees:
+    """Fees in basis points of fill notional."""
+
+    maker_bps: float = 0.0
+    taker_bps: float = 0.0
+
+    def fee(self, notional: float, is_maker: bool) -> float:
+        return abs(notional) * (self.maker_bps if is_maker else self.taker_bps) * 1e-4
+
+
+@dataclass(slots=True)
+class Fill:
+    order_id: str
+    client_order_id: Optional[str]
+    symbol: str
+    side: str
+    quantity: float
+    price: float
+    fee: float
+    liquidity: str  # maker / taker
+    remaining: float
+    status: str
+    timestamp: float
+
+
+class SimOrder:
+    """Mutable order state inside the matching engine."""
+
+    __slots__ = (
+        "order_id",
+        "client_order_id",
+        "symbol",
+        "side",
+        "order_type",
+        "time_in_force",
+        "quantity",
+        "limit_price",
+        "stop_price",
+        "remaining",
+        "filled_qty",
+        "filled_notional",
+        "status",
+    )
+
+    def __init__(
+        self,
+        order_id: str,
+        client_order_id: Optional[str],
+        symbol: str,
+        side: str,
+        order_type: str,
+        time_in_force: str,
+        quantity: float,
+        limit_price: Optional[float],
+        stop_price: Optional[float],
+    ) -> None:
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.time_in_force = time_in_force
+        self.quantity = quantity
+        self.limit_price = limit_price
+        self.stop_price = stop_price
+        self.remaining = quantity
+        self.filled_qty = 0.0
+        self.filled_notional = 0.0
+        self.status = "new"
+
+    @property
+    def avg_price(self) -> float | None:
+        return self.filled_notional / self.filled_qty if self.filled_qty > 0 else None
+
+
+class OrderBook:
+    """Single-symbol book: price levels of FIFO queues plus an external reference quote."""
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self._levels: Dict[str, Dict[float, Deque[SimOrder]]] = {BUY: {}, SELL: {}}
+        self._bid_heap: List[float] = []  # negated prices
+        self._ask_heap: List[float] = []
+        self._stops: List[SimOrder] = []
+        self.ref_bid: float | None = None
+        self.ref_ask: float | None = None
+        self.ref_bid_size = 0.0
+        self.ref_ask_size = 0.0
+
+    def best(self, side: str) -> float | None:
+        """Best live resting price on ``side``, discarding emptied levels lazily."""
+
+        levels = self._levels[side]
+        heap = self._bid_heap if side == BUY else self._ask_heap
+        while heap:
+            price = -heap[0] if side == BUY else heap[0]
+            queue = levels.get(price)
+            if queue is not None:
+                while queue and queue[0].remaining <= _EPSILON:
+                    queue.popleft()
+                if queue:
+                    return price
+                del levels[price]
+            heapq.heappop(heap)
+        return None
+
+    def head(self, side: str, price: float) -> SimOrder:
+        return self._levels[side][price][0]
+
+    def pop_head(self, side: str, price: float) -> None:
+        self._levels[side][price].popleft()
+
+    def rest(self, order: SimOrder) -> None:
+        assert order.limit_price is not None
+        levels = self._levels[order.side]
+        queue = levels.get(order.limit_price)
+        if queue is None:
+            queue = deque()
+            levels[order.limit_price] = queue
+            heap = self._bid_heap if order.side == BUY else self._ask_heap
+            heapq.heappush(heap, -order.limit_price if order.side == BUY else order.limit_price)
+        queue.append(order)
+
+    def add_stop(self, order: SimOrder) -> None:
+        self._stops.append(order)
+
+    def triggered_stops(self) -> List[SimOrder]:
+        """Remove and return stop orders whose trigger has been crossed by the reference quote."""
+
+        if not self._stops:
+            return []
+        fired: List[SimOrder] = []
+        waiting: List[SimOrder] = []
+        for order in self._stops:
+            if order.remaining <= _EPSILON:
+                continue
+            if _stop_triggered(order, self.ref_bid, self.ref_ask):
+                fired.append(order)
+            else:
+                waiting.append(order)
+        self._stops = waiting
+        return fired
+
+    def depth(self, side: str, levels: int = 5) -> List[Tuple[float, float]]:
+        """Aggregated (price, quantity) for the top ``levels`` resting price levels."""
+
+        book = self._levels[side]
+        prices = sorted((p for p, q in book.items() if q), reverse=side == BUY)
+        result: List[Tuple[float, float]] = []
+        for price in prices:
+            qty = sum(o.remaining for o in book[price])
+            if qty > _EPSILON:
+                result.append((price, qty))
+            if len(result) >= levels:
+                break
+        return result
+
+
+class MatchingEngine:
+    """Synchronous price-time priority matcher shared by every symbol of a simulated venue.
+
+    Incoming orders first match resting orders and the reference quote at the better price
+    (resting orders win ties), then rest (GTC limit) or expire (market/IOC remainder). FOK
+    orders are rejected untouched unless their whole quantity is available.
+    """
+
+    def __init__(
+        self,
+        slippage: BpsSlippage | None = None,
+        fees: MakerTakerFees | None = None,
+        clock: Callable[[], float] = time.time,
+        id_prefix: str = "sim",
+    ) -> None:
+        self._books: Dict[str, OrderBook] = {}
+        self._orders: Dict[str, SimOrder] = {}
+        self._slippage = slippage or BpsSlippage()
+        self._fees = fees or MakerTakerFees()
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._id_prefix = id_prefix
+
+    def book(self, symbol: str) -> OrderBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = OrderBook(symbol)
+            self._books[symbol] = book
+        return book
+
+    def get(self, order_id: str) -> SimOrder | None:
+        """Look up a live (resting or pending stop) order."""
+
+        return self._orders.get(order_id)
+
+    def submit(self, request: OrderRequest) -> Tuple[SimOrder, List[Fill]]:
+        symbol = request.symbol.upper()
+        side = request.side.upper()
+        order_type = request.order_type.upper()
+        order = SimOrder(
+            f"{self._id_prefix}-{next(self._ids)}",
+            request.client_order_id,
+            symbol,
+            side,
+            order_type,
+            request.time_in_force.upper(),
+            float(request.quantity),
+            request.limit_price,
+            request.stop_price,
+        )
+        if (
+            (side != BUY and side != SELL)
+            or order.quantity <= 0
+            or (order.limit_price is None and order_type in _NEEDS_LIMIT)
+            or (order.stop_price is None and order_type in _NEEDS_STOP)
+        ):
+            order.status = "rejected"
+            return order, []
+
+        book = self._books.get(symbol) or self.book(symbol)
+        if order_type in _NEEDS_STOP and not _stop_triggered(order, book.ref_bid, book.ref_ask):
+            self._orders[order.order_id] = order
+            book.add_stop(order)
+            return order, []
+
+        fills: List[Fill] = []
+        self._execute(book, order, fills)
+        if order.remaining > _EPSILON:
+            # Only live orders stay indexed so the table does not grow with history.
+            self._orders[order.order_id] = order
+        return order, fills
+
+    def live_orders(self, symbol: str | None = None) -> List[SimOrder]:
+        """Resting and pending-stop orders, optionally for one symbol."""
+
+        orders = list(self._orders.values())
+        if symbol is not None:
+            symbol = symbol.upper()
+            orders = [order for order in orders if order.symbol == symbol]
+        return orders
+
+    def cancel(self, order_id: str) -> SimOrder:
+        order = self._orders.get(order_id)
+        if order is None:
+            raise KeyError(f"Unknown or completed order id '{order_id}'")
+        # Lazy removal: the book skips zero-remaining entries when they reach the queue head.
+        order.remaining = 0.0
+        order.status = "cancelled"
+        del self._orders[order_id]
+        return order
+
+    def update_quote(
+        self,
+        symbol: str,
+        bid: float | None,
+        ask: float | None,
+        bid_size: float = float("inf"),
+        ask_size: float = float("inf"),
+    ) -> List[Fill]:
+        """Set the reference top of book and fill resting/stop orders it crosses."""
+
+        book = self.book(symbol.upper())
+        book.ref_bid, book.ref_ask = bid, ask
+        book.ref_bid_size, book.ref_ask_size = bid_size, ask_size
+        fills: List[Fill] = []
+
+        for order in book.triggered_stops():
+            self._execute(book, order, fills)
+
+        # Resting buys at or above the new ask (and sells at or below the bid) fill passively.
+        for side, ref_price in ((BUY, ask), (SELL, bid)):
+            if ref_price is None:
+                continue
+            while True:
+                price = book.best(side)
+                if price is None or not _crosses(side, price, ref_price):
+                    break
+                available = book.ref_ask_size if side == BUY else book.ref_bid_size
+                if available <= _EPSILON:
+                    break
+                resting = book.head(side, price)
+                qty = min(resting.remaining, available)
+                self._fill(resting, qty, price, True, fills)
+                if side == BUY:
+                    book.ref_ask_size -= qty
+                else:
+                    book.ref_bid_size -= qty
+                if resting.remaining <= _EPSILON:
+                    book.pop_head(side, price)
+        return fills
+
+    def _execute(self, book: OrderBook, order: SimOrder, fills: List[Fill]) -> None:
+        opposite = SELL if order.side == BUY else BUY
+        limit = order.limit_price if order.order_type in _NEEDS_LIMIT else None
+        if order.time_in_force == "FOK" and self._fillable(book, order, limit) < (
+            order.remaining - _EPSILON
+        ):
+            # Fill-or-kill: all of it now or none of it.
+            self._kill(order)
+            return
+        while order.remaining > _EPSILON:
+            internal = book.best(opposite)
+            if order.side == BUY:
+                external = book.ref_ask if book.ref_ask_size > _EPSILON else None
+            else:
+                external = book.ref_bid if book.ref_bid_size > _EPSILON else None
+
+            use_internal = internal is not None and (
+                external is None or not _better(order.side, external, internal)
+            )
+            price = internal if use_internal else external
+            if price is None or (limit is not None and not _crosses(order.side, limit, price)):
+                break
+
+            if use_internal:
+                resting = book.head(opposite, price)
+                qty = min(order.remaining, resting.remaining)
+                self._fill(resting, qty, price, True, fills)
+                self._fill(order, qty, price, False, fills)
+                if resting.remaining <= _EPSILON:
+                    book.pop_head(opposite, price)
+            else:
+                available = book.ref_ask_size if order.side == BUY else book.ref_bid_size
+                qty = min(order.remaining, available)
+                fill_price = self._slippage.apply(order.side, price)
+                if limit is not None:
+                    # Slippage worsens the fill, but never past the order's limit.
+                    clamp = min if order.side == BUY else max
+                    fill_price = clamp(fill_price, limit)
+                self._fill(order, qty, fill_price, False, fills)
+                if order.side == BUY:
+                    book.ref_ask_size -= qty
+                else:
+                    book.ref_bid_size -= qty
+
+        if order.remaining <= _EPSILON:
+            return
+        if limit is not None and order.time_in_force not in ("IOC", "FOK"):
+            book.rest(order)
+        else:
+            self._kill(order)
+
+    def _kill(self, order: SimOrder) -> None:
+        """End an order that cannot (or may no longer) rest, e.g. an IOC remainder."""
+
+        order.status = "expired" if order.filled_qty > 0 else "rejected"
+        order.remaining = 0.0
+        # Triggered stops were indexed while pending; dead orders must not stay live.
+        self._orders.pop(order.order_id, None)
+
+    def _fillable(self, book: OrderBook, order: SimOrder, limit: float | None) -> float:
+        """Quantity ``order`` could take right now at prices within ``limit``."""
+
+        if order.side == BUY:
+            external, size = book.ref_ask, book.ref_ask_size
+        else:
+            external, size = book.ref_bid, book.ref_bid_size
+        total = 0.0
+        if external is not None and (limit is None or _crosses(order.side, limit, external)):
+            total += size
+        for price, qty in book.depth(SELL if order.side == BUY else BUY, levels=sys.maxsize):
+            if total >= order.remaining:
+                break
+            if limit is not None and not _crosses(order.side, limit, price):
+                break
+            total += qty
+        return total
+
+    def _fill(self, order: SimOrder, qty: float, price: float, is_maker: bool, fills: List[Fill]) -> None:
+        notional = qty * price
+        remaining = order.remaining - qty
+        order.remaining = remaining
+        order.filled_qty += qty
+        order.filled_notional += notional
+        if remaining <= _EPSILON:
+            status = order.status = "filled"
+            self._orders.pop(order.order_id, None)
+        else:
+            status = order.status = "partially_filled"
+        fills.append(
+            Fill(
+                order.order_id,
+                order.client_order_id,
+                order.symbol,
+                order.side,
+                qty,
+                price,
+                self._fees.fee(notional, is_maker),
+                "maker" if is_maker else "taker",
+                remaining,
+                status,
+                self._clock(),
+            )
+        )
+
+
+class SimulatedExchangeAdapter(BrokerAdapter):
+    """``BrokerAdapter`` backed by an in-memory :class:`MatchingEngine`.
+
+    Orders never leave the process: latency is simulated with ``asyncio.sleep`` (virtual under
+    the replay loop) and every fill is published as an ``order.filled`` event.
+    """
+
+    def __init__(
+        self,
+        event_bus: EventBus | None = None,
+        venue: str = "simulated",
+        latency: FixedLatency | JitterLatency | None = None,
+        slippage: BpsSlippage | None = None,
+        fees: MakerTakerFees | None = None,
+        clock: Callable[[], float] = time.time,
+        symbols: Iterable[str] = (),
+    ) -> None:
+        self.venue = venue
+        self._event_bus = event_bus
+        self.publishes_fills = event_bus is not None
+        self._symbols = {symbol.upper() for symbol in symbols}
+        self._latency = latency or FixedLatency()
+        self._engine = MatchingEngine(slippage=slippage, fees=fees, clock=clock, id_prefix=venue)
+        self._positions: Dict[str, List[float]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue[Dict[str, Any]]]] = {}
+
+    @property
+    def engine(self) -> MatchingEngine:
+        return self._engine
+
+    async def authenticate(self) -> None:
+        return None
+
+    async def place_order(self, order: OrderRequest) -> OrderResponse:
+        await self._delay()
+        sim_order, fills = self._engine.submit(order)
+        await self._apply_fills(fills)
+        return self._response(sim_order)
+
+    def _response(self, sim_order: SimOrder) -> OrderResponse:
+        return OrderResponse(
+            order_id=sim_order.order_id,
+            status=sim_order.status,
+            filled_qty=sim_order.filled_qty,
+            avg_price=sim_order.avg_price,
+            raw={
+                "exchange": self.venue,
+                "client_order_id": sim_order.client_order_id,
+                "remaining": sim_order.remaining,
+            },
+        )
+
+    async def cancel_order(self, order_id: str) -> None:
+        await self._delay()
+        self._engine.cancel(order_id)
+
+    async def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResponse]:
+        """Whole batch in one simulated round trip, matched in submission order."""
+
+        await self._delay()
+        responses: List[OrderResponse] = []
+        for order in orders:
+            sim_order, fills = self._engine.submit(order)
+            await self._apply_fills(fills)
+            responses.append(self._response(sim_order))
+        return responses
+
+    async def cancel_all_orders(self, symbol: str | None = None) -> List[str]:
+        await self._delay()
+        cancelled = []
+        for sim_order in self._engine.live_orders(symbol):
+            self._engine.cancel(sim_order.order_id)
+            cancelled.append(sim_order.order_id)
+        return cancelled
+
+    async def fetch_symbols(self) -> List[str]:
+        return sorted(self._symbols)
+
+    async def fetch_positions(self) -> List[PositionSnapshot]:
+        return [
+            PositionSnapshot(symbol=symbol, quantity=qty, average_price=avg, venue=self.venue)
+            for symbol, (qty, avg) in self._positions.items()
+            if abs(qty) > _EPSILON
+        ]
+
+    async def on_quote(
+        self,
+        symbol: str,
+        bid: float | None,
+        ask: float | None,
+        bid_size: float = float("inf"),
+        ask_size: float = float("inf"),
+    ) -> None:
+        """Feed a reference quote; crosses resting/stop orders and fans out to streams."""
+
+        fills = self._engine.update_quote(symbol, bid, ask, bid_size, ask_size)
+        await self._apply_fills(fills)
+        queues = self._subscribers.get(symbol.upper())
+        if queues:
+            quote = {"symbol": symbol.upper(), "bid": bid, "ask": ask, "timestamp": time.time()}
+            for queue in queues:
+                queue.put_nowait(quote)
+
+    async def stream_market_data(self, symbol: str) -> AsyncIterator[Dict[str, Any]]:
+        queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+        queues = self._subscribers.setdefault(symbol.upper(), [])
+        queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            queues.remove(queue)
+
+    async def _delay(self) -> None:
+        seconds = self._latency.sample()
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    async def _apply_fills(self, fills: List[Fill]) -> None:
+        for fill in fills:
+            self._update_position(fill)
+            if self._event_bus is not None:
+                await self._event_bus.publish(
+                    "order.filled",
+                    {
+                        "order_id": fill.order_id,
+                        "client_order_id": fill.client_order_id,
+                        "symbol": fill.symbol,
+                        "side": fill.side,
+                        "quantity": fill.quantity,
+                        "price": fill.price,
+                        "fee": fill.fee,
+                        "liquidity": fill.liquidity,
+                        "remaining": fill.remaining,
+                        "status": fill.status,
+                        "venue": self.venue,
+                        "timestamp": fill.timestamp,
+                    },
+                )
+
+    def _update_position(self, fill: Fill) -> None:
+        qty, avg = self._positions.get(fill.symbol, (0.0, 0.0))
+        signed = fill.quantity if fill.side == BUY else -fill.quantity
+        new_qty = qty + signed
+        if qty == 0 or (qty > 0) == (signed > 0):
+            avg = (avg * abs(qty) + fill.price * abs(signed)) / abs(new_qty)
+        elif abs(new_qty) > _EPSILON and (new_qty > 0) != (qty > 0):
+            avg = fill.price  # flipped through flat
+        elif abs(new_qty) <= _EPSILON:
+            avg = 0.0
+        self._positions[fill.symbol] = [new_qty, avg]
+
+
+def _better(side: str, candidate: float, incumbent: float) -> bool:
+    """Whether ``candidate`` is a strictly better price than ``incumbent`` for a ``side`` taker."""
+
+    return candidate < incumbent if side == BUY else candidate > incumbent
+
+
+def _crosses(side: str, limit: float, price: float) -> bool:
+    return price <= limit if side == BUY else price >= limit
+
+
+def _stop_triggered(order: SimOrder, bid: float | None, ask: float | None) -> bool:
+    assert order.stop_price is not None
+    if order.side == BUY:
+        return ask is not None and ask >= order.stop_price
+    return bid is not None and bid <= order.stop_price
@@ -3,30 +3,75 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from typing import Dict
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import replace
+from functools import partial
+from typing import Any, Dict, List, NamedTuple, Set, Tuple
 
 from loguru import logger
 
 from basic_trading_software.common.config import get_settings
 from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.logging import LogSampler
+from basic_trading_software.common.tracing import (
+    ADAPTER_SEND,
+    ENGINE_RECEIVED,
+    FILLED,
+    RISK_PASSED,
+    VENUE_RESPONSE,
+    get_tracer,
+)
 from basic_trading_software.trading.adapters.base import BrokerAdapter, OrderRequest, OrderResponse
+from basic_trading_software.trading.adapters.resilience import CircuitOpenError, VenueRejected
+from basic_trading_software.trading.lanes import CANCEL_PRIORITY, LaneScheduler
+from basic_trading_software.trading.ledger import PortfolioTotals, Position, PositionLedger
+from basic_trading_software.trading.netting import SignalNetter
+from basic_trading_software.trading.orders import OrderRecord, OrderStateError, OrderStore
+from basic_trading_software.trading.risk import RiskEngine, RiskLimits
+from basic_trading_software.trading.router import SmartOrderRouter
 
+# Signals can arrive thousands of times a second; log at most one per second.
+_SIGNAL_LOG = LogSampler(1.0)
 
-@dataclass
-class Position:
-    symbol: str
-    quantity: float
-    average_price: float
+
+class _Attempt(NamedTuple):
+    """Outcome of placing an order on one venue."""
+
+    order: OrderRequest  # as sent, rounded to the venue's rules
+    response: OrderResponse | None  # None when the venue failed or was skipped
+    final: bool  # False: the venue could not take it; try the next candidate
+    adapter: BrokerAdapter | None = None  # the venue that answered, if one did
 
 
 class TradingEngine:
     """Simplified event-driven trading engine."""
 
-    def __init__(self, event_bus: EventBus, adapters: list[BrokerAdapter]) -> None:
+    def __init__(
+        self,
+        event_bus: EventBus,
+        adapters: list[BrokerAdapter],
+        router: SmartOrderRouter | None = None,
+        order_store: OrderStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
         self._event_bus = event_bus
-        self._positions: Dict[str, Position] = {}
-        self._lock = asyncio.Lock()
+        self._ledger = PositionLedger()
+        self._settings = get_settings()
+        # Replay passes its virtual clocks so rate limits and day rollover follow the bars.
+        self._risk = RiskEngine(
+            self._ledger,
+            RiskLimits.from_settings(self._settings.risk),
+            clock=clock,
+            wall_clock=wall_clock,
+        )
+        self._orders = order_store if order_store is not None else OrderStore()
+        self._tracer = get_tracer()
+        self._lanes = LaneScheduler()
+        self._netter = SignalNetter.from_settings(self._submit_signal, self._settings.netting)
+        self._inflight: Set[asyncio.Task[Any]] = set()
+        self._router = router or SmartOrderRouter(adapters)
         self._adapters = adapters
         self._adapter_map = {adapter.venue.lower(): adapter for adapter in adapters}
         self._paper_mode = True
@@ -34,14 +79,21 @@ class TradingEngine:
     async def start(self) -> None:
         """Register to listen for signals."""
 
-        settings = get_settings()
+        settings = self._settings
         if settings.trading_mode != "paper":
-            logger.warning("[engine] Trading mode set to '%s'; forcing paper execution.", settings.trading_mode)
+            logger.warning(
+                "[engine] Trading mode set to '{}'; forcing paper execution.", settings.trading_mode
+            )
         self._paper_mode = True
 
+        await self._orders.open()
         await self._event_bus.subscribe("signal.generated", self._on_signal)
         await self._event_bus.subscribe("order.cancel", self._on_cancel)
         await self._event_bus.subscribe("settings.credentials_updated", self._on_credentials_updated)
+        await self._event_bus.subscribe("order.filled", self._on_fill)
+        await self._event_bus.subscribe("market.quote", self._on_quote)
+        await self._event_bus.subscribe("risk.limits_updated", self._on_risk_limits_updated)
+        await self._event_bus.subscribe("portfolio.rebalance", self._on_rebalance)
 
         for adapter in self._adapters:
             try:
@@ -49,63 +101,385 @@ class TradingEngine:
             except Exception as exc:  # noqa: BLE001
                 logger.error(f"[engine] Adapter {adapter.venue} authentication failed: {exc}")
 
+        # Open pooled connections now so the first order does not pay TCP/TLS setup.
+        warmed = await asyncio.gather(
+            *(adapter.warm() for adapter in self._adapters), return_exceptions=True
+        )
+        for adapter, result in zip(self._adapters, warmed):
+            if isinstance(result, Exception):
+                logger.warning(f"[engine] Connection pre-warm failed for {adapter.venue}: {result}")
+
+        await self._router.start(self._event_bus)
+
     async def _on_signal(self, payload: Dict[str, object]) -> None:
-        """Handle incoming strategy signals."""
+        """Handle incoming strategy signals.
+
+        Signals pass through the netting stage (a no-op unless a window is configured), then
+        the order is queued on its (venue, symbol) lane and this handler returns immediately,
+        so a slow venue round trip never holds up signals for other instruments.
+        """
 
         symbol = str(payload.get("symbol"))
         side = str(payload.get("side"))
         confidence = float(payload.get("confidence", 0.0))
+        skipped = _SIGNAL_LOG.take()
+        if skipped is not None:
+            logger.info(
+                "[engine] Received signal {} {} confidence={:0.2f} ({} more since last)",
+                symbol,
+                side,
+                confidence,
+                skipped,
+            )
+        trace_id = payload.get("trace_id")
+        if trace_id is None:
+            payload = {**payload, "trace_id": self._tracer.begin(ENGINE_RECEIVED)}
+        else:
+            self._tracer.mark(trace_id, ENGINE_RECEIVED)
+
+        quantity = float(payload.get("quantity") or self._settings.risk.default_order_quantity)  # type: ignore[arg-type]
+        self._netter.add(symbol, side, quantity, payload)
+
+    def _submit_signal(
+        self, symbol: str, side: str, quantity: float, payload: Dict[str, object]
+    ) -> None:
+        order = OrderRequest(symbol=symbol, side=side, quantity=quantity)
+        venue_hint = payload.get("venue")
+        candidates = self._router.route(symbol, side, str(venue_hint) if venue_hint else None)
+        trace_id = payload.get("trace_id")
+        # Store what the first choice will actually be sent (lot-rounded), as rebalance does.
+        stored = self._prepare(candidates[0], order)[0] if candidates else order
+        self._orders.create(
+            stored,
+            candidates[0].venue if candidates else "-",
+            trace_id=str(trace_id) if trace_id else None,
+        )
+        order.client_order_id = stored.client_order_id
+        # Queue on the first choice's lane now, so orders keep their arrival order there.
+        first = self._enqueue(candidates[0], order, trace_id) if candidates else None
+        confidence = float(payload.get("confidence", 0.0))  # type: ignore[arg-type]
         model = payload.get("model")
-        logger.info(f"[engine] Received signal {symbol} {side} confidence={confidence:0.2f}")
-
-        order = OrderRequest(symbol=symbol, side=side, quantity=1)
-        response: OrderResponse | None = None
-        async with self._lock:
-            for adapter in self._adapters:
-                try:
-                    response = await adapter.place_order(order)
-                    logger.info(f"[engine] Routed order to {adapter.venue} -> {response.status}")
-                    break
-                except Exception as exc:  # noqa: BLE001
-                    logger.error(f"[engine] Order failed on {adapter.venue}: {exc}")
+        self._track(self._finish_order(first, order, candidates, trace_id, confidence, model))
 
-            await self._event_bus.publish(
-                "order.submitted",
-                {
-                    "symbol": symbol,
-                    "side": side,
-                    "size": order.quantity,
-                    "status": response.status if response else "rejected",
-                    "confidence": confidence,
-                    "venue": response.raw.get("exchange") if response and response.raw else None,
-                    "model": model,
-                },
+    def _enqueue(
+        self, adapter: BrokerAdapter, order: OrderRequest, trace_id: object
+    ) -> asyncio.Future[_Attempt]:
+        key = (adapter.venue.lower(), order.symbol.upper())
+        return self._lanes.submit(key, partial(self._place_on, adapter, order, trace_id))
+
+    async def _place_on(
+        self, adapter: BrokerAdapter, order: OrderRequest, trace_id: object = None
+    ) -> _Attempt:
+        """One attempt on ``adapter``, run on that venue's lane for the instrument."""
+
+        prepared, reason = self._prepare(adapter, order)
+        if reason is not None:
+            # This venue would bounce it; another candidate may list it with other rules.
+            logger.warning(
+                f"[engine] {order.symbol} {order.side} invalid for {adapter.venue}: {reason}"
+            )
+            return _Attempt(prepared, self._rejection(reason), final=False)
+        # Checked inside the lane so earlier fills on this instrument are already applied.
+        reason = self._risk.check(
+            adapter.venue, order.symbol, order.side, prepared.quantity, prepared.limit_price
+        )
+        if reason is not None:
+            logger.warning(
+                f"[engine] Risk rejected {order.symbol} {order.side} on {adapter.venue}: {reason}"
+            )
+            return _Attempt(prepared, self._rejection(reason), final=True)
+        self._tracer.mark(trace_id, RISK_PASSED)
+        try:
+            self._orders.amend(prepared, adapter.venue)
+            self._tracer.mark(trace_id, ADAPTER_SEND)
+            response = await adapter.place_order(prepared)
+            self._tracer.mark(trace_id, VENUE_RESPONSE)
+            logger.info("[engine] Routed order to {} -> {}", adapter.venue, response.status)
+            if response.order_id:
+                self._router.record_order(response.order_id, adapter.venue, order.symbol)
+            return _Attempt(prepared, response, final=True, adapter=adapter)
+        except VenueRejected as exc:
+            # The venue answered and refused the order; another venue would not change that.
+            logger.warning(
+                f"[engine] {adapter.venue} rejected {order.symbol} {order.side}: {exc.message}"
+            )
+            return _Attempt(prepared, self._rejection(exc.message), final=True, adapter=adapter)
+        except CircuitOpenError as exc:
+            # Degraded venue: fail over at once rather than queueing behind its timeouts.
+            logger.warning(f"[engine] Skipping {adapter.venue}: {exc}")
+        except Exception as exc:  # noqa: BLE001
+            logger.error(f"[engine] Order failed on {adapter.venue}: {exc}")
+        return _Attempt(prepared, None, final=False)
+
+    def _prepare(
+        self, adapter: BrokerAdapter, order: OrderRequest
+    ) -> Tuple[OrderRequest, str | None]:
+        """Round ``order`` to ``adapter``'s instrument rules and validate it locally."""
+
+        instruments = self._router.instruments
+        if instruments is None:
+            return order, None
+        return instruments.prepare(adapter.venue, order, self._ledger.last_price(order.symbol))
+
+    async def _finish_order(
+        self,
+        first: asyncio.Future[_Attempt] | None,
+        order: OrderRequest,
+        candidates: List[BrokerAdapter],
+        trace_id: object,
+        confidence: float,
+        model: object,
+    ) -> None:
+        """Try ``candidates`` in turn until one takes (or finally rejects) the order.
+
+        A failover attempt is queued on the next venue's own lane, so the order is serialized
+        with the other orders that venue is handling for the instrument.
+        """
+
+        local_rejection: _Attempt | None = None
+        for index, adapter in enumerate(candidates):
+            if index == 0 and first is not None:
+                attempt = await first
+            else:
+                attempt = await self._enqueue(adapter, order, trace_id)
+            if attempt.final:
+                break
+            if attempt.response is not None:
+                local_rejection = attempt
+        else:
+            attempt = local_rejection or _Attempt(order, None, final=True)
+        await self._publish_result(
+            attempt.order, attempt.adapter, attempt.response, confidence, model
+        )
+
+    async def _publish_result(
+        self,
+        order: OrderRequest,
+        adapter: BrokerAdapter | None,
+        response: OrderResponse | None,
+        confidence: float,
+        model: object,
+    ) -> None:
+        record = self._record_response(order, adapter, response)
+        self._forget_if_closed(record)
+        trace_id = record.trace_id if record else None
+        if adapter and not adapter.publishes_fills and response and response.avg_price:
+            # REST-only venues report executions in the response; surface them as fill events
+            # so the ledger has a single input path.
+            if response.filled_qty > 0:
+                await self._event_bus.publish(
+                    "order.filled",
+                    {
+                        "order_id": response.order_id,
+                        "client_order_id": order.client_order_id,
+                        "symbol": order.symbol.upper(),
+                        "side": order.side.upper(),
+                        "quantity": response.filled_qty,
+                        "price": response.avg_price,
+                        "fee": 0.0,
+                        "venue": adapter.venue,
+                    },
+                )
+        await self._event_bus.publish(
+            "order.submitted",
+            {
+                "symbol": order.symbol,
+                "side": order.side,
+                "size": order.quantity,
+                "status": response.status if response else "rejected",
+                "confidence": confidence,
+                "venue": response.raw.get("exchange") if response and response.raw else None,
+                "order_id": response.order_id if response else None,
+                "reason": self._rejection_reason(response),
+                "model": model,
+                "trace_id": trace_id,
+            },
+        )
+        if record is None or not record.is_open or adapter is None or not adapter.publishes_fills:
+            self._tracer.finish(trace_id, adapter.venue if adapter else None)
+        # Otherwise the execution arrives on the venue's stream and _on_fill closes the trace.
+
+    @staticmethod
+    def _rejection(reason: str) -> OrderResponse:
+        return OrderResponse(order_id="", status="rejected", filled_qty=0.0, raw={"reason": reason})
+
+    @staticmethod
+    def _rejection_reason(response: OrderResponse | None) -> str | None:
+        if response is None or not response.raw:
+            return None
+        return response.raw.get("reason") or response.raw.get("error")
+
+    async def rebalance(
+        self,
+        targets: Dict[str, float],
+        venue: str | None = None,
+        confidence: float = 0.0,
+        model: object = None,
+    ) -> List[OrderResponse]:
+        """Move positions to ``targets`` (symbol -> signed quantity) in one batch per venue.
+
+        Deltas against the ledger are risk-checked, grouped by routed venue and sent through
+        ``place_orders``, so a many-symbol rebalance costs about one round trip per venue.
+        Batched orders bypass the per-instrument lanes.
+        """
+
+        batches: Dict[str, Tuple[BrokerAdapter, List[OrderRequest]]] = {}
+        results: List[OrderResponse] = []
+        for symbol, target in targets.items():
+            delta = float(target) - self._ledger.quantity(symbol)
+            if abs(delta) <= 1e-12:
+                continue
+            side = "BUY" if delta > 0 else "SELL"
+            candidates = self._router.route(symbol, side, venue)
+            if not candidates:
+                logger.warning(f"[engine] No venue for rebalance of {symbol}")
+                continue
+            adapter = candidates[0]
+            order, reason = self._prepare(
+                adapter, OrderRequest(symbol=symbol, side=side, quantity=abs(delta))
+            )
+            self._orders.create(order, adapter.venue)
+            if reason is None:
+                reason = self._risk.check(
+                    adapter.venue, symbol, side, order.quantity, order.limit_price
+                )
+            if reason is not None:
+                logger.warning(
+                    f"[engine] Risk rejected rebalance {symbol} {side} on {adapter.venue}: {reason}"
+                )
+                rejected = self._rejection(reason)
+                await self._publish_result(order, None, rejected, confidence, model)
+                results.append(rejected)
+                continue
+            batches.setdefault(adapter.venue.lower(), (adapter, []))[1].append(order)
+
+        for responses in await asyncio.gather(
+            *(
+                self._place_batch(adapter, orders, confidence, model)
+                for adapter, orders in batches.values()
+            )
+        ):
+            results.extend(responses)
+        return results
+
+    async def _place_batch(
+        self, adapter: BrokerAdapter, orders: List[OrderRequest], confidence: float, model: object
+    ) -> List[OrderResponse]:
+        responses = await adapter.place_orders(orders)
+        logger.info(f"[engine] Placed batch of {len(orders)} orders on {adapter.venue}")
+        for order, response in zip(orders, responses):
+            if response.order_id:
+                self._router.record_order(response.order_id, adapter.venue, order.symbol)
+            await self._publish_result(order, adapter, response, confidence, model)
+        return responses
+
+    async def _on_rebalance(self, payload: Dict[str, object]) -> None:
+        targets = payload.get("targets") or {}
+        venue = payload.get("venue")
+        self._track(
+            self.rebalance(
+                {str(k): float(v) for k, v in dict(targets).items()},  # type: ignore[call-overload]
+                venue=str(venue) if venue else None,
+                model=payload.get("model"),
             )
+        )
 
     async def _on_cancel(self, payload: Dict[str, object]) -> None:
+        """Cancel on the lane that placed the order, ahead of any queued new orders."""
+
         order_id = str(payload.get("order_id"))
-        async with self._lock:
-            for adapter in self._adapters:
-                try:
-                    await adapter.cancel_order(order_id)
-                    await self._event_bus.publish(
-                        "order.cancelled",
-                        {"order_id": order_id, "venue": adapter.venue},
-                    )
-                    break
-                except Exception as exc:  # noqa: BLE001
-                    logger.error(f"[engine] Cancel failed on {adapter.venue}: {exc}")
+        route = self._router.route_for_order(order_id)
+        if route is None:
+            record = self._orders.by_order_id(order_id)
+            if record is not None:
+                route = (record.venue, record.symbol)
+        if route is None and payload.get("venue") and payload.get("symbol"):
+            route = (str(payload["venue"]).lower(), str(payload["symbol"]).upper())
+        if route is None or route[0] not in self._adapter_map:
+            # Unknown order (e.g. placed before a restart): ask every venue, outside any lane.
+            self._track(self._cancel_anywhere(order_id))
+            return
+
+        adapter = self._adapter_map[route[0]]
+        future = self._lanes.submit(
+            route, partial(adapter.cancel_order, order_id), priority=CANCEL_PRIORITY
+        )
+        self._track(self._finish_cancel(future, order_id, adapter.venue, route[1]))
+
+    async def _finish_cancel(
+        self, future: asyncio.Future[None], order_id: str, venue: str, symbol: str
+    ) -> None:
+        try:
+            await future
+        except Exception as exc:  # noqa: BLE001 - background task; log and move on
+            logger.error(f"[engine] Cancel failed on {venue}: {exc}")
+            return
+        self._router.forget_order(order_id)
+        try:
+            record = self._orders.cancel(order_id=order_id)
+            self._tracer.finish(record.trace_id, venue)
+        except OrderStateError as exc:
+            logger.debug(f"[engine] Order store not updated for cancel: {exc}")
+        await self._event_bus.publish(
+            "order.cancelled", {"order_id": order_id, "venue": venue, "symbol": symbol}
+        )
+
+    async def _cancel_anywhere(self, order_id: str) -> None:
+        """Cancel an order the router has no record of by asking every venue at once."""
+
+        results = await asyncio.gather(
+            *(adapter.cancel_order(order_id) for adapter in self._adapters), return_exceptions=True
+        )
+        for adapter, result in zip(self._adapters, results):
+            if isinstance(result, Exception):
+                logger.error(f"[engine] Cancel failed on {adapter.venue}: {result}")
+                continue
+            await self._event_bus.publish(
+                "order.cancelled",
+                {"order_id": order_id, "venue": adapter.venue},
+            )
+            break
+
+    def _track(self, coro: Coroutine[Any, Any, Any]) -> None:
+        task = asyncio.create_task(coro)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def drain(self) -> None:
+        """Flush open netting windows, then wait until every queued order and cancel has
+        completed and been published."""
+
+        self._netter.flush_all()
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Stop accepting work and cancel anything still queued on the lanes."""
+
+        await self._event_bus.unsubscribe("signal.generated", self._on_signal)
+        await self._event_bus.unsubscribe("order.cancel", self._on_cancel)
+        await self._event_bus.unsubscribe("portfolio.rebalance", self._on_rebalance)
+        await self._event_bus.unsubscribe("settings.credentials_updated", self._on_credentials_updated)
+        await self._event_bus.unsubscribe("risk.limits_updated", self._on_risk_limits_updated)
+        self._netter.discard()
+        await self._router.stop()
+        await self._lanes.close()
+        await self.drain()
+        # Fills and marks keep the ledger current until the last in-flight order is done.
+        await self._event_bus.unsubscribe("order.filled", self._on_fill)
+        await self._event_bus.unsubscribe("market.quote", self._on_quote)
+        await self._orders.close()
 
     async def _on_credentials_updated(self, payload: Dict[str, object]) -> None:
         venue = str(payload.get("venue", "")).lower()
         adapter = self._adapter_map.get(venue)
         if not adapter:
-            logger.debug("[engine] No adapter registered for venue '%s'", venue)
+            logger.debug("[engine] No adapter registered for venue '{}'", venue)
             return
 
         updater = getattr(adapter, "update_credentials", None)
         if updater is None:
-            logger.debug("[engine] Adapter '%s' does not support credential updates", venue)
+            logger.debug("[engine] Adapter '{}' does not support credential updates", venue)
             return
 
         api_key = payload.get("api_key")
@@ -113,11 +487,94 @@ class TradingEngine:
         try:
             await updater(api_key, api_secret)  # type: ignore[arg-type]
             await adapter.authenticate()
-            logger.info("[engine] Refreshed credentials for adapter '%s'", venue)
+            logger.info("[engine] Refreshed credentials for adapter '{}'", venue)
         except Exception as exc:  # noqa: BLE001
             logger.error(f"[engine] Failed to refresh credentials for {venue}: {exc}")
 
+    async def _on_fill(self, payload: Dict[str, object]) -> None:
+        quantity = float(payload.get("quantity", 0.0))  # type: ignore[arg-type]
+        price = float(payload.get("price", 0.0))  # type: ignore[arg-type]
+        self._ledger.apply_fill(
+            str(payload.get("symbol")),
+            str(payload.get("side")),
+            quantity,
+            price,
+            float(payload.get("fee", 0.0) or 0.0),  # type: ignore[arg-type]
+        )
+        client_order_id = payload.get("client_order_id")
+        order_id = payload.get("order_id")
+        try:
+            record = self._orders.apply_fill(
+                quantity,
+                price,
+                client_order_id=str(client_order_id) if client_order_id else None,
+                order_id=str(order_id) if order_id else None,
+            )
+            # The first fill closes the trace; later partial fills find it already finished.
+            self._tracer.mark(record.trace_id, FILLED)
+            self._tracer.finish(record.trace_id, record.venue)
+            self._forget_if_closed(record)
+        except OrderStateError as exc:
+            # Fills for orders placed outside this engine still update the ledger.
+            logger.debug(f"[engine] Order store not updated for fill: {exc}")
+
+    def _forget_if_closed(self, record: OrderRecord | None) -> None:
+        """Drop a finished order's cancel route so the router's map only holds live orders."""
+
+        if record is not None and record.order_id and not record.is_open:
+            self._router.forget_order(record.order_id)
+
+    def _record_response(
+        self, order: OrderRequest, adapter: BrokerAdapter | None, response: OrderResponse | None
+    ) -> OrderRecord | None:
+        client_order_id = order.client_order_id or ""
+        try:
+            if adapter is None or response is None or response.status.lower() == "rejected":
+                reason = self._rejection_reason(response) or "no venue accepted the order"
+                return self._orders.reject(client_order_id, reason)
+            record = self._orders.acknowledge(client_order_id, response.order_id, adapter.venue)
+            if record.is_open and response.status.lower() in {"cancelled", "canceled", "expired"}:
+                self._orders.cancel(client_order_id)
+            return record
+        except OrderStateError as exc:
+            logger.warning(f"[engine] Order store rejected update for {client_order_id}: {exc}")
+            return self._orders.get(client_order_id)
+
+    async def _on_quote(self, payload: Dict[str, object]) -> None:
+        price = payload.get("last")
+        if price is None and payload.get("bid") is not None and payload.get("ask") is not None:
+            price = (float(payload["bid"]) + float(payload["ask"])) / 2  # type: ignore[arg-type]
+        if price is not None:
+            self._ledger.mark(str(payload.get("symbol")), float(price))  # type: ignore[arg-type]
+
+    async def _on_risk_limits_updated(self, payload: Dict[str, object]) -> None:
+        """Hot-reload risk limits; keys absent from the payload keep their configured value."""
+
+        base = RiskLimits.from_settings(self._settings.risk)
+        fields = {key: value for key, value in payload.items() if hasattr(base, key)}
+        try:
+            self._risk.reload(replace(base, **fields))  # type: ignore[arg-type]
+        except Exception as exc:  # noqa: BLE001 - keep the current limits
+            logger.error(f"[engine] Ignoring invalid risk limits update: {exc}")
+
+    @property
+    def orders(self) -> OrderStore:
+        return self._orders
+
+    @property
+    def risk(self) -> RiskEngine:
+        return self._risk
+
+    @property
+    def ledger(self) -> PositionLedger:
+        return self._ledger
+
     def snapshot_positions(self) -> Dict[str, Position]:
         """Return a copy of open positions."""
 
-        return dict(self._positions)
+        return self._ledger.snapshot()
+
+    def portfolio_totals(self) -> PortfolioTotals:
+        """Portfolio-wide exposure and PnL computed in one vectorized pass."""
+
+        return self._ledger.totals()
@@ -0,0 +1,209 @@
+"""Cached venue instrument metadata used to round and validate orders before sending."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from loguru import logger
+
+from basic_trading_software.common.config import InstrumentSettings
+from basic_trading_software.trading.adapters.base import BrokerAdapter, Instrument, OrderRequest
+
+_SNAPSHOT_VERSION = 1
+
+
+class InstrumentCache:
+    """Per-venue symbol rules with O(1) lookup, TTL refresh and a JSON snapshot on disk.
+
+    On startup the snapshot is loaded so routing and order validation work before any venue
+    has answered; venues whose entries are older than ``ttl`` (or absent) are then refreshed
+    from ``fetch_instruments``. A failed refresh keeps the previous entries, since stale lot
+    sizes are far more useful than none.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl: float = 6 * 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = Path(path) if path is not None else None
+        self._ttl = ttl
+        self._clock = clock
+        self._instruments: Dict[Tuple[str, str], Instrument] = {}
+        self._symbols: Dict[str, Tuple[str, ...]] = {}
+        self._fetched_at: Dict[str, float] = {}
+
+    @classmethod
+    def from_settings(cls, settings: InstrumentSettings) -> "InstrumentCache":
+        return cls(settings.snapshot_path, settings.ttl_seconds)
+
+    def __len__(self) -> int:
+        return len(self._instruments)
+
+    def get(self, venue: str, symbol: str) -> Instrument | None:
+        return self._instruments.get((venue.lower(), symbol.upper()))
+
+    def symbols(self, venue: str) -> Tuple[str, ...]:
+        """Tradable symbols on ``venue``."""
+
+        return self._symbols.get(venue.lower(), ())
+
+    def venues(self) -> List[str]:
+        return list(self._fetched_at)
+
+    def is_stale(self, venue: str) -> bool:
+        fetched_at = self._fetched_at.get(venue.lower())
+        return fetched_at is None or self._clock() - fetched_at >= self._ttl
+
+    def replace(
+        self, venue: str, instruments: Iterable[Instrument], fetched_at: float | None = None
+    ) -> None:
+        """Swap in a venue's full instrument list."""
+
+        venue = venue.lower()
+        entries = {(venue, item.symbol.upper()): item for item in instruments}
+        self._instruments = {
+            key: item for key, item in self._instruments.items() if key[0] != venue
+        }
+        self._instruments.update(entries)
+        self._symbols[venue] = tuple(
+            symbol for (_venue, symbol), item in entries.items() if item.tradable
+        )
+        self._fetched_at[venue] = self._clock() if fetched_at is None else fetched_at
+
+    async def refresh(self, adapters: Sequence[BrokerAdapter], force: bool = False) -> List[str]:
+        """Re-fetch stale venues concurrently, persist the snapshot and return the venues
+        that were refreshed."""
+
+        targets = [a for a in adapters if force or self.is_stale(a.venue)]
+        if not targets:
+            return []
+        results = await asyncio.gather(
+            *(adapter.fetch_instruments() for adapter in targets), return_exceptions=True
+        )
+        refreshed: List[str] = []
+        for adapter, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"[instruments] Refresh failed for {adapter.venue}: {result}")
+                continue
+            self.replace(adapter.venue, result)
+            refreshed.append(adapter.venue.lower())
+            logger.info(f"[instruments] Loaded {len(result)} instruments from {adapter.venue}")
+        if refreshed:
+            await self.save()
+        return refreshed
+
+    async def run_refresher(
+        self, adapters: Sequence[BrokerAdapter], on_refresh: Callable[[], None]
+    ) -> None:
+        """Refresh venues as their entries expire; ``on_refresh`` runs after each update."""
+
+        while True:
+            await asyncio.sleep(max(self._ttl / 10, 1.0))
+            if await self.refresh(adapters):
+                on_refresh()
+
+    def prepare(
+        self, venue: str, order: OrderRequest, reference_price: float | None = None
+    ) -> Tuple[OrderRequest, str | None]:
+        """Round ``order`` to the venue's lot and tick sizes and check its minimums.
+
+        Returns the order to send (a copy when anything was rounded) and the reason the venue
+        would reject it, if any. Symbols the cache does not know pass through untouched.
+        """
+
+        instrument = self.get(venue, order.symbol)
+        if instrument is None:
+            return order, None
+        quantity = instrument.round_quantity(order.quantity)
+        limit_price = order.limit_price
+        if limit_price is not None:
+            limit_price = instrument.round_price(limit_price, order.side)
+        stop_price = order.stop_price
+        if stop_price is not None:
+            stop_price = instrument.round_price(stop_price, order.side)
+        reason = instrument.validate(
+            quantity, limit_price if limit_price is not None else reference_price
+        )
+        if (quantity, limit_price, stop_price) != (
+            order.quantity,
+            order.limit_price,
+            order.stop_price,
+        ):
+            order = replace(
+                order, quantity=quantity, limit_price=limit_price, stop_price=stop_price
+            )
+        return order, reason
+
+    async def load(self) -> bool:
+        """Populate from the snapshot; ``False`` when there is none (or it is unreadable)."""
+
+        if self._path is None or not self._path.exists():
+            return False
+        try:
+            venues = await asyncio.to_thread(self._read_snapshot, self._path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning(f"[instruments] Ignoring unreadable snapshot {self._path}: {exc}")
+            return False
+        for venue, (fetched_at, instruments) in venues.items():
+            self.replace(venue, instruments, fetched_at)
+        logger.info(f"[instruments] Loaded {len(self)} instruments from snapshot")
+        return True
+
+    async def save(self) -> None:
+        if self._path is None:
+            return
+        by_venue: Dict[str, List[list[object]]] = {venue: [] for venue in self._fetched_at}
+        for (venue, _symbol), item in self._instruments.items():
+            by_venue[venue].append(
+                [
+                    item.symbol,
+                    item.tradable,
+                    item.lot_size,
+                    item.min_qty,
+                    item.max_qty,
+                    item.tick_size,
+                    item.min_notional,
+                ]
+            )
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "venues": {
+                venue: {"fetched_at": self._fetched_at[venue], "instruments": rows}
+                for venue, rows in by_venue.items()
+            },
+        }
+        try:
+            await asyncio.to_thread(self._write_snapshot, self._path, snapshot)
+        except OSError as exc:
+            logger.error(f"[instruments] Could not write snapshot {self._path}: {exc}")
+
+    @staticmethod
+    def _read_snapshot(path: Path) -> Dict[str, Tuple[float, List[Instrument]]]:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("version") != _SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {data.get('version')}")
+        return {
+            venue: (
+                float(entry["fetched_at"]),
+                [Instrument(row[0], venue, *row[1:]) for row in entry["instruments"]],
+            )
+            for venue, entry in data["venues"].items()
+        }
+
+    @staticmethod
+    def _write_snapshot(path: Path, snapshot: Dict[str, object]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, separators=(",", ":"))
+        os.replace(tmp, path)
@@ -0,0 +1,102 @@
+"""Per-instrument serialized execution lanes for the trading engine."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable
+from typing import Any, Dict, Hashable, List, Tuple
+
+CANCEL_PRIORITY = 0
+ORDER_PRIORITY = 1
+
+LaneJob = Callable[[], Awaitable[Any]]
+
+
+class OrderLane:
+    """Runs jobs for one key strictly one at a time.
+
+    Jobs are ordered by (priority, arrival), so a queued cancel overtakes queued new orders
+    but never interrupts the job already in flight. The worker task only exists while the
+    lane has work, so thousands of idle instruments cost nothing.
+    """
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+        self._heap: List[Tuple[int, int, LaneJob, asyncio.Future[Any]]] = []
+        self._seq = itertools.count()
+        self._worker: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def busy(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def submit(self, job: LaneJob, priority: int = ORDER_PRIORITY) -> asyncio.Future[Any]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), job, future))
+        if not self.busy:
+            self._worker = loop.create_task(self._drain(), name=f"lane-{self.key}")
+        return future
+
+    async def _drain(self) -> None:
+        while self._heap:
+            _priority, _seq, job, future = heapq.heappop(self._heap)
+            if future.done():
+                continue
+            try:
+                result = await job()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as exc:  # noqa: BLE001 - handed to the caller's future
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        """Cancel queued jobs and the in-flight one."""
+
+        while self._heap:
+            _priority, _seq, _job, future = heapq.heappop(self._heap)
+            future.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+class LaneScheduler:
+    """Shards work into independent :class:`OrderLane` instances keyed by (venue, symbol)."""
+
+    def __init__(self) -> None:
+        self._lanes: Dict[Hashable, OrderLane] = {}
+
+    def lane(self, key: Hashable) -> OrderLane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = OrderLane(key)
+            self._lanes[key] = lane
+        return lane
+
+    def submit(self, key: Hashable, job: LaneJob, priority: int = ORDER_PRIORITY) -> asyncio.Future[Any]:
+        return self.lane(key).submit(job, priority)
+
+    def backlog(self) -> Dict[Hashable, int]:
+        """Queued (not yet started) jobs per lane, for diagnostics."""
+
+        return {key: len(lane) for key, lane in self._lanes.items() if len(lane)}
+
+    async def close(self) -> None:
+        for lane in list(self._lanes.values()):
+            await lane.close()
+        self._lanes.clear()
@@ -0,0 +1,180 @@
+"""Array-backed position and PnL ledger."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+_EPSILON = 1e-12
+
+
+@dataclass
+class Position:
+    symbol: str
+    quantity: float
+    average_price: float
+    realized_pnl: float = 0.0
+    unrealized_pnl: float = 0.0
+    last_price: float | None = None
+
+
+@dataclass
+class PortfolioTotals:
+    gross_exposure: float
+    net_exposure: float
+    realized_pnl: float
+    unrealized_pnl: float
+    fees: float
+
+    @property
+    def total_pnl(self) -> float:
+        return self.realized_pnl + self.unrealized_pnl
+
+
+class PositionLedger:
+    """Positions stored column-wise in NumPy arrays indexed by an instrument id table.
+
+    Fills and marks touch a single slot (O(1) per symbol); portfolio-wide exposure and PnL
+    are single vectorized reductions over the columns instead of loops over dataclasses.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        capacity = max(1, capacity)
+        self._quantity = np.zeros(capacity)
+        self._avg_price = np.zeros(capacity)
+        self._realized = np.zeros(capacity)
+        self._fees = np.zeros(capacity)
+        self._last_price = np.full(capacity, np.nan)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def instrument_id(self, symbol: str) -> int:
+        """Stable slot for ``symbol``, allocating (and growing the arrays) on first use."""
+
+        key = symbol.upper()
+        index = self._ids.get(key)
+        if index is None:
+            index = len(self._symbols)
+            if index == self._quantity.shape[0]:
+                self._grow(index * 2)
+            self._ids[key] = index
+            self._symbols.append(key)
+        return index
+
+    def apply_fill(self, symbol: str, side: str, quantity: float, price: float, fee: float = 0.0) -> None:
+        """Update quantity, average price and realized PnL for one execution."""
+
+        if quantity <= 0:
+            return
+        i = self.instrument_id(symbol)
+        signed = quantity if side.upper() == "BUY" else -quantity
+        held = self._quantity[i]
+        avg = self._avg_price[i]
+        new_qty = held + signed
+
+        if abs(held) <= _EPSILON or (held > 0) == (signed > 0):
+            self._avg_price[i] = (avg * abs(held) + price * abs(signed)) / abs(new_qty)
+        else:
+            closed = min(abs(signed), abs(held))
+            self._realized[i] += closed * (price - avg) * (1.0 if held > 0 else -1.0)
+            if abs(new_qty) <= _EPSILON:
+                new_qty = 0.0
+                self._avg_price[i] = 0.0
+            elif (new_qty > 0) != (held > 0):
+                self._avg_price[i] = price
+
+        self._quantity[i] = new_qty
+        self._realized[i] -= fee
+        self._fees[i] += fee
+        self._last_price[i] = price
+
+    def mark(self, symbol: str, price: float) -> None:
+        """Record the latest mark price for ``symbol``."""
+
+        index = self.instrument_id(symbol)  # may grow (and replace) the arrays
+        self._last_price[index] = price
+
+    def mark_many(self, symbols: Iterable[str], prices: Iterable[float]) -> None:
+        """Vectorized mark for a batch of quotes."""
+
+        index = np.fromiter((self.instrument_id(s) for s in symbols), dtype=np.intp)
+        self._last_price[index] = np.fromiter(prices, dtype=np.float64, count=index.shape[0])
+
+    def unrealized_pnl(self) -> np.ndarray:
+        """Per-instrument unrealized PnL (unmarked instruments contribute zero)."""
+
+        n = len(self._symbols)
+        pnl = (self._last_price[:n] - self._avg_price[:n]) * self._quantity[:n]
+        return np.nan_to_num(pnl, nan=0.0)
+
+    def exposures(self) -> np.ndarray:
+        """Signed mark-to-market notional per instrument, falling back to cost when unmarked."""
+
+        n = len(self._symbols)
+        marks = np.where(np.isnan(self._last_price[:n]), self._avg_price[:n], self._last_price[:n])
+        return self._quantity[:n] * marks
+
+    def totals(self) -> PortfolioTotals:
+        n = len(self._symbols)
+        exposures = self.exposures()
+        return PortfolioTotals(
+            gross_exposure=float(np.abs(exposures).sum()),
+            net_exposure=float(exposures.sum()),
+            realized_pnl=float(self._realized[:n].sum()),
+            unrealized_pnl=float(self.unrealized_pnl().sum()),
+            fees=float(self._fees[:n].sum()),
+        )
+
+    def quantity(self, symbol: str) -> float:
+        index = self._ids.get(symbol.upper())
+        return float(self._quantity[index]) if index is not None else 0.0
+
+    def last_price(self, symbol: str) -> float | None:
+        index = self._ids.get(symbol.upper())
+        if index is None:
+            return None
+        last = self._last_price[index]
+        return None if np.isnan(last) else float(last)
+
+    def position(self, symbol: str) -> Position | None:
+        index = self._ids.get(symbol.upper())
+        return self._position_at(index) if index is not None else None
+
+    def snapshot(self, include_flat: bool = False) -> Dict[str, Position]:
+        """Materialize positions as dataclasses (UI/API boundary only)."""
+
+        return {
+            symbol: self._position_at(i)
+            for i, symbol in enumerate(self._symbols)
+            if include_flat or abs(self._quantity[i]) > _EPSILON
+        }
+
+    def _position_at(self, i: int) -> Position:
+        last = self._last_price[i]
+        marked = not np.isnan(last)
+        return Position(
+            symbol=self._symbols[i],
+            quantity=float(self._quantity[i]),
+            average_price=float(self._avg_price[i]),
+            realized_pnl=float(self._realized[i]),
+            unrealized_pnl=float((last - self._avg_price[i]) * self._quantity[i]) if marked else 0.0,
+            last_price=float(last) if marked else None,
+        )
+
+    def _grow(self, capacity: int) -> None:
+        size = self._quantity.shape[0]
+        for name, fill_value in (
+            ("_quantity", 0.0),
+            ("_avg_price", 0.0),
+            ("_realized", 0.0),
+            ("_fees", 0.0),
+            ("_last_price", np.nan),
+        ):
+            grown = np.full(capacity, fill_value)
+            grown[:size] = getattr(self, name)
+            setattr(self, name, grown)
@@ -0,0 +1,106 @@
+"""Per-symbol signal netting ahead of order submission."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Dict
+
+from loguru import logger
+
+from basic_trading_software.common.config import NettingSettings
+
+_EPSILON = 1e-12
+
+NettedOrder = Callable[[str, str, float, Dict[str, object]], None]
+
+
+@dataclass
+class _Pending:
+    delta: float = 0.0
+    signals: int = 0
+    payload: Dict[str, object] = field(default_factory=dict)
+    timer: asyncio.TimerHandle | None = None
+
+
+class SignalNetter:
+    """Coalesces signals per symbol into one signed target-position delta.
+
+    The first signal for a symbol opens a window of ``window`` seconds; every signal inside it
+    adds ``+quantity`` (BUY) or ``-quantity`` (SELL) to the pending delta. When the window
+    closes, or as soon as ``|delta|`` reaches ``threshold``, only the net difference is handed
+    to ``emit`` -- a BUY/SELL burst that cancels out sends nothing. The latest signal's payload
+    (confidence, model, venue) rides along with the netted order.
+
+    A zero window disables netting: every signal is emitted immediately.
+    """
+
+    def __init__(self, emit: NettedOrder, window: float = 0.0, threshold: float = 0.0) -> None:
+        self._emit = emit
+        self._window = max(0.0, window)
+        self._threshold = max(0.0, threshold)
+        self._pending: Dict[str, _Pending] = {}
+
+    @classmethod
+    def from_settings(cls, emit: NettedOrder, settings: NettingSettings) -> "SignalNetter":
+        return cls(emit, window=settings.window_ms / 1000.0, threshold=settings.flush_threshold)
+
+    @property
+    def enabled(self) -> bool:
+        return self._window > 0
+
+    def pending_delta(self, symbol: str) -> float:
+        pending = self._pending.get(symbol.upper())
+        return pending.delta if pending else 0.0
+
+    def add(self, symbol: str, side: str, quantity: float, payload: Dict[str, object]) -> None:
+        symbol = symbol.upper()
+        side = side.upper()
+        if not self.enabled:
+            self._emit(symbol, side, quantity, payload)
+            return
+
+        pending = self._pending.get(symbol)
+        if pending is None:
+            pending = _Pending()
+            self._pending[symbol] = pending
+            pending.timer = asyncio.get_running_loop().call_later(self._window, self.flush, symbol)
+        pending.delta += quantity if side == "BUY" else -quantity
+        pending.signals += 1
+        pending.payload = payload
+
+        if self._threshold and abs(pending.delta) >= self._threshold:
+            self.flush(symbol)
+
+    def flush(self, symbol: str) -> None:
+        pending = self._pending.pop(symbol, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        if abs(pending.delta) <= _EPSILON:
+            logger.debug("[netting] {} signals for {} netted to zero", pending.signals, symbol)
+            return
+        side = "BUY" if pending.delta > 0 else "SELL"
+        if pending.signals > 1:
+            logger.debug(
+                "[netting] {} signals for {} -> {} {}",
+                pending.signals,
+                symbol,
+                side,
+                abs(pending.delta),
+            )
+        self._emit(symbol, side, abs(pending.delta), pending.payload)
+
+    def flush_all(self) -> None:
+        for symbol in list(self._pending):
+            self.flush(symbol)
+
+    def discard(self) -> None:
+        """Drop every open window without emitting."""
+
+        for pending in self._pending.values():
+            if pending.timer is not None:
+                pending.timer.cancel()
+        self._pending.clear()
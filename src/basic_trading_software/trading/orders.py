@@ -0,0 +1,402 @@
+"""Persistent order store with an indexed order state machine."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from loguru import logger
+
+from basic_trading_software.common.config import OrderStoreSettings
+from basic_trading_software.trading.adapters.base import OrderRequest
+
+NEW = "new"
+ACKED = "acked"
+PARTIALLY_FILLED = "partially_filled"
+FILLED = "filled"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+
+TERMINAL_STATES = frozenset({FILLED, CANCELLED, REJECTED})
+
+_TRANSITIONS: Dict[str, frozenset[str]] = {
+    # A fill implies the venue accepted the order, so fills may arrive before the ack.
+    NEW: frozenset({ACKED, PARTIALLY_FILLED, FILLED, CANCELLED, REJECTED}),
+    ACKED: frozenset({PARTIALLY_FILLED, FILLED, CANCELLED, REJECTED}),
+    PARTIALLY_FILLED: frozenset({PARTIALLY_FILLED, FILLED, CANCELLED}),
+    FILLED: frozenset(),
+    CANCELLED: frozenset(),
+    REJECTED: frozenset(),
+}
+
+_EPSILON = 1e-12
+
+
+class OrderStateError(ValueError):
+    """Raised for an unknown order or a transition the state machine does not allow."""
+
+
+@dataclass
+class OrderRecord:
+    client_order_id: str
+    symbol: str
+    side: str
+    quantity: float
+    venue: str
+    order_type: str = "MARKET"
+    limit_price: float | None = None
+    stop_price: float | None = None
+    order_id: str | None = None
+    status: str = NEW
+    filled_qty: float = 0.0
+    avg_price: float | None = None
+    reason: str | None = None
+    trace_id: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in TERMINAL_STATES
+
+    @property
+    def remaining(self) -> float:
+        return max(self.quantity - self.filled_qty, 0.0)
+
+
+class OrderStore:
+    """Tracks every order through ``new -> acked -> partially_filled -> filled/cancelled/rejected``.
+
+    Records are indexed by client id, venue order id, symbol and status so cancel routing and
+    reconciliation lookups are dictionary hits. Each transition appends the full record as one
+    JSON line to a write-ahead log; appends are buffered and written by a single writer task
+    (group commit), so a burst of transitions costs one write and one fsync. On start the log
+    is replayed (last record per client id wins) and compacted down to the open orders, which
+    keeps recovery proportional to open orders rather than to history.
+
+    With ``path=None`` the store is purely in-memory (backtests, replay).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        commit_interval: float = 0.002,
+        fsync: bool = True,
+        max_closed_orders: int = 10_000,
+    ) -> None:
+        self._path = path
+        self._commit_interval = commit_interval
+        self._fsync = fsync
+        self._max_closed = max(0, max_closed_orders)
+
+        self._orders: Dict[str, OrderRecord] = {}
+        self._by_order_id: Dict[str, str] = {}
+        self._by_symbol: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._closed: OrderedDict[str, None] = OrderedDict()
+
+        self._pending: List[str] = []
+        self._wakeup: asyncio.Event | None = None
+        self._writer: asyncio.Task[None] | None = None
+        self._closing = False
+        self._file = None
+
+    @classmethod
+    def from_settings(cls, settings: OrderStoreSettings) -> "OrderStore":
+        return cls(
+            path=settings.wal_path,
+            commit_interval=settings.commit_interval_ms / 1000.0,
+            fsync=settings.fsync,
+            max_closed_orders=settings.max_closed_orders,
+        )
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def open(self) -> None:
+        """Recover state from the log and start the group-commit writer."""
+
+        if self._path is None or self._writer is not None:
+            return
+        started = time.perf_counter()
+        recovered = await asyncio.to_thread(self._recover)
+        for record in recovered:
+            self._index(record)
+        self._file = await asyncio.to_thread(open, self._path, "a", encoding="utf-8")
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop(), name="order-store-wal")
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"[orders] Recovered {len(recovered)} open orders from {self._path} in {elapsed:.1f}ms")
+
+    async def flush(self) -> None:
+        """Write and sync everything logged so far."""
+
+        if self._pending and self._file is not None:
+            batch, self._pending = self._pending, []
+            await asyncio.to_thread(self._write_batch, batch)
+
+    async def close(self) -> None:
+        """Stop the writer once it has committed everything logged, then close the log."""
+
+        if self._writer is not None:
+            assert self._wakeup is not None
+            # Cancelling would not stop a write already running in its worker thread, so ask
+            # the writer to finish its batch and exit instead.
+            self._closing = True
+            self._wakeup.set()
+            await self._writer
+            self._writer = None
+        await self.flush()
+        if self._file is not None:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+    # ------------------------------------------------------------------ transitions
+
+    def create(self, request: OrderRequest, venue: str, trace_id: str | None = None) -> OrderRecord:
+        """Register a new order, assigning ``request.client_order_id`` if it has none."""
+
+        if not request.client_order_id:
+            request.client_order_id = uuid.uuid4().hex
+        elif request.client_order_id in self._orders:
+            raise OrderStateError(f"Duplicate client order id '{request.client_order_id}'")
+        now = time.time()
+        record = OrderRecord(
+            client_order_id=request.client_order_id,
+            symbol=request.symbol.upper(),
+            side=request.side.upper(),
+            quantity=float(request.quantity),
+            venue=venue.lower(),
+            order_type=request.order_type.upper(),
+            limit_price=request.limit_price,
+            stop_price=request.stop_price,
+            trace_id=trace_id,
+            created_at=now,
+            updated_at=now,
+        )
+        self._index(record)
+        self._log(record)
+        return record
+
+    def amend(self, request: OrderRequest, venue: str) -> OrderRecord:
+        """Bring a ``new`` order in line with what is actually sent: ``request`` as rounded
+        to the venue's rules, on the venue it is sent to (which changes on failover)."""
+
+        record = self._require(request.client_order_id or "")
+        terms = (venue.lower(), float(request.quantity), request.limit_price, request.stop_price)
+        if terms == (record.venue, record.quantity, record.limit_price, record.stop_price):
+            return record
+        if record.status != NEW:
+            raise OrderStateError(
+                f"Order {record.client_order_id} is {record.status}; only new orders can be amended"
+            )
+        record.venue, record.quantity, record.limit_price, record.stop_price = terms
+        record.updated_at = time.time()
+        self._log(record)
+        return record
+
+    def acknowledge(self, client_order_id: str, order_id: str, venue: str | None = None) -> OrderRecord:
+        """Attach the venue order id; only a ``new`` order moves to ``acked``."""
+
+        record = self._require(client_order_id)
+        if venue:
+            record.venue = venue.lower()
+        if order_id and record.order_id != order_id:
+            if record.order_id:
+                self._by_order_id.pop(record.order_id, None)
+            record.order_id = order_id
+            self._by_order_id[order_id] = record.client_order_id
+        if record.status == NEW:
+            self._set_status(record, ACKED)
+        record.updated_at = time.time()
+        self._log(record)
+        return record
+
+    def apply_fill(
+        self,
+        quantity: float,
+        price: float,
+        client_order_id: str | None = None,
+        order_id: str | None = None,
+    ) -> OrderRecord:
+        record = self._lookup(client_order_id, order_id)
+        if record is None:
+            raise OrderStateError(f"Unknown order (client={client_order_id}, venue={order_id})")
+        filled = record.filled_qty + quantity
+        status = FILLED if filled >= record.quantity - _EPSILON else PARTIALLY_FILLED
+        self._check(record, status)
+        record.avg_price = (
+            price
+            if not record.avg_price or record.filled_qty <= 0
+            else (record.avg_price * record.filled_qty + price * quantity) / filled
+        )
+        record.filled_qty = filled
+        if order_id and not record.order_id:
+            record.order_id = order_id
+            self._by_order_id[order_id] = record.client_order_id
+        return self._transition(record, status)
+
+    def cancel(self, client_order_id: str | None = None, order_id: str | None = None) -> OrderRecord:
+        record = self._lookup(client_order_id, order_id)
+        if record is None:
+            raise OrderStateError(f"Unknown order (client={client_order_id}, venue={order_id})")
+        return self._transition(record, CANCELLED)
+
+    def reject(self, client_order_id: str, reason: str | None = None) -> OrderRecord:
+        record = self._require(client_order_id)
+        record.reason = reason
+        return self._transition(record, REJECTED)
+
+    # ------------------------------------------------------------------ lookups
+
+    def get(self, client_order_id: str) -> OrderRecord | None:
+        return self._orders.get(client_order_id)
+
+    def by_order_id(self, order_id: str) -> OrderRecord | None:
+        client_id = self._by_order_id.get(order_id)
+        return self._orders.get(client_id) if client_id is not None else None
+
+    def by_symbol(self, symbol: str) -> List[OrderRecord]:
+        return [self._orders[c] for c in self._by_symbol.get(symbol.upper(), ())]
+
+    def by_status(self, *statuses: str) -> List[OrderRecord]:
+        return [self._orders[c] for status in statuses for c in self._by_status.get(status, ())]
+
+    def open_orders(self, symbol: str | None = None) -> List[OrderRecord]:
+        if symbol is not None:
+            return [record for record in self.by_symbol(symbol) if record.is_open]
+        return self.by_status(NEW, ACKED, PARTIALLY_FILLED)
+
+    def count_by_status(self) -> Dict[str, int]:
+        return {status: len(ids) for status, ids in self._by_status.items() if ids}
+
+    # ------------------------------------------------------------------ internals
+
+    def _lookup(self, client_order_id: str | None, order_id: str | None) -> OrderRecord | None:
+        if client_order_id:
+            record = self._orders.get(client_order_id)
+            if record is not None:
+                return record
+        return self.by_order_id(order_id) if order_id else None
+
+    def _require(self, client_order_id: str) -> OrderRecord:
+        record = self._orders.get(client_order_id)
+        if record is None:
+            raise OrderStateError(f"Unknown client order id '{client_order_id}'")
+        return record
+
+    @staticmethod
+    def _check(record: OrderRecord, status: str) -> None:
+        if status not in _TRANSITIONS[record.status]:
+            raise OrderStateError(
+                f"Order {record.client_order_id} cannot move from {record.status} to {status}"
+            )
+
+    def _transition(self, record: OrderRecord, status: str) -> OrderRecord:
+        self._check(record, status)
+        self._set_status(record, status)
+        record.updated_at = time.time()
+        self._log(record)
+        if status in TERMINAL_STATES:
+            self._retire(record.client_order_id)
+        return record
+
+    def _set_status(self, record: OrderRecord, status: str) -> None:
+        if status == record.status:
+            return
+        self._by_status.get(record.status, set()).discard(record.client_order_id)
+        self._by_status.setdefault(status, set()).add(record.client_order_id)
+        record.status = status
+
+    def _index(self, record: OrderRecord) -> None:
+        client_id = record.client_order_id
+        self._orders[client_id] = record
+        if record.order_id:
+            self._by_order_id[record.order_id] = client_id
+        self._by_symbol.setdefault(record.symbol, set()).add(client_id)
+        self._by_status.setdefault(record.status, set()).add(client_id)
+
+    def _retire(self, client_order_id: str) -> None:
+        """Keep a bounded window of closed orders for late lookups, evicting the oldest."""
+
+        self._closed[client_order_id] = None
+        while len(self._closed) > self._max_closed:
+            evicted, _ = self._closed.popitem(last=False)
+            record = self._orders.pop(evicted, None)
+            if record is None:
+                continue
+            if record.order_id:
+                self._by_order_id.pop(record.order_id, None)
+            self._by_symbol.get(record.symbol, set()).discard(evicted)
+            self._by_status.get(record.status, set()).discard(evicted)
+
+    def _log(self, record: OrderRecord) -> None:
+        if self._wakeup is None:
+            return
+        self._pending.append(json.dumps(vars(record), separators=(",", ":")))
+        self._wakeup.set()
+
+    async def _write_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            if not self._closing:
+                # Let the rest of the burst accumulate so it lands in one write + fsync.
+                await asyncio.sleep(self._commit_interval)
+            self._wakeup.clear()
+            if self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except OSError as exc:
+                    logger.error(f"[orders] WAL write failed ({len(batch)} records): {exc}")
+                    self._pending = batch + self._pending
+            if self._closing:
+                return
+
+    def _write_batch(self, lines: Iterable[str]) -> None:
+        assert self._file is not None
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    def _recover(self) -> List[OrderRecord]:
+        """Replay the log, then atomically rewrite it with only the open orders."""
+
+        assert self._path is not None
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        latest: Dict[str, Tuple[str, dict]] = {}
+        lines = 0
+        if self._path.exists():
+            with open(self._path, encoding="utf-8") as handle:
+                for lines, line in enumerate(handle, 1):
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final write from a crash; everything before it is intact.
+                        logger.warning(f"[orders] Skipping unreadable WAL line {lines}")
+                        continue
+                    latest[data["client_order_id"]] = (line.rstrip("\n"), data)
+
+        live = [(line, data) for line, data in latest.values() if data.get("status") not in TERMINAL_STATES]
+        if len(live) != lines:
+            # Reuse the original lines so compaction costs no re-encoding.
+            tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as handle:
+                handle.writelines(line + "\n" for line, _data in live)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp, self._path)
+        return [OrderRecord(**data) for _line, data in live]
+
@@ -0,0 +1,244 @@
+"""Low-latency pre-trade risk checks."""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Tuple
+
+from loguru import logger
+
+from basic_trading_software.common.config import RiskSettings
+from basic_trading_software.trading.ledger import PositionLedger
+
+WILDCARD = "*"
+
+# Resolved per-instrument limits: (max order notional, max |position|, price band fraction).
+InstrumentLimits = Tuple[float, float, float]
+
+
+@dataclass
+class RiskLimits:
+    """Editable limit definition; compiled into flat lookup tables before use."""
+
+    max_order_notional: float = 50_000.0
+    max_position: float = 1_000.0
+    orders_per_second: float = 10.0
+    order_burst: int = 20
+    price_band_pct: float = 0.05
+    max_daily_loss: float = 5_000.0
+    day_reset_utc_hour: float = 0.0
+    require_reference_price: bool = False
+    # ``{"binance:BTCUSDT": {"max_position": 2}, "alpaca:*": {"orders_per_second": 3}}``
+    overrides: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_settings(cls, settings: RiskSettings) -> "RiskLimits":
+        return cls(
+            max_order_notional=settings.max_order_notional,
+            max_position=settings.max_position,
+            orders_per_second=settings.orders_per_second,
+            order_burst=settings.order_burst,
+            price_band_pct=settings.price_band_pct,
+            max_daily_loss=settings.max_daily_loss,
+            day_reset_utc_hour=settings.day_reset_utc_hour,
+            require_reference_price=settings.require_reference_price,
+            overrides={key: dict(value) for key, value in settings.overrides.items()},
+        )
+
+
+class TokenBucket:
+    """Classic token bucket refilled lazily on each ``take``."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float, amount: float = 1.0) -> bool:
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if tokens < amount:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - amount
+        return True
+
+
+class CompiledLimits:
+    """Immutable lookup tables built from :class:`RiskLimits`.
+
+    Override resolution (venue:symbol, then venue:*, then *:symbol, then defaults) happens
+    once per instrument and is memoized, so a check is a single dict hit.
+    """
+
+    __slots__ = (
+        "default",
+        "table",
+        "rates",
+        "max_daily_loss",
+        "day_offset",
+        "require_reference_price",
+        "_resolved",
+    )
+
+    def __init__(self, limits: RiskLimits) -> None:
+        self.default: InstrumentLimits = (
+            limits.max_order_notional,
+            limits.max_position,
+            limits.price_band_pct,
+        )
+        self.table: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.rates: Dict[str, Tuple[float, float]] = {}
+        for key, values in limits.overrides.items():
+            venue, _, symbol = key.partition(":")
+            venue = venue.lower() or WILDCARD
+            symbol = symbol.upper() or WILDCARD
+            self.table[(venue, symbol)] = dict(values)
+            if symbol == WILDCARD and ("orders_per_second" in values or "order_burst" in values):
+                self.rates[venue] = (
+                    float(values.get("orders_per_second", limits.orders_per_second)),
+                    float(values.get("order_burst", limits.order_burst)),
+                )
+        self.rates.setdefault(WILDCARD, (limits.orders_per_second, float(limits.order_burst)))
+        self.max_daily_loss = limits.max_daily_loss
+        self.day_offset = limits.day_reset_utc_hour * 3_600.0
+        self.require_reference_price = limits.require_reference_price
+        self._resolved: Dict[Tuple[str, str], InstrumentLimits] = {}
+
+    def for_instrument(self, venue: str, symbol: str) -> InstrumentLimits:
+        key = (venue, symbol)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            notional, position, band = self.default
+            for scope in ((WILDCARD, symbol), (venue, WILDCARD), (venue, symbol)):
+                values = self.table.get(scope)
+                if values:
+                    notional = values.get("max_order_notional", notional)
+                    position = values.get("max_position", position)
+                    band = values.get("price_band_pct", band)
+            resolved = (notional, position, band)
+            self._resolved[key] = resolved
+        return resolved
+
+    def rate_for(self, venue: str) -> Tuple[float, float]:
+        return self.rates.get(venue) or self.rates[WILDCARD]
+
+
+class RiskEngine:
+    """Pre-trade gate run on every order before it reaches an adapter.
+
+    ``check`` returns ``None`` to approve or a short rejection reason. Limits are swapped in
+    as a whole by :meth:`reload`, so a hot reload never pauses or half-applies. The daily
+    loss baseline rolls over by itself at ``day_reset_utc_hour`` (checked on the PnL refresh
+    cadence, so a breach blocks trading until the next trading day, not forever).
+    """
+
+    def __init__(
+        self,
+        ledger: PositionLedger,
+        limits: RiskLimits | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        pnl_refresh_seconds: float = 0.25,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ledger = ledger
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._compiled = CompiledLimits(limits or RiskLimits())
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._pnl_refresh = pnl_refresh_seconds
+        self._pnl_checked_at = -math.inf
+        self._day_start_pnl = 0.0
+        self._loss_breached = False
+        self._day = self._trading_day()
+
+    def reload(self, limits: RiskLimits) -> None:
+        """Compile ``limits`` off to the side, then swap them in atomically."""
+
+        compiled = CompiledLimits(limits)
+        for venue, bucket in self._buckets.items():
+            # Keep accumulated bucket state; only the refill rate and burst size change.
+            bucket.rate, bucket.capacity = compiled.rate_for(venue)
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+        self._compiled = compiled
+        self._loss_breached = False
+        self._pnl_checked_at = -math.inf
+        # A moved reset hour only changes when the next rollover happens.
+        self._day = self._trading_day()
+        logger.info(f"[risk] Reloaded limits ({len(compiled.table)} overrides)")
+
+    def reset_day(self) -> None:
+        """Start a new trading day: current PnL becomes the daily-loss baseline."""
+
+        self._day_start_pnl = self._ledger.totals().total_pnl
+        self._loss_breached = False
+        self._pnl_checked_at = -math.inf
+        self._day = self._trading_day()
+
+    def check(
+        self,
+        venue: str,
+        symbol: str,
+        side: str,
+        quantity: float,
+        limit_price: float | None = None,
+    ) -> str | None:
+        compiled = self._compiled
+        venue = venue.lower()
+        symbol = symbol.upper()
+        now = self._clock()
+
+        if self._daily_loss_breached(now):
+            return "daily loss limit reached"
+
+        max_notional, max_position, band = compiled.for_instrument(venue, symbol)
+        reference = self._ledger.last_price(symbol)
+        if reference is None and compiled.require_reference_price:
+            return "no reference price"
+        if limit_price is not None and reference is not None and band > 0:
+            if abs(limit_price - reference) > band * reference:
+                return f"price {limit_price} outside {band:.1%} band around {reference}"
+
+        price = limit_price if limit_price is not None else reference
+        if price is not None and quantity * price > max_notional:
+            return f"notional {quantity * price:.2f} exceeds {max_notional:.2f}"
+
+        held = self._ledger.quantity(symbol)
+        projected = held + quantity if side.upper() == "BUY" else held - quantity
+        if abs(projected) > max_position and abs(projected) > abs(held):
+            return f"position {projected} exceeds {max_position}"
+
+        bucket = self._buckets.get(venue)
+        if bucket is None:
+            rate, burst = compiled.rate_for(venue)
+            bucket = TokenBucket(rate, burst, now)
+            self._buckets[venue] = bucket
+        if not bucket.take(now):
+            return "order rate limit"
+        return None
+
+    def _trading_day(self) -> int:
+        return int((self._wall_clock() - self._compiled.day_offset) // 86_400)
+
+    def _daily_loss_breached(self, now: float) -> bool:
+        # Portfolio PnL is a vectorized reduction; refresh it (and the trading day) on a short
+        # cadence rather than on every order so the check stays in the microsecond range.
+        if now - self._pnl_checked_at < self._pnl_refresh:
+            return self._loss_breached
+        day = self._trading_day()
+        if day != self._day:
+            self.reset_day()
+            logger.info("[risk] New trading day; daily loss baseline reset")
+        self._pnl_checked_at = now
+        if not self._loss_breached:
+            max_daily_loss = self._compiled.max_daily_loss
+            pnl = self._ledger.totals().total_pnl - self._day_start_pnl
+            if pnl <= -max_daily_loss:
+                self._loss_breached = True
+                logger.error(f"[risk] Daily loss {pnl:.2f} breached limit {max_daily_loss:.2f}")
+        return self._loss_breached
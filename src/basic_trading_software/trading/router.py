@@ -0,0 +1,165 @@
+"""Indexed smart order routing across venues."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.trading.adapters.base import BrokerAdapter
+from basic_trading_software.trading.instruments import InstrumentCache
+
+
+class SmartOrderRouter:
+    """Routes orders with a precomputed instrument -> venue index and live top of book.
+
+    The index is built from each adapter's ``fetch_symbols`` metadata (or, given an
+    ``InstrumentCache``, from its cached instrument rules), so a BTC order never visits an
+    equity broker first. When several venues list an instrument the one with the best live
+    price for the order's side wins (tighter spread breaks ties). Placed orders are remembered
+    so cancels go straight to the owning venue. With a cache the engine also rounds and
+    validates orders against the venue's lot/tick sizes and minimums before sending them.
+    """
+
+    def __init__(
+        self, adapters: Sequence[BrokerAdapter], instruments: InstrumentCache | None = None
+    ) -> None:
+        self._adapters: Dict[str, BrokerAdapter] = {a.venue.lower(): a for a in adapters}
+        self.instruments = instruments
+        self._refresher: asyncio.Task[None] | None = None
+        self._event_bus: EventBus | None = None
+        self._order: Tuple[str, ...] = tuple(self._adapters)
+        self._index: Dict[str, Tuple[str, ...]] = {}
+        self._books: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._order_venues: Dict[str, Tuple[str, str]] = {}
+
+    async def start(self, event_bus: EventBus | None = None) -> None:
+        """Build the symbol index and optionally follow ``market.quote`` for top of book."""
+
+        instruments = self.instruments
+        if instruments is None:
+            await self.refresh_index()
+        else:
+            # Start from the snapshot; only venues it lacks hold up startup, stale ones are
+            # refreshed in the background.
+            await instruments.load()
+            known = set(instruments.venues())
+            missing = [a for v, a in self._adapters.items() if v not in known]
+            await instruments.refresh(missing)
+            self._index_instruments()
+            self._refresher = asyncio.create_task(self._refresh_instruments())
+        if event_bus is not None:
+            await event_bus.subscribe("market.quote", self._on_quote)
+            self._event_bus = event_bus
+
+    async def stop(self) -> None:
+        if self._event_bus is not None:
+            await self._event_bus.unsubscribe("market.quote", self._on_quote)
+            self._event_bus = None
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+
+    async def refresh_index(self) -> None:
+        if self.instruments is not None:
+            await self.instruments.refresh(list(self._adapters.values()), force=True)
+            self._index_instruments()
+            return
+        index: Dict[str, List[str]] = {}
+        for venue, adapter in self._adapters.items():
+            try:
+                symbols = await adapter.fetch_symbols()
+            except Exception as exc:  # noqa: BLE001 - route without this venue's metadata
+                logger.warning(f"[router] Symbol metadata unavailable for {venue}: {exc}")
+                continue
+            for symbol in symbols:
+                index.setdefault(symbol.upper(), []).append(venue)
+        self._set_index(index)
+
+    def _index_instruments(self) -> None:
+        assert self.instruments is not None
+        index: Dict[str, List[str]] = {}
+        for venue in self._adapters:
+            for symbol in self.instruments.symbols(venue):
+                index.setdefault(symbol, []).append(venue)
+        self._set_index(index)
+
+    def _set_index(self, index: Dict[str, List[str]]) -> None:
+        self._index = {symbol: tuple(venues) for symbol, venues in index.items()}
+        logger.info(f"[router] Indexed {len(self._index)} instruments across {len(self._adapters)} venues")
+
+    async def _refresh_instruments(self) -> None:
+        adapters = list(self._adapters.values())
+        assert self.instruments is not None
+        if await self.instruments.refresh(adapters):
+            self._index_instruments()
+        await self.instruments.run_refresher(adapters, self._index_instruments)
+
+    def register(self, venue: str, symbols: Iterable[str]) -> None:
+        """Add instruments to the index without asking the venue (tests, replay, overrides)."""
+
+        venue = venue.lower()
+        for symbol in symbols:
+            venues = self._index.get(symbol.upper(), ())
+            if venue not in venues:
+                self._index[symbol.upper()] = venues + (venue,)
+
+    def venues_for(self, symbol: str) -> Tuple[str, ...]:
+        """Venues listing ``symbol``; unknown instruments fall back to every venue in order."""
+
+        return self._index.get(symbol.upper(), self._order)
+
+    def route(self, symbol: str, side: str, venue_hint: Optional[str] = None) -> List[BrokerAdapter]:
+        """Candidate adapters for an order, best first."""
+
+        if venue_hint:
+            adapter = self._adapters.get(venue_hint.lower())
+            if adapter is not None:
+                return [adapter]
+
+        venues = self.venues_for(symbol)
+        if len(venues) > 1:
+            venues = tuple(sorted(venues, key=lambda v: self._score(v, symbol.upper(), side.upper())))
+        return [self._adapters[v] for v in venues]
+
+    def update_quote(self, venue: str, symbol: str, bid: float, ask: float) -> None:
+        self._books[(venue.lower(), symbol.upper())] = (bid, ask)
+
+    def record_order(self, order_id: str, venue: str, symbol: str) -> None:
+        """Remember where ``order_id`` lives until ``forget_order`` (the engine forgets
+        orders once they are filled, cancelled or rejected)."""
+
+        self._order_venues[order_id] = (venue.lower(), symbol.upper())
+
+    def route_for_order(self, order_id: str) -> Tuple[str, str] | None:
+        """(venue, symbol) that accepted ``order_id``, if this router placed it."""
+
+        return self._order_venues.get(order_id)
+
+    def adapter_for_order(self, order_id: str) -> BrokerAdapter | None:
+        route = self._order_venues.get(order_id)
+        return self._adapters.get(route[0]) if route else None
+
+    def forget_order(self, order_id: str) -> None:
+        self._order_venues.pop(order_id, None)
+
+    async def _on_quote(self, payload: Dict[str, object]) -> None:
+        venue = payload.get("venue")
+        bid = payload.get("bid")
+        ask = payload.get("ask")
+        if not venue or bid is None or ask is None:
+            return
+        self.update_quote(str(venue), str(payload.get("symbol")), float(bid), float(ask))  # type: ignore[arg-type]
+
+    def _score(self, venue: str, symbol: str, side: str) -> Tuple[float, float]:
+        book = self._books.get((venue, symbol))
+        if book is None:
+            # No live quote: keep index order behind venues we can actually price.
+            return (math.inf, math.inf)
+        bid, ask = book
+        price = ask if side == "BUY" else -bid
+        return (price, ask - bid)
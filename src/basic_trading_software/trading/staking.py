@@ -3,109 +3,282 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import aiohttp
 from loguru import logger
 
-from basic_trading_software.common.config import get_settings
+from basic_trading_software.common.config import StakingSettings, get_settings
 from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.http import HttpTransport, get_transport
+from basic_trading_software.trading.staking_book import StakingBook
 
 
 @dataclass
 class StakingPosition:
     asset: str
     amount: float
-    apr: float
+    apr: float  # percent, as the provider quotes it
     provider: str
     status: str = "staked"
+    rewards: float = 0.0
+    unbonding: float = 0.0
+    release_at: float | None = None
+
+
+class AprCache:
+    """Per-asset APR cache with stale-while-revalidate and single-flight fetches.
+
+    A cached rate is returned immediately even once it is older than ``ttl``; the expired
+    entry just triggers a background refetch. Only an asset seen for the first time waits
+    on the provider, and concurrent lookups for it share one in-flight request. Every asset
+    looked up (or passed to ``track``) is refreshed by ``refresh_all``.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[float]],
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self._ttl = ttl
+        self._clock = clock
+        self._values: Dict[str, Tuple[float, float]] = {}
+        self._inflight: Dict[str, asyncio.Task[Optional[float]]] = {}
+        self._tracked: Dict[str, None] = {}
+
+    def track(self, assets: Iterable[str]) -> None:
+        for asset in assets:
+            self._tracked.setdefault(asset.lower(), None)
+
+    @property
+    def tracked(self) -> List[str]:
+        return list(self._tracked)
+
+    def peek(self, asset: str) -> Optional[float]:
+        entry = self._values.get(asset.lower())
+        return entry[0] if entry is not None else None
+
+    async def get(self, asset: str) -> float:
+        """Current APR for ``asset``; 0.0 when it has never been fetched successfully."""
+
+        key = asset.lower()
+        self._tracked.setdefault(key, None)
+        entry = self._values.get(key)
+        if entry is not None:
+            if self._clock() - entry[1] >= self._ttl:
+                self._load(key)
+            return entry[0]
+        # Shielded so one cancelled caller does not cancel the fetch others are waiting on.
+        apr = await asyncio.shield(self._load(key))
+        return apr if apr is not None else 0.0
+
+    async def refresh_all(self) -> Dict[str, float]:
+        """Refetch every tracked asset concurrently (joining fetches already in flight)."""
+
+        keys = list(self._tracked)
+        await asyncio.gather(*(self._load(key) for key in keys))
+        return {key: self._values[key][0] for key in keys if key in self._values}
+
+    async def run_refresher(self, interval: float) -> None:
+        while True:
+            await self.refresh_all()
+            await asyncio.sleep(interval)
+
+    def _load(self, key: str) -> asyncio.Task[Optional[float]]:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_into(key), name=f"apr-{key}")
+            self._inflight[key] = task
+            task.add_done_callback(lambda _task: self._inflight.pop(key, None))
+        return task
+
+    async def _fetch_into(self, key: str) -> Optional[float]:
+        try:
+            apr = await self._fetch(key)
+        except Exception as exc:  # noqa: BLE001 - serve the last good rate
+            # Keep serving the last good rate; the next lookup or refresh tries again.
+            logger.warning(f"[staking] APR fetch for {key} failed: {exc}")
+            return self.peek(key)
+        self._values[key] = (apr, self._clock())
+        return apr
 
 
 class StakingService:
     """Handles staking/unstaking workflow for supported providers."""
 
-    def __init__(self, event_bus: EventBus) -> None:
+    def __init__(
+        self,
+        event_bus: EventBus,
+        transport: HttpTransport | None = None,
+        settings: StakingSettings | None = None,
+    ) -> None:
         self._event_bus = event_bus
-        settings = get_settings().staking
+        settings = settings or get_settings().staking
         self._provider = settings.provider
         self._base_url = settings.api_base_url.rstrip("/")
         self._cooldown_days = settings.cooldown_days
         self._auto_compound = settings.auto_compound
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._lock = asyncio.Lock()
+        self._transport = transport or get_transport()
+        self._apr_timeout = aiohttp.ClientTimeout(total=settings.apr_timeout_seconds)
+        self._aprs = AprCache(self._fetch_current_apr, ttl=settings.apr_ttl_seconds)
+        self._aprs.track(settings.tracked_assets)
+        self._refresh_interval = settings.apr_refresh_interval_seconds
+        self._refresher: asyncio.Task[None] | None = None
+        self._book = StakingBook(settings.cooldown_days * 86_400.0, settings.auto_compound)
+        self._book_path = settings.book_path
+        self._accrual_interval = settings.accrual_interval_seconds
+        self._accruer: asyncio.Task[None] | None = None
+        # One lock per asset: requests for the same asset stay ordered, different assets
+        # proceed in parallel.
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def aprs(self) -> AprCache:
+        return self._aprs
+
+    @property
+    def book(self) -> StakingBook:
+        return self._book
 
     async def start(self) -> None:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        try:
+            if await asyncio.to_thread(self._book.load, self._book_path):
+                self._aprs.track(self._book.assets)
+                logger.info(f"[staking] Restored {len(self._book)} staking positions")
+        except (OSError, ValueError, KeyError) as exc:
+            logger.error(f"[staking] Could not restore staking book {self._book_path}: {exc}")
         await self._event_bus.subscribe("staking.requested", self._handle_staking_request)
         await self._event_bus.subscribe("staking.unstake_requested", self._handle_unstake_request)
+        if self._refresh_interval > 0 and self._refresher is None:
+            # Also warms the cache for configured assets before the first request arrives.
+            self._refresher = asyncio.create_task(
+                self._aprs.run_refresher(self._refresh_interval), name="staking-apr-refresh"
+            )
+        if self._accrual_interval > 0 and self._accruer is None:
+            self._accruer = asyncio.create_task(self._run_accrual(), name="staking-accrual")
         logger.info(f"[staking] Service ready for provider {self._provider}")
 
     async def stop(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
+        await self._event_bus.unsubscribe("staking.requested", self._handle_staking_request)
+        await self._event_bus.unsubscribe("staking.unstake_requested", self._handle_unstake_request)
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+        if self._accruer is not None:
+            self._accruer.cancel()
+            await asyncio.gather(self._accruer, return_exceptions=True)
+            self._accruer = None
+        await self._accrue()
+
+    def _lock_for(self, asset: str) -> asyncio.Lock:
+        key = asset.upper()
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _run_accrual(self) -> None:
+        while True:
+            await asyncio.sleep(self._accrual_interval)
+            await self._accrue()
+
+    async def _accrue(self) -> None:
+        """Revalue the whole book at current APRs, publish releases and persist it."""
+
+        book = self._book
+        book.set_aprs(
+            {asset: apr for asset in book.assets if (apr := self._aprs.peek(asset)) is not None}
+        )
+        released = book.accrue(time.time())
+        for asset, amount in released.items():
+            logger.info(f"[staking] Released {amount} {asset} from unbonding")
+            await self._publish(self._position(asset, status="released"))
+        if len(book):
+            # Snapshot on the loop: stake/unstake handlers mutate the arrays between awaits.
+            snapshot = book.to_dict()
+            try:
+                await asyncio.to_thread(StakingBook.write, self._book_path, snapshot)
+            except OSError as exc:
+                logger.error(f"[staking] Could not persist staking book: {exc}")
+
+    def _position(self, asset: str, status: str = "staked") -> StakingPosition:
+        entry = self._book.position(asset) or {}
+        return StakingPosition(
+            asset=asset.upper(),
+            amount=entry.get("staked") or 0.0,
+            apr=(entry.get("apr") or 0.0) * 100.0,
+            provider=self._provider,
+            status=status,
+            rewards=entry.get("rewards") or 0.0,
+            unbonding=entry.get("unbonding") or 0.0,
+            release_at=entry.get("next_release"),
+        )
+
+    async def _publish(self, position: StakingPosition) -> None:
+        """``amount`` is the asset's whole staked balance after the change, not the amount
+        the request asked for; ``apr`` is in percent."""
+
+        await self._event_bus.publish(
+            "staking.position_updated",
+            {
+                "asset": position.asset,
+                "amount": position.amount,
+                "apr": position.apr,
+                "provider": position.provider,
+                "status": position.status,
+                "rewards": position.rewards,
+                "unbonding": position.unbonding,
+                "release_at": position.release_at,
+            },
+        )
 
     async def _handle_staking_request(self, payload: Dict[str, object]) -> None:
         asset = str(payload.get("asset"))
         amount = float(payload.get("amount", 0))
-        async with self._lock:
-            position = await self._stake(asset, amount)
-            await self._event_bus.publish(
-                "staking.position_updated",
-                {
-                    "asset": position.asset,
-                    "amount": position.amount,
-                    "apr": position.apr,
-                    "provider": position.provider,
-                    "status": position.status,
-                },
-            )
+        async with self._lock_for(asset):
+            try:
+                position = await self._stake(asset, amount)
+            except ValueError as exc:
+                logger.error(f"[staking] Stake of {amount} {asset} rejected: {exc}")
+                return
+            await self._publish(position)
 
     async def _handle_unstake_request(self, payload: Dict[str, object]) -> None:
         asset = str(payload.get("asset"))
         amount = float(payload.get("amount", 0))
-        async with self._lock:
-            position = await self._unstake(asset, amount)
-            await self._event_bus.publish(
-                "staking.position_updated",
-                {
-                    "asset": position.asset,
-                    "amount": position.amount,
-                    "apr": position.apr,
-                    "provider": position.provider,
-                    "status": position.status,
-                },
-            )
+        async with self._lock_for(asset):
+            try:
+                position = await self._unstake(asset, amount)
+            except ValueError as exc:
+                logger.error(f"[staking] Unstake of {amount} {asset} rejected: {exc}")
+                return
+            await self._publish(position)
 
     async def _stake(self, asset: str, amount: float) -> StakingPosition:
         """Placeholder stake call; integrate with provider REST."""
 
         logger.info(f"[staking] Staking {amount} {asset} via {self._provider}")
-        apr = await self._fetch_current_apr(asset)
-        return StakingPosition(asset=asset, amount=amount, apr=apr, provider=self._provider)
+        apr = await self._aprs.get(asset)
+        self._book.stake(asset, amount, apr, time.time())
+        return self._position(asset)
 
     async def _unstake(self, asset: str, amount: float) -> StakingPosition:
         logger.info(f"[staking] Unstaking {amount} {asset} via {self._provider}")
-        apr = await self._fetch_current_apr(asset)
-        return StakingPosition(
-            asset=asset,
-            amount=amount,
-            apr=apr,
-            provider=self._provider,
-            status=f"cooldown ({self._cooldown_days}d)",
-        )
+        self._book.unstake(asset, amount, time.time())
+        return self._position(asset, status=f"cooldown ({self._cooldown_days}d)")
 
     async def _fetch_current_apr(self, asset: str) -> float:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        """The provider quotes APR in percent; the cache and the book work in fractions."""
+
         url = f"{self._base_url}/apr/{asset.lower()}"
-        try:
-            async with self._session.get(url, timeout=5) as resp:
-                data = await resp.json()
-                return float(data.get("apr", 0.0))
-        except aiohttp.ClientError:
-            logger.warning("[staking] APR fetch failed; defaulting to 0")
-            return 0.0
+        async with self._transport.session.get(url, timeout=self._apr_timeout) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+            return float(data.get("apr", 0.0)) / 100.0
 
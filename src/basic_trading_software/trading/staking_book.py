@@ -0,0 +1,232 @@
+"""Array-backed staking book: balances, reward accrual and unbonding schedules."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Mapping
+
+import numpy as np
+
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+
+_EPSILON = 1e-12
+
+
+class StakingBook:
+    """Staked balances stored column-wise per asset, accrued for the whole book at once.
+
+    Each asset owns a slot holding its staked balance, APR (a fraction: 0.05 is 5%), accrued
+    rewards and the time it was last accrued. ``accrue`` advances every slot in one
+    vectorized pass: rewards grow by ``staked * apr * dt`` (or are folded into the balance
+    when ``auto_compound`` is set) and unbonding tranches whose release time has passed are
+    paid out with a single bincount.
+    Unstaked amounts sit in a tranche queue until ``cooldown_seconds`` after the request.
+    """
+
+    def __init__(
+        self, cooldown_seconds: float = 0.0, auto_compound: bool = False, capacity: int = 64
+    ) -> None:
+        self.cooldown_seconds = cooldown_seconds
+        self.auto_compound = auto_compound
+        self._ids: Dict[str, int] = {}
+        self._assets: List[str] = []
+        capacity = max(1, capacity)
+        self._staked = np.zeros(capacity)
+        self._apr = np.zeros(capacity)
+        self._rewards = np.zeros(capacity)
+        self._accrued_at = np.zeros(capacity)
+        # Unbonding tranches (asset slot, amount, release time), unordered.
+        self._unbond_asset = np.zeros(0, dtype=np.int64)
+        self._unbond_amount = np.zeros(0)
+        self._unbond_release = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    @property
+    def assets(self) -> List[str]:
+        return list(self._assets)
+
+    def asset_id(self, asset: str, now: float | None = None) -> int:
+        key = asset.upper()
+        index = self._ids.get(key)
+        if index is None:
+            index = len(self._assets)
+            if index == self._staked.shape[0]:
+                self._grow(index * 2)
+            self._ids[key] = index
+            self._assets.append(key)
+            self._accrued_at[index] = now or 0.0
+        return index
+
+    def stake(self, asset: str, amount: float, apr: float, now: float) -> None:
+        if amount <= 0:
+            raise ValueError("stake amount must be positive")
+        i = self.asset_id(asset, now)
+        # Settle rewards at the old balance before it changes.
+        self._accrue_slot(i, now)
+        self._staked[i] += amount
+        self._apr[i] = apr
+
+    def unstake(self, asset: str, amount: float, now: float) -> float:
+        """Move ``amount`` into unbonding; returns the time it will be released."""
+
+        i = self._ids.get(asset.upper())
+        if i is None:
+            raise ValueError(f"nothing staked in {asset.upper()}")
+        self._accrue_slot(i, now)
+        if amount <= 0 or amount > self._staked[i] + _EPSILON:
+            raise ValueError(f"cannot unstake {amount} {asset.upper()}; {self._staked[i]} staked")
+        self._staked[i] = max(self._staked[i] - amount, 0.0)
+        release = now + self.cooldown_seconds
+        self._unbond_asset = np.append(self._unbond_asset, i)
+        self._unbond_amount = np.append(self._unbond_amount, amount)
+        self._unbond_release = np.append(self._unbond_release, release)
+        return release
+
+    def set_aprs(self, aprs: Mapping[str, float]) -> None:
+        for asset, apr in aprs.items():
+            i = self._ids.get(asset.upper())
+            if i is not None:
+                self._apr[i] = apr
+
+    def accrue(self, now: float) -> Dict[str, float]:
+        """Accrue every position up to ``now`` and release matured unbonding tranches.
+
+        Returns the amount released per asset.
+        """
+
+        n = len(self._assets)
+        if n == 0:
+            return {}
+        staked = self._staked[:n]
+        dt = np.maximum(now - self._accrued_at[:n], 0.0) / SECONDS_PER_YEAR
+        if self.auto_compound:
+            # Continuous compounding over the interval, so the result does not depend on
+            # how often the timer fires.
+            grown = staked * np.expm1(self._apr[:n] * dt)
+            staked += grown
+            self._rewards[:n] += grown
+        else:
+            self._rewards[:n] += staked * self._apr[:n] * dt
+        self._accrued_at[:n] = now
+
+        if self._unbond_release.size == 0:
+            return {}
+        matured = self._unbond_release <= now
+        if not matured.any():
+            return {}
+        released = np.bincount(
+            self._unbond_asset[matured], weights=self._unbond_amount[matured], minlength=n
+        )
+        keep = ~matured
+        self._unbond_asset = self._unbond_asset[keep]
+        self._unbond_amount = self._unbond_amount[keep]
+        self._unbond_release = self._unbond_release[keep]
+        return {self._assets[i]: float(released[i]) for i in np.flatnonzero(released)}
+
+    def unbonding(self) -> np.ndarray:
+        """Amount still unbonding per asset slot."""
+
+        return np.bincount(
+            self._unbond_asset, weights=self._unbond_amount, minlength=len(self._assets)
+        )[: len(self._assets)]
+
+    def position(self, asset: str) -> Dict[str, float | None] | None:
+        i = self._ids.get(asset.upper())
+        if i is None:
+            return None
+        pending = self._unbond_asset == i
+        return {
+            "staked": float(self._staked[i]),
+            "apr": float(self._apr[i]),
+            "rewards": float(self._rewards[i]),
+            "unbonding": float(self._unbond_amount[pending].sum()),
+            "next_release": (
+                float(self._unbond_release[pending].min()) if pending.any() else None
+            ),
+        }
+
+    def value(self, prices: Mapping[str, float]) -> float:
+        """Mark-to-market value of staked, accrued and unbonding balances in one pass."""
+
+        n = len(self._assets)
+        marks = np.array([prices.get(asset, np.nan) for asset in self._assets])
+        holdings = self._staked[:n] + self.unbonding()
+        if not self.auto_compound:
+            holdings = holdings + self._rewards[:n]
+        return float(np.nansum(holdings * marks))
+
+    def to_dict(self) -> Dict[str, object]:
+        """Detached copy of the book; take it on the thread that mutates the book."""
+
+        n = len(self._assets)
+        return {
+            "assets": list(self._assets),
+            "staked": self._staked[:n].tolist(),
+            "apr": self._apr[:n].tolist(),
+            "rewards": self._rewards[:n].tolist(),
+            "accrued_at": self._accrued_at[:n].tolist(),
+            "unbonding": [
+                self._unbond_asset.tolist(),
+                self._unbond_amount.tolist(),
+                self._unbond_release.tolist(),
+            ],
+        }
+
+    def load_dict(self, data: Mapping[str, object]) -> None:
+        assets = [str(asset) for asset in data["assets"]]  # type: ignore[union-attr]
+        self._ids = {}
+        self._assets = []
+        self._grow(max(len(assets), 1), reset=True)
+        for asset in assets:
+            self.asset_id(asset)
+        n = len(assets)
+        self._staked[:n] = data["staked"]
+        self._apr[:n] = data["apr"]
+        self._rewards[:n] = data["rewards"]
+        self._accrued_at[:n] = data["accrued_at"]
+        slots, amounts, releases = data["unbonding"]  # type: ignore[misc]
+        self._unbond_asset = np.asarray(slots, dtype=np.int64)
+        self._unbond_amount = np.asarray(amounts, dtype=float)
+        self._unbond_release = np.asarray(releases, dtype=float)
+
+    def save(self, path: Path) -> None:
+        self.write(path, self.to_dict())
+
+    @staticmethod
+    def write(path: Path, snapshot: Mapping[str, object]) -> None:
+        """Atomically write a ``to_dict`` snapshot as JSON (blocking; run it off the loop)."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def load(self, path: Path) -> bool:
+        if not path.exists():
+            return False
+        with open(path, encoding="utf-8") as handle:
+            self.load_dict(json.load(handle))
+        return True
+
+    def _accrue_slot(self, i: int, now: float) -> None:
+        dt = max(now - self._accrued_at[i], 0.0) / SECONDS_PER_YEAR
+        if self.auto_compound:
+            grown = self._staked[i] * np.expm1(self._apr[i] * dt)
+            self._staked[i] += grown
+            self._rewards[i] += grown
+        else:
+            self._rewards[i] += self._staked[i] * self._apr[i] * dt
+        self._accrued_at[i] = now
+
+    def _grow(self, capacity: int, reset: bool = False) -> None:
+        for name in ("_staked", "_apr", "_rewards", "_accrued_at"):
+            old = getattr(self, name)
+            new = np.zeros(capacity)
+            if not reset:
+                new[: old.shape[0]] = old
+            setattr(self, name, new)
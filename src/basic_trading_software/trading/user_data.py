@@ -0,0 +1,73 @@
+"""Streaming account updates (fills, balances) from venue user-data feeds."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Sequence
+
+from loguru import logger
+
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.trading.adapters.base import BrokerAdapter
+
+
+class UserDataStreams:
+    """Keeps one user-data stream per capable adapter and republishes it on the bus.
+
+    Normalized ``order.filled`` events go straight to the engine, which applies them to the
+    ledger and order store, so positions move as soon as the venue reports an execution.
+    While a venue's stream is connected its adapter is flagged ``publishes_fills`` so the
+    engine stops deriving fills from REST responses; after a disconnect the flag is cleared
+    until the stream is back.
+    """
+
+    def __init__(
+        self,
+        event_bus: EventBus,
+        adapters: Sequence[BrokerAdapter],
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        self._event_bus = event_bus
+        self._adapters = [adapter for adapter in adapters if adapter.supports_user_data]
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._tasks: Dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def venues(self) -> List[str]:
+        return [adapter.venue for adapter in self._adapters]
+
+    async def start(self) -> None:
+        for adapter in self._adapters:
+            if adapter.venue not in self._tasks:
+                self._tasks[adapter.venue] = asyncio.create_task(
+                    self._run(adapter), name=f"user-data-{adapter.venue}"
+                )
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, adapter: BrokerAdapter) -> None:
+        delay = self._reconnect_delay
+        while True:
+            try:
+                async for event, payload in adapter.stream_user_data():
+                    if event == "user_data.connected":
+                        adapter.publishes_fills = True
+                        delay = self._reconnect_delay
+                        logger.info(f"[user-data] Streaming account updates from {adapter.venue}")
+                    await self._event_bus.publish(event, payload)
+                logger.warning(f"[user-data] {adapter.venue} stream closed")
+            except asyncio.CancelledError:
+                adapter.publishes_fills = False
+                raise
+            except Exception as exc:  # noqa: BLE001 - reconnect on any failure
+                logger.error(f"[user-data] {adapter.venue} stream failed: {exc}")
+            adapter.publishes_fills = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
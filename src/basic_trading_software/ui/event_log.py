@@ -0,0 +1,170 @@
+"""Bounded, virtualized event logs: a ring-buffer table model behind a sortable, filterable view."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    QTimer,
+)
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QHeaderView,
+    QLineEdit,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+Row = Tuple[Any, ...]
+_Index = QModelIndex | QPersistentModelIndex
+
+
+@dataclass(frozen=True, slots=True)
+class LogColumn:
+    title: str
+    render: Callable[[Any], str] = str
+    align_right: bool = False
+
+
+class EventLogModel(QAbstractTableModel):
+    """Newest-first table over a fixed-size ring of raw row tuples.
+
+    ``append`` only queues a row; a timer moves the queue into the ring once per UI frame
+    with one remove (rows evicted at the bottom) and one insert (new rows at the top), so a
+    burst of events costs the view a single layout update. Cells are rendered on demand
+    from the raw values, which are also exposed under ``Qt.UserRole`` for sorting.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[LogColumn],
+        capacity: int = 100_000,
+        flush_interval_ms: int = 50,
+        parent: Any = None,
+    ) -> None:
+        super().__init__(parent)
+        self._columns = tuple(columns)
+        self._capacity = max(1, capacity)
+        self._rows: List[Row | None] = [None] * self._capacity
+        self._next = 0
+        self._size = 0
+        self._pending: List[Row] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)  # type: ignore[arg-type]
+        self._timer.start()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def append(self, row: Row) -> None:
+        self._pending.append(row)
+
+    def flush(self) -> None:
+        """Move queued rows into the table."""
+
+        if not self._pending:
+            return
+        batch, self._pending = self._pending[-self._capacity :], []
+        added = len(batch)
+        overflow = self._size + added - self._capacity
+        if overflow > 0:
+            # The oldest rows sit at the bottom of the newest-first view.
+            self.beginRemoveRows(QModelIndex(), self._size - overflow, self._size - 1)
+            self._size -= overflow
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, added - 1)
+        for row in batch:
+            self._rows[self._next] = row
+            self._next = (self._next + 1) % self._capacity
+        self._size += added
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows = [None] * self._capacity
+        self._next = 0
+        self._size = 0
+        self._pending = []
+        self.endResetModel()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def row(self, index: int) -> Row:
+        """Raw values of view row ``index`` (0 is the newest)."""
+
+        return self._rows[(self._next - 1 - index) % self._capacity]  # type: ignore[return-value]
+
+    def rowCount(self, parent: _Index | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else self._size
+
+    def columnCount(self, parent: _Index | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self._columns)
+
+    def data(self, index: _Index, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        column = self._columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return column.render(self.row(index.row())[index.column()])
+        if role == Qt.ItemDataRole.UserRole:
+            return self.row(index.row())[index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if column.align_right:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(
+        self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section].title
+        return None
+
+
+class EventLogView(QWidget):
+    """Filter box above a sortable table; only visible rows are ever rendered."""
+
+    def __init__(self, model: EventLogModel, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.model = model
+        self._proxy = QSortFilterProxyModel(self)
+        self._proxy.setSourceModel(model)
+        self._proxy.setSortRole(Qt.ItemDataRole.UserRole)
+        self._proxy.setFilterKeyColumn(-1)
+        self._proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        self._filter = QLineEdit()
+        self._filter.setPlaceholderText("Filter…")
+        self._filter.setClearButtonEnabled(True)
+        self._filter.textChanged.connect(self._proxy.setFilterFixedString)  # type: ignore[arg-type]
+
+        self._table = QTableView()
+        self._table.setModel(self._proxy)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)  # model order: newest first
+        self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._table.setWordWrap(False)
+        vertical = self._table.verticalHeader()
+        vertical.hide()
+        # Fixed row heights let the view skip measuring rows it does not show.
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(22)
+        self._table.horizontalHeader().setStretchLastSection(True)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._filter)
+        layout.addWidget(self._table)
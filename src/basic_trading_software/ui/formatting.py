@@ -0,0 +1,18 @@
+"""Cell renderers for the event logs; kept free of Qt so they can be used and tested anywhere."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+
+def format_time(value: Any) -> str:
+    return datetime.fromtimestamp(float(value)).strftime("%H:%M:%S.%f")[:-3]
+
+
+def format_optional(fmt: str, suffix: str = "") -> Callable[[Any], str]:
+    def render(value: Any) -> str:
+        return "-" if value is None else format(value, fmt) + suffix
+
+    return render
@@ -3,30 +3,30 @@
 from __future__ import annotations
 
 import asyncio
-from collections import deque
+import time
 from datetime import datetime
-from typing import Deque, Dict, Iterable, List, Tuple
+from typing import Dict, List
 
-import pyqtgraph as pg
 from loguru import logger
-from PySide6.QtCore import Qt
 from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import (
     QAction,
     QGridLayout,
     QGroupBox,
     QLabel,
-    QListWidget,
-    QListWidgetItem,
     QMainWindow,
     QProgressBar,
     QTabWidget,
     QWidget,
 )
 
-from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.config import get_settings
 from basic_trading_software.common.credentials import CredentialStore
+from basic_trading_software.common.events import EventBus
 from basic_trading_software.data.providers import LiveDataProvider
+from basic_trading_software.ui.event_log import EventLogModel, EventLogView, LogColumn
+from basic_trading_software.ui.formatting import format_optional, format_time
+from basic_trading_software.ui.price_chart import PriceChart
 from basic_trading_software.ui.settings_dialog import SettingsDialog
 
 
@@ -49,22 +49,51 @@ class MainWindow(QMainWindow):
         self._settings_dialog: SettingsDialog | None = None
         self._tasks: List[asyncio.Task[None]] = []
 
-        self._price_points: Deque[Tuple[float, float]] = deque(maxlen=240)
         self._symbol = "DEMO"
 
-        self._orders_list = QListWidget()
+        ui_settings = get_settings().ui
+        self._orders_log = EventLogModel(
+            [
+                LogColumn("Time", format_time),
+                LogColumn("Symbol"),
+                LogColumn("Side"),
+                LogColumn("Size", format_optional("g"), align_right=True),
+                LogColumn("Status"),
+                LogColumn("Venue"),
+                LogColumn("Model"),
+                LogColumn("Confidence", format_optional(".2f"), align_right=True),
+            ],
+            capacity=ui_settings.activity_log_capacity,
+            flush_interval_ms=ui_settings.log_flush_interval_ms,
+            parent=self,
+        )
         self._price_label = QLabel("--")
         self._spread_label = QLabel("-- / --")
         self._timestamp_label = QLabel("--:--:--")
         self._confidence_bar = QProgressBar()
         self._confidence_bar.setRange(0, 100)
-        self._staking_list = QListWidget()
-
-        self._chart_widget = pg.PlotWidget()
-        self._chart_widget.setBackground("#121212")
-        self._chart_widget.setLabel("left", "Last Price")
-        self._chart_widget.setLabel("bottom", "Time")
-        self._price_curve = self._chart_widget.plot(pen=pg.mkPen("#00e676", width=2))
+        self._staking_log = EventLogModel(
+            [
+                LogColumn("Time", format_time),
+                LogColumn("Asset"),
+                LogColumn("Staked", format_optional(".4f"), align_right=True),
+                LogColumn("APR", format_optional(".2f", "%"), align_right=True),
+                LogColumn("Rewards", format_optional(".6f"), align_right=True),
+                LogColumn("Unbonding", format_optional(".4f"), align_right=True),
+                LogColumn("Status"),
+                LogColumn("Provider"),
+            ],
+            capacity=ui_settings.staking_log_capacity,
+            flush_interval_ms=ui_settings.log_flush_interval_ms,
+            parent=self,
+        )
+
+        self._chart = PriceChart(
+            capacity=ui_settings.chart_capacity,
+            marker_capacity=ui_settings.chart_marker_capacity,
+            fps=ui_settings.chart_fps,
+        )
+        self._chart_widget = self._chart.widget
 
         self.setCentralWidget(self._build_tabs())
         self._build_menus()
@@ -120,14 +149,14 @@ class MainWindow(QMainWindow):
         widget = QWidget()
         layout = QGridLayout(widget)
         layout.addWidget(QLabel("Recent Orders"), 0, 0)
-        layout.addWidget(self._orders_list, 1, 0)
+        layout.addWidget(EventLogView(self._orders_log), 1, 0)
         return widget
 
     def _build_staking_tab(self) -> QWidget:
         widget = QWidget()
         layout = QGridLayout(widget)
         layout.addWidget(QLabel("Staking Positions"), 0, 0)
-        layout.addWidget(self._staking_list, 1, 0)
+        layout.addWidget(EventLogView(self._staking_log), 1, 0)
         return widget
 
     def _build_menus(self) -> None:
@@ -157,6 +186,8 @@ class MainWindow(QMainWindow):
 
         logger.debug("[ui] Initializing main window")
         await self._event_bus.subscribe("order.submitted", self._on_order_submitted)
+        await self._event_bus.subscribe("signal.generated", self._on_signal)
+        await self._event_bus.subscribe("order.filled", self._on_fill)
         await self._event_bus.subscribe("staking.position_updated", self._on_staking_updated)
         await self._event_bus.subscribe("settings.credentials_updated", self._on_credentials_updated)
         task = asyncio.create_task(self._consume_quotes(self._symbol), name="quote-stream")
@@ -180,50 +211,56 @@ class MainWindow(QMainWindow):
         except ValueError:
             self._timestamp_label.setText(timestamp)
 
-        self._append_price_point(datetime.utcnow().timestamp(), last)
+        # Buffered only; the chart redraws on its own frame timer.
+        self._chart.add_quote(time.time(), last, bid, ask)
 
-    def _append_price_point(self, timestamp: float, price: float) -> None:
-        self._price_points.append((timestamp, price))
-        times, prices = self._split_price_points(self._price_points)
-        if times:
-            self._price_curve.setData(times, prices, connect="finite")
+    async def _on_signal(self, payload: Dict[str, object]) -> None:
+        if str(payload.get("symbol", "")).upper() != self._symbol:
+            return
+        point = self._chart.last_point
+        if point is not None:
+            self._chart.add_marker("signal", time.time(), point[1], str(payload.get("side", "")))
 
-    @staticmethod
-    def _split_price_points(points: Iterable[Tuple[float, float]]) -> Tuple[List[float], List[float]]:
-        times: List[float] = []
-        prices: List[float] = []
-        for ts, price in points:
-            times.append(ts)
-            prices.append(price)
-        return times, prices
+    async def _on_fill(self, payload: Dict[str, object]) -> None:
+        if str(payload.get("symbol", "")).upper() != self._symbol:
+            return
+        price = float(payload.get("price") or 0)  # type: ignore[arg-type]
+        if price > 0:
+            self._chart.add_marker("fill", time.time(), price, str(payload.get("side", "")))
 
     async def _on_order_submitted(self, payload: Dict[str, object]) -> None:
-        """Render order events in the activity log."""
+        """Queue order events for the activity log (shown on its next batch flush)."""
 
-        symbol = str(payload.get("symbol"))
-        side = str(payload.get("side")).upper()
-        status = str(payload.get("status")).upper()
         confidence = payload.get("confidence")
-        size = payload.get("size", 0)
-        venue = str(payload.get("venue") or "-")
-        model = str(payload.get("model") or "-")
-
-        text = f"{symbol} {side} x{size} – {status} [{venue}] via {model}"
         if confidence is not None:
-            text += f" (confidence {float(confidence):.2f})"
-            self._confidence_bar.setValue(int(float(confidence) * 100))
-        item = QListWidgetItem(text)
-        item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-        self._orders_list.insertItem(0, item)
+            confidence = float(confidence)  # type: ignore[arg-type]
+            self._confidence_bar.setValue(int(confidence * 100))
+        self._orders_log.append(
+            (
+                time.time(),
+                str(payload.get("symbol")),
+                str(payload.get("side")).upper(),
+                payload.get("size", 0),
+                str(payload.get("status")).upper(),
+                str(payload.get("venue") or "-"),
+                str(payload.get("model") or "-"),
+                confidence,
+            )
+        )
 
     async def _on_staking_updated(self, payload: Dict[str, object]) -> None:
-        asset = str(payload.get("asset"))
-        amount = float(payload.get("amount", 0))
-        apr = float(payload.get("apr", 0))
-        status = str(payload.get("status", ""))
-        provider = str(payload.get("provider", ""))
-        text = f"{asset}: {amount:.4f} staked @ {apr:.2f}% APR via {provider} ({status})"
-        self._staking_list.insertItem(0, QListWidgetItem(text))
+        self._staking_log.append(
+            (
+                time.time(),
+                str(payload.get("asset")),
+                float(payload.get("amount", 0)),  # type: ignore[arg-type]
+                float(payload.get("apr", 0)),  # type: ignore[arg-type]
+                payload.get("rewards"),
+                payload.get("unbonding"),
+                str(payload.get("status", "")),
+                str(payload.get("provider", "")),
+            )
+        )
 
     async def _on_credentials_updated(self, payload: Dict[str, object]) -> None:
         venue = str(payload.get("venue", "")).title()
@@ -234,5 +271,8 @@ class MainWindow(QMainWindow):
 
         for task in self._tasks:
             task.cancel()
+        self._chart.stop()
+        self._orders_log.stop()
+        self._staking_log.stop()
         self._data_provider.stop()
         super().closeEvent(event)
@@ -0,0 +1,143 @@
+"""Tick chart fed from preallocated NumPy ring buffers and redrawn at a fixed frame rate."""
+
+from __future__ import annotations
+
+from typing import Dict, Sequence, Set, Tuple
+
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import QTimer
+
+BUY_COLOR = "#00e676"
+SELL_COLOR = "#ff5252"
+
+
+class RingBuffer:
+    """Fixed-capacity float columns whose contents are always readable as contiguous views.
+
+    Every row is written twice, at ``i`` and ``i + capacity``, so the newest ``capacity``
+    rows are a single slice of the backing array: reading the history for a redraw never
+    copies or concatenates, and appending is O(1).
+    """
+
+    def __init__(self, capacity: int, columns: int) -> None:
+        self.capacity = max(1, capacity)
+        self._data = np.zeros((columns, 2 * self.capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, row: Sequence[float]) -> None:
+        i = self._next
+        self._data[:, i] = row
+        self._data[:, i + self.capacity] = row
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def columns(self) -> np.ndarray:
+        """``(columns, len)`` view of the rows, oldest first."""
+
+        start = self._next - self._size
+        if start < 0:
+            start += self.capacity
+        return self._data[:, start : start + self._size]
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
+
+
+class PriceChart:
+    """Last/bid/ask lines plus signal and fill markers for one symbol.
+
+    Quotes only append to the ring buffers; a ``QTimer`` pushes them to pyqtgraph at most
+    ``fps`` times a second, and only when something changed. Curves clip to the visible
+    range and peak-downsample, so hours of ticks draw as fast as a few hundred points.
+    """
+
+    QUOTE_COLUMNS = 4  # time, last, bid, ask
+    MARKER_COLUMNS = 3  # time, price, side (+1 buy / -1 sell)
+
+    def __init__(
+        self, capacity: int = 200_000, marker_capacity: int = 10_000, fps: int = 30
+    ) -> None:
+        self.widget = pg.PlotWidget(axisItems={"bottom": pg.DateAxisItem()})
+        self.widget.setBackground("#121212")
+        self.widget.setLabel("left", "Last Price")
+        self.widget.setLabel("bottom", "Time")
+        self.widget.addLegend(offset=(10, 10))
+
+        self._quotes = RingBuffer(capacity, self.QUOTE_COLUMNS)
+        self._markers: Dict[str, RingBuffer] = {
+            "signal": RingBuffer(marker_capacity, self.MARKER_COLUMNS),
+            "fill": RingBuffer(marker_capacity, self.MARKER_COLUMNS),
+        }
+        self._curves = {
+            "last": self._curve("Last", pg.mkPen("#00e676", width=2)),
+            "bid": self._curve("Bid", pg.mkPen("#4fc3f7", width=1)),
+            "ask": self._curve("Ask", pg.mkPen("#ffb74d", width=1)),
+        }
+        # One scatter per (kind, side) so each keeps a fixed brush instead of per-point ones.
+        self._scatters = {
+            (kind, direction): self._scatter(f"{label} {side}", symbol, color)
+            for kind, label, symbol in (("signal", "Signal", "t"), ("fill", "Fill", "o"))
+            for direction, side, color in ((1.0, "buy", BUY_COLOR), (-1.0, "sell", SELL_COLOR))
+        }
+        self._dirty: Set[str] = set()
+        self._timer = QTimer(self.widget)
+        self._timer.setInterval(max(1, round(1000 / max(1, fps))))
+        self._timer.timeout.connect(self._redraw)  # type: ignore[arg-type]
+        self._timer.start()
+
+    @property
+    def last_point(self) -> Tuple[float, float] | None:
+        if not len(self._quotes):
+            return None
+        cols = self._quotes.columns()
+        return float(cols[0, -1]), float(cols[1, -1])
+
+    def add_quote(self, timestamp: float, last: float, bid: float, ask: float) -> None:
+        self._quotes.append((timestamp, last, bid, ask))
+        self._dirty.add("quotes")
+
+    def add_marker(self, kind: str, timestamp: float, price: float, side: str) -> None:
+        """Mark a ``"signal"`` or ``"fill"`` at ``price``."""
+
+        direction = 1.0 if side.upper() == "BUY" else -1.0
+        self._markers[kind].append((timestamp, price, direction))
+        self._dirty.add(kind)
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _curve(self, name: str, pen: object) -> pg.PlotDataItem:
+        curve = self.widget.plot(pen=pen, name=name)
+        curve.setClipToView(True)
+        curve.setDownsampling(auto=True, method="peak")
+        curve.setSkipFiniteCheck(True)
+        return curve
+
+    def _scatter(self, name: str, symbol: str, color: str) -> pg.ScatterPlotItem:
+        scatter = pg.ScatterPlotItem(
+            size=9, symbol=symbol, pen=None, brush=pg.mkBrush(color), name=name
+        )
+        self.widget.addItem(scatter)
+        return scatter
+
+    def _redraw(self) -> None:
+        # Hidden tabs keep accumulating; they catch up in one draw when shown again.
+        if not self._dirty or not self.widget.isVisible():
+            return
+        dirty, self._dirty = self._dirty, set()
+        if "quotes" in dirty:
+            times, last, bid, ask = self._quotes.columns()
+            self._curves["last"].setData(times, last)
+            self._curves["bid"].setData(times, bid)
+            self._curves["ask"].setData(times, ask)
+        for kind in dirty & self._markers.keys():
+            times, prices, direction = self._markers[kind].columns()
+            for side in (1.0, -1.0):
+                mask = direction == side
+                self._scatters[(kind, side)].setData(x=times[mask], y=prices[mask])
@@ -91,20 +91,19 @@ class SettingsDialog(QDialog):
         layout.addWidget(buttons, 1, 0, alignment=Qt.AlignmentFlag.AlignRight)
 
     def _on_accept(self) -> None:
-        publish_tasks = []
+        entries = {}
         for editor in self._editors:
             key, secret = editor.values()
-            self._store.set(editor.venue, key or None, secret or None)
-            publish_tasks.append(
+            # Keyed the way the store reports changed venues (lowercase).
+            entries[editor.venue.lower()] = (key or None, secret or None)
+        # One in-memory update and a single background write for every venue.
+        changed = self._store.update(entries)
+        for venue in changed:
+            key, secret = entries[venue]
+            asyncio.create_task(
                 self._event_bus.publish(
                     "settings.credentials_updated",
-                    {
-                        "venue": editor.venue,
-                        "api_key": key or None,
-                        "api_secret": secret or None,
-                    },
+                    {"venue": venue, "api_key": key, "api_secret": secret},
                 )
             )
-        for task in publish_tasks:
-            asyncio.create_task(task)
         self.accept()
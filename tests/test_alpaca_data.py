@@ -0,0 +1,140 @@
+"""Alpaca market data against a local stand-in for the data-API WebSocket."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import aclosing
+from typing import Any, Awaitable, Callable, Dict, List
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from basic_trading_software.common.config import get_settings
+from basic_trading_software.common.credentials import CredentialStore
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.http import HttpTransport
+from basic_trading_software.trading.adapters.equity import AlpacaAdapter
+
+Scenario = Callable[[AlpacaAdapter, List[Dict[str, Any]]], Awaitable[None]]
+FRAMES = web.AppKey("frames", list)
+
+_MARKET = [
+    {"T": "q", "S": "AAPL", "bp": 189.5, "ap": 189.52, "bs": 3, "as": 2,
+     "t": "2024-01-02T15:00:00.000000001Z"},
+    {"T": "t", "S": "AAPL", "p": 189.51, "s": 100, "t": "2024-01-02T15:00:00.5Z"},
+    {"T": "b", "S": "AAPL", "o": 189.0, "h": 190.0, "l": 188.5, "c": 189.5, "v": 12_000,
+     "t": "2024-01-02T15:00:00Z"},
+]
+
+
+def _data_api() -> web.Application:
+    """Authenticates key ``k``/secret ``s``; sends one frame of market data once the bar
+    subscription arrives, then holds the socket open."""
+
+    app = web.Application()
+    app[FRAMES] = []
+
+    async def handler(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json([{"T": "success", "msg": "connected"}])
+        async for msg in ws:
+            frame = json.loads(msg.data)
+            request.app[FRAMES].append(frame)
+            if frame.get("action") == "auth":
+                if (frame.get("key"), frame.get("secret")) != ("k", "s"):
+                    await ws.send_json([{"T": "error", "code": 402, "msg": "auth failed"}])
+                    await ws.close()
+                    break
+                await ws.send_json([{"T": "success", "msg": "authenticated"}])
+            elif frame.get("action") == "subscribe" and "bars" in frame:
+                await ws.send_json([{"T": "subscription", "bars": frame["bars"]}, *_MARKET])
+        return ws
+
+    app.router.add_get("/v2/iex", handler)
+    return app
+
+
+def _run(tmp_path, monkeypatch, scenario: Scenario, secret: str = "s") -> None:
+    async def main() -> None:
+        app = _data_api()
+        async with TestServer(app) as server:
+            settings = get_settings().broker_equity
+            monkeypatch.setattr(settings, "data_stream_url", str(server.make_url("/v2/iex")))
+            monkeypatch.setattr(settings, "api_key", "k")
+            monkeypatch.setattr(settings, "api_secret", secret)
+            transport = HttpTransport()
+            adapter = AlpacaAdapter(CredentialStore(tmp_path / "credentials.json"), transport)
+            try:
+                await asyncio.wait_for(scenario(adapter, app[FRAMES]), 5.0)
+            finally:
+                await transport.close()
+
+    asyncio.run(main())
+
+
+def test_stream_market_data_yields_payload_dicts(tmp_path, monkeypatch) -> None:
+    async def scenario(adapter: AlpacaAdapter, frames: List[Dict[str, Any]]) -> None:
+        payloads = []
+        async with aclosing(adapter.stream_market_data("aapl")) as stream:
+            async for payload in stream:
+                payloads.append(payload)
+                if len(payloads) == len(_MARKET):
+                    break
+
+        quote, trade, bar = payloads
+        assert quote == {
+            "symbol": "AAPL", "venue": "alpaca", "bid": 189.5, "ask": 189.52,
+            "bid_size": 3.0, "ask_size": 2.0, "timestamp": 1704207600.0,
+        }
+        assert trade["last"] == 189.51 and trade["timestamp"] == 1704207600.5
+        assert bar["close"] == 189.5 and bar["volume"] == 12_000.0
+        assert frames == [
+            {"action": "auth", "key": "k", "secret": "s"},
+            {"action": "subscribe", "quotes": ["AAPL"]},
+            {"action": "subscribe", "trades": ["AAPL"]},
+            {"action": "subscribe", "bars": ["AAPL"]},
+        ]
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_run_market_data_publishes_quotes_and_bars(tmp_path, monkeypatch) -> None:
+    async def scenario(adapter: AlpacaAdapter, frames: List[Dict[str, Any]]) -> None:
+        bus = EventBus()
+        events: Dict[str, List[Dict[str, Any]]] = {}
+        done = asyncio.Event()
+
+        def collect(topic: str) -> Callable[[Dict[str, Any]], Awaitable[None]]:
+            async def handler(payload: Dict[str, Any]) -> None:
+                events.setdefault(topic, []).append(payload)
+                if topic == "market.bar":
+                    done.set()
+
+            return handler
+
+        for topic in ("market.quote", "market.trade", "market.bar"):
+            await bus.subscribe(topic, collect(topic))
+        task = asyncio.create_task(adapter.run_market_data(bus, ["aapl", "msft"]))
+        await done.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert [p["bid"] for p in events["market.quote"]] == [189.5]
+        assert [p["close"] for p in events["market.bar"]] == [189.5]
+        # The server sends the trade regardless; the runtime only subscribes quotes and bars.
+        assert frames[1:] == [
+            {"action": "subscribe", "quotes": ["AAPL", "MSFT"]},
+            {"action": "subscribe", "bars": ["AAPL", "MSFT"]},
+        ]
+
+    _run(tmp_path, monkeypatch, scenario)
+
+
+def test_run_market_data_stops_on_rejected_credentials(tmp_path, monkeypatch) -> None:
+    async def scenario(adapter: AlpacaAdapter, frames: List[Dict[str, Any]]) -> None:
+        await adapter.run_market_data(EventBus(), ["AAPL"])
+        assert frames == [{"action": "auth", "key": "k", "secret": "wrong"}]
+
+    _run(tmp_path, monkeypatch, scenario, secret="wrong")
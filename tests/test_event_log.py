@@ -0,0 +1,77 @@
+"""EventLogModel batching against real Qt (skipped where PySide6 is not installed)."""
+
+from __future__ import annotations
+
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from basic_trading_software.ui.event_log import EventLogModel, LogColumn
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def _model(capacity: int) -> tuple[EventLogModel, list]:
+    model = EventLogModel([LogColumn("N")], capacity=capacity, flush_interval_ms=60_000)
+    model.stop()
+    events: list = []
+    model.rowsInserted.connect(lambda _parent, first, last: events.append(("ins", first, last)))
+    model.rowsRemoved.connect(lambda _parent, first, last: events.append(("rm", first, last)))
+    return model, events
+
+
+def _values(model: EventLogModel) -> list:
+    return [model.row(i)[0] for i in range(model.rowCount())]
+
+
+def test_flush_inserts_a_batch_newest_first(app) -> None:
+    model, events = _model(capacity=5)
+    for value in range(3):
+        model.append((value,))
+    assert model.rowCount() == 0  # nothing reaches the view before the flush
+
+    model.flush()
+
+    assert _values(model) == [2, 1, 0]
+    assert events == [("ins", 0, 2)]
+    index = model.index(0, 0)
+    assert model.data(index) == "2"
+    assert model.data(index, QtCore.Qt.ItemDataRole.UserRole) == 2
+
+
+def test_flush_evicts_oldest_rows_in_one_removal(app) -> None:
+    model, events = _model(capacity=5)
+    for value in range(3):
+        model.append((value,))
+    model.flush()
+    events.clear()
+
+    for value in range(3, 5):
+        model.append((value,))
+    model.flush()
+    assert events == [("ins", 0, 1)]
+
+    events.clear()
+    for value in range(5, 8):
+        model.append((value,))
+    model.flush()
+
+    assert _values(model) == [7, 6, 5, 4, 3]
+    assert events == [("rm", 2, 4), ("ins", 0, 2)]
+
+
+def test_burst_larger_than_capacity_keeps_the_newest(app) -> None:
+    model, events = _model(capacity=4)
+    model.append((0,))
+    model.flush()
+    events.clear()
+
+    for value in range(1, 11):
+        model.append((value,))
+    model.flush()
+
+    assert _values(model) == [10, 9, 8, 7]
+    assert events == [("rm", 0, 0), ("ins", 0, 3)]
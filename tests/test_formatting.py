@@ -0,0 +1,22 @@
+"""Event-log cell renderers (no Qt needed)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from basic_trading_software.ui.formatting import format_optional, format_time
+
+
+def test_format_time_shows_local_time_to_the_millisecond() -> None:
+    stamp = 1_700_000_000.25
+    expected = datetime.fromtimestamp(stamp).strftime("%H:%M:%S") + ".250"
+    assert format_time(stamp) == expected
+    assert format_time(str(stamp)) == expected
+
+
+def test_format_optional_renders_missing_values_as_a_dash() -> None:
+    apr = format_optional(".2f", "%")
+    assert apr(4.567) == "4.57%"
+    assert apr(0.0) == "0.00%"
+    assert apr(None) == "-"
+    assert format_optional("g")(1e-05) == "1e-05"
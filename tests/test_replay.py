@@ -0,0 +1,55 @@
+"""ReplayBacktester runs the engine's risk checks in virtual time."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator
+
+from basic_trading_software.backtest.replay import ReplayBacktester
+from basic_trading_software.common.events import EventBus
+
+
+class _EveryNthBar:
+    """Signals on every ``every``-th bar, alternating sides so the position stays flat."""
+
+    def __init__(self, event_bus: EventBus, every: int) -> None:
+        self._event_bus = event_bus
+        self._every = every
+        self._count = 0
+
+    async def start(self) -> None:
+        await self._event_bus.subscribe("market.bar", self._on_bar)
+
+    async def stop(self) -> None:
+        await self._event_bus.unsubscribe("market.bar", self._on_bar)
+
+    async def _on_bar(self, payload: Dict[str, Any]) -> None:
+        self._count += 1
+        if self._count % self._every:
+            return
+        side = "BUY" if (self._count // self._every) % 2 else "SELL"
+        await self._event_bus.publish(
+            "signal.generated", {"symbol": payload["symbol"], "side": side, "quantity": 1.0}
+        )
+
+
+def _bars(start: float, count: int) -> Iterator[Dict[str, Any]]:
+    for second in range(count):
+        yield {"timestamp": start + second, "symbol": "TEST", "close": 100.0, "volume": 1.0}
+
+
+def test_order_rate_limit_refills_in_virtual_time() -> None:
+    # Two hours of one-second bars crossing midnight UTC, one signal every 10 virtual seconds:
+    # far below the order rate limit in virtual time, far above it in wall time.
+    bars = 7_200
+    backtester = ReplayBacktester(
+        _bars(1_700_006_400.0 - 3_600, bars),
+        strategy_factory=lambda bus: _EveryNthBar(bus, every=10),
+        half_spread=0.01,
+    )
+
+    result = backtester.run()
+
+    assert result.bars_processed == bars
+    assert len(result.orders) == bars // 10
+    assert [o for o in result.orders if o["status"] == "rejected"] == []
+    assert len(result.fills) == bars // 10
@@ -0,0 +1,13 @@
+"""Cold-start profiling stays off live venues and out of the working directory."""
+
+from __future__ import annotations
+
+import asyncio
+
+from basic_trading_software.common.startup import time_to_first_quote
+
+
+def test_time_to_first_quote_leaves_no_files_behind(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    assert asyncio.run(time_to_first_quote(timeout=5.0)) > 0
+    assert list(tmp_path.iterdir()) == []
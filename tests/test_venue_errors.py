@@ -0,0 +1,128 @@
+"""Venue error statuses against a local stand-in for the Binance REST API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from basic_trading_software.common.config import get_settings
+from basic_trading_software.common.credentials import CredentialStore
+from basic_trading_software.common.events import EventBus
+from basic_trading_software.common.http import HttpTransport
+from basic_trading_software.trading.adapters.base import OrderRequest
+from basic_trading_software.trading.adapters.crypto import BinanceAdapter
+from basic_trading_software.trading.adapters.resilience import CLOSED, VenueRejected
+from basic_trading_software.trading.engine import TradingEngine
+from basic_trading_software.trading.orders import REJECTED
+
+Scenario = Callable[[BinanceAdapter, Counter], Awaitable[None]]
+HITS = web.AppKey("hits", Counter)
+
+
+def _venue(order_status: int, order_body: Dict[str, Any]) -> web.Application:
+    """``POST /api/v3/order`` answers ``order_status``; lookups find no such order."""
+
+    app = web.Application()
+    app[HITS] = Counter()
+
+    async def place(request: web.Request) -> web.Response:
+        request.app[HITS]["place"] += 1
+        return web.json_response(order_body, status=order_status)
+
+    async def lookup(request: web.Request) -> web.Response:
+        request.app[HITS]["lookup"] += 1
+        return web.json_response({"code": -2013, "msg": "Order does not exist."}, status=400)
+
+    app.router.add_post("/api/v3/order", place)
+    app.router.add_get("/api/v3/order", lookup)
+    return app
+
+
+def _run(app: web.Application, tmp_path, monkeypatch, scenario: Scenario) -> None:
+    async def main() -> None:
+        async with TestServer(app) as server:
+            url = str(server.make_url("")).rstrip("/")
+            monkeypatch.setattr(get_settings().broker_crypto, "rest_base_url", url)
+            transport = HttpTransport()
+            adapter = BinanceAdapter(CredentialStore(tmp_path / "credentials.json"), transport)
+            try:
+                await scenario(adapter, app[HITS])
+            finally:
+                await transport.close()
+
+    asyncio.run(main())
+
+
+def _order() -> OrderRequest:
+    return OrderRequest("BTCUSDT", "BUY", 0.01, client_order_id="c-1")
+
+
+def test_server_error_is_retried_and_counts_against_the_breaker(tmp_path, monkeypatch) -> None:
+    app = _venue(503, {"code": -1001, "msg": "Internal error"})
+
+    async def scenario(adapter: BinanceAdapter, hits: Counter) -> None:
+        with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+            await adapter.place_order(_order())
+        assert excinfo.value.status == 503
+        retries = get_settings().venue_requests.order_retries
+        # Each retry first looks the order up by client id, then resends it.
+        assert hits == Counter(place=retries + 1, lookup=retries)
+        # The lookups were answered, so only the last failed send is still on the breaker.
+        assert adapter._guard.breaker._failures == 1
+
+    _run(app, tmp_path, monkeypatch, scenario)
+
+
+def test_rejection_is_not_retried(tmp_path, monkeypatch) -> None:
+    app = _venue(400, {"code": -2010, "msg": "Account has insufficient balance."})
+
+    async def scenario(adapter: BinanceAdapter, hits: Counter) -> None:
+        with pytest.raises(VenueRejected) as excinfo:
+            await adapter.place_order(_order())
+        assert excinfo.value.error_code == -2010
+        assert excinfo.value.message == "Account has insufficient balance."
+        assert hits == Counter(place=1)
+        assert adapter._guard.breaker.state == CLOSED
+        assert adapter._guard.breaker._failures == 0
+
+    _run(app, tmp_path, monkeypatch, scenario)
+
+
+def test_unknown_order_lookup_returns_none(tmp_path, monkeypatch) -> None:
+    app = _venue(200, {})
+
+    async def scenario(adapter: BinanceAdapter, hits: Counter) -> None:
+        assert await adapter.find_order("c-1", "BTCUSDT") is None
+        assert hits == Counter(lookup=1)
+
+    _run(app, tmp_path, monkeypatch, scenario)
+
+
+def test_engine_records_a_venue_rejection(tmp_path, monkeypatch) -> None:
+    app = _venue(400, {"code": -2010, "msg": "Account has insufficient balance."})
+
+    async def scenario(adapter: BinanceAdapter, hits: Counter) -> None:
+        bus = EventBus()
+        submitted: List[Dict[str, Any]] = []
+
+        async def on_submitted(payload: Dict[str, Any]) -> None:
+            submitted.append(payload)
+
+        await bus.subscribe("order.submitted", on_submitted)
+        engine = TradingEngine(bus, [adapter])
+        await engine._on_signal({"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.01})
+        await engine.drain()
+
+        [record] = engine.orders.by_status(REJECTED)
+        assert record.reason == "Account has insufficient balance."
+        assert engine.orders.open_orders() == []
+        assert [p["status"] for p in submitted] == ["rejected"]
+        assert hits == Counter(place=1)
+
+    _run(app, tmp_path, monkeypatch, scenario)